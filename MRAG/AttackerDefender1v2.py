@@ -2,6 +2,8 @@ import heterocl as hcl
 import math
 import numpy as np
 
+from odp.Shapes.ShapeExpressions import Capture
+
 """ 6D 1 vs. 2 AttackerDefender DYNAMICS IMPLEMENTATION 
  xA1_dot = vA * u11
  xA2_dot = vA * u12
@@ -256,15 +258,15 @@ class AttackerDefender1v2:
         return (opt_d1, opt_d2, opt_d3, opt_d4)
 
     def capture_set1(self, grid, capture_radius, mode):
-        data = np.power(grid.vs[0] - grid.vs[2], 2) + np.power(grid.vs[1] -grid.vs[3], 2)
+        capture = Capture([0, 1], [2, 3], capture_radius)
         if mode == "capture":
-            return np.sqrt(data) - capture_radius
+            return capture.evaluate(grid)
         if mode == "escape":
-            return capture_radius - np.sqrt(data)
+            return (~capture).evaluate(grid)
 
     def capture_set2(self, grid, capture_radius, mode):
-        data = np.power(grid.vs[0] - grid.vs[4], 2) + np.power(grid.vs[1] -grid.vs[5], 2)
+        capture = Capture([0, 1], [4, 5], capture_radius)
         if mode == "capture":
-            return np.sqrt(data) - capture_radius
+            return capture.evaluate(grid)
         if mode == "escape":
-            return capture_radius - np.sqrt(data)
+            return (~capture).evaluate(grid)
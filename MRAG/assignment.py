@@ -0,0 +1,342 @@
+'''Assignment algorithms for the reach-avoid game.
+
+hopcroft_karp computes maximum matchings of attackers to defenders, hungarian and auction solve weighted assignments
+on NumPy matrices, and greedy_assignment_solver and weighted_assignment_solver assign attackers to defenders with the
+constraints of mip_solver (at most 2 attackers per defender, no escaped pairs) for swarms too large for the MIP.
+All of them are iterative, so the team sizes are not limited by the recursion depth.
+
+'''
+import numpy as np
+
+
+def hopcroft_karp(bigraph, capacity=1):
+    """ Returns a maximum matching of the attackers to the defenders with the Hopcroft-Karp algorithm.
+
+    Args:
+        bigraph (np.ndarray or a list of lists, (num_attackers, num_defenders)): nonzero if the defender could capture the attacker
+        capacity (int): the number of attackers each defender could be matched to
+
+    Returns:
+        num (int): the number of matched attackers
+        selected (a list of lists): the attackers matched to each defender, [[a1], [a2], ...]
+    """
+    bigraph = np.asarray(bigraph)
+    num_attackers, num_defenders = bigraph.shape
+    # Every defender has capacity slots, slot s belongs to the defender s // capacity
+    adjacency = [np.flatnonzero(np.repeat(bigraph[i] != 0, capacity)).tolist() for i in range(num_attackers)]
+    num_slots = num_defenders * capacity
+    attacker_slot = [-1] * num_attackers
+    slot_attacker = [-1] * num_slots
+    infinity = num_attackers + 1
+
+    while True:
+        # Breadth first search for the layers of the shortest augmenting paths from the free attackers
+        distance = [infinity] * num_attackers
+        queue = [i for i in range(num_attackers) if attacker_slot[i] == -1]
+        for i in queue:
+            distance[i] = 0
+        found = False
+        for i in queue:
+            for slot in adjacency[i]:
+                other = slot_attacker[slot]
+                if other == -1:
+                    found = True
+                elif distance[other] == infinity:
+                    distance[other] = distance[i] + 1
+                    queue.append(other)
+        if not found:
+            break
+        # Depth first search along the layers, with explicit stacks
+        position = [0] * num_attackers
+        for root in range(num_attackers):
+            if attacker_slot[root] != -1:
+                continue
+            stack, slots = [root], []
+            while stack:
+                i = stack[-1]
+                if position[i] == len(adjacency[i]):
+                    distance[i] = infinity  # dead end
+                    stack.pop()
+                    if slots:
+                        slots.pop()
+                    continue
+                slot = adjacency[i][position[i]]
+                position[i] += 1
+                other = slot_attacker[slot]
+                if other == -1:
+                    # Augment: every attacker on the stack moves to the slot chosen after it
+                    for attacker, new_slot in zip(stack, slots + [slot]):
+                        attacker_slot[attacker] = new_slot
+                        slot_attacker[new_slot] = attacker
+                    break
+                if distance[other] == distance[i] + 1:
+                    stack.append(other)
+                    slots.append(slot)
+
+    selected = [[] for _ in range(num_defenders)]
+    for slot, attacker in enumerate(slot_attacker):
+        if attacker != -1:
+            selected[slot // capacity].append(attacker)
+    return sum(len(attackers) for attackers in selected), selected
+
+
+def hungarian(cost):
+    """ Returns the assignment of minimum total cost with the Hungarian algorithm (shortest augmenting paths).
+
+    Args:
+        cost (np.ndarray, (n, m)): the cost of assigning row i to column j, use a large cost for the forbidden pairs
+
+    Returns:
+        rows (np.ndarray): the assigned rows, in increasing order, min(n, m) of them
+        cols (np.ndarray): the columns assigned to the rows
+    """
+    cost = np.asarray(cost, dtype=float)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    # Potentials of the rows and columns, and the row assigned to every column, column 0 and row 0 are auxiliary
+    cost = np.hstack([np.zeros((n, 1)), cost])
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    row_of = np.zeros(m + 1, dtype=int)
+    way = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        row_of[0] = i
+        j0 = 0
+        min_reduced = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            free = ~used
+            free[0] = False
+            reduced = cost[row_of[j0] - 1] - u[row_of[j0]] - v
+            better = free & (reduced < min_reduced)
+            min_reduced[better] = reduced[better]
+            way[better] = j0
+            candidates = np.where(free, min_reduced, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+            u[row_of[used]] += delta
+            v[used] -= delta
+            min_reduced[free] -= delta
+            j0 = j1
+            if row_of[j0] == 0:
+                break
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            row_of[j0] = row_of[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(row_of[1:])
+    rows = row_of[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def auction(benefit, epsilon=None):
+    """ Returns the assignment of maximum total benefit with the auction algorithm and epsilon scaling.
+
+    Args:
+        benefit (np.ndarray, (n, m)): the benefit of assigning row i to column j
+        epsilon (float): the final bid increment, the result is within min(n, m) * epsilon of the optimum.
+            Defaults to a value making it optimal for benefits that are multiples of 1e-6 of their range.
+
+    Returns:
+        rows (np.ndarray): the assigned rows, in increasing order, min(n, m) of them
+        cols (np.ndarray): the columns assigned to the rows
+    """
+    benefit = np.asarray(benefit, dtype=float)
+    transposed = benefit.shape[0] > benefit.shape[1]
+    if transposed:
+        benefit = benefit.T
+    n, m = benefit.shape
+    # Square problem: the columns left over go to dummy rows of zero benefit
+    square = np.zeros((m, m))
+    square[:n] = benefit
+    span = max(float(np.ptp(square)), 1e-12)
+    if epsilon is None:
+        epsilon = 1e-6 * span / (m + 1)
+    prices = np.zeros(m)
+    step = span / 4
+    while True:
+        step = max(step, epsilon)
+        owner = np.full(m, -1)
+        column_of = np.full(m, -1)
+        unassigned = list(range(m))
+        while unassigned:
+            i = unassigned.pop()
+            values = square[i] - prices
+            if m == 1:
+                j, increment = 0, step
+            else:
+                second, first = np.argpartition(values, -2)[-2:]
+                j, increment = first, values[first] - values[second] + step
+            prices[j] += increment
+            if owner[j] != -1:
+                column_of[owner[j]] = -1
+                unassigned.append(owner[j])
+            owner[j] = i
+            column_of[i] = j
+        if step <= epsilon:
+            break
+        step /= 5
+
+    rows = np.arange(n)
+    cols = column_of[:n]
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def capture_weights(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedAttackers1vs2):
+    """ Returns the weights of extend_mip_solver: 1 if the defender captures the attacker in the 1 vs. 1 game,
+    0.5 if the attacker only escapes in the 1 vs. 1 game (weakly defended) and 0 if it escapes in both games.
+
+    Args:
+        num_defenders (int): the number of defenders
+        current_attackers_status (np.ndarray, (num_attackers, )): the current moment attackers' status, 0 stands for free, -1 stands for captured, 1 stands for arrived
+        EscapedAttacker1vs1 (list): the attacker that could escape from the defender in a 1 vs 1 game
+        EscapedAttackers1vs2 (list): the attacker that could escape from the defender in a 1 vs 2 game
+
+    Returns:
+        weights (np.ndarray, (num_free_attackers, num_defenders)): the weights for each assignment
+    """
+    free_attackers_positions = np.flatnonzero(np.asarray(current_attackers_status) == 0)
+    index = {attacker: i for i, attacker in enumerate(free_attackers_positions.tolist())}
+    weights = np.ones((len(free_attackers_positions), num_defenders))
+    for j in range(num_defenders):
+        escaped1vs2 = set(EscapedAttackers1vs2[j])
+        for attacker in EscapedAttacker1vs1[j]:
+            weights[index[attacker], j] = 0.0 if attacker in escaped1vs2 else 0.5
+    return weights
+
+
+def _repair(assignments, weights, free_attackers, escaped_pairs):
+    """ Assigns the left over attackers, directly or by moving an assigned attacker to another defender. """
+    num_defenders = len(assignments)
+
+    def fits(attacker, j, others):
+        return weights[attacker][j] > 0 and len(others) < 2 and \
+               all(frozenset((attacker, other)) not in escaped_pairs[j] for other in others)
+
+    improved = True
+    while improved:
+        improved = False
+        assigned = {attacker for attackers in assignments for attacker in attackers}
+        for attacker in free_attackers:
+            if attacker in assigned:
+                continue
+            for j in range(num_defenders):
+                if weights[attacker][j] <= 0:
+                    continue
+                if fits(attacker, j, assignments[j]):
+                    assignments[j].append(attacker)
+                    improved = True
+                    break
+                # Free a place at j by moving one of its attackers to a defender with room
+                for moved in list(assignments[j]):
+                    rest = [other for other in assignments[j] if other != moved]
+                    if not fits(attacker, j, rest):
+                        continue
+                    target = next((k for k in range(num_defenders) if k != j and fits(moved, k, assignments[k])), None)
+                    if target is not None:
+                        assignments[target].append(moved)
+                        assignments[j] = rest + [attacker]
+                        improved = True
+                        break
+                if improved:
+                    break
+            if improved:
+                break
+    return assignments
+
+
+def greedy_assignment_solver(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedPairs2vs1,
+                             weights=None):
+    """ Returns an assignment with the constraints of mip_solver by greedy selection and repair, for large swarms.
+
+    The capturable attacker-defender pairs are taken by decreasing weight while the defender has room and no escaped
+    pair is formed, then the left over attackers are assigned directly or by moving an attacker to another defender.
+
+    Args:
+        num_defenders (int): the number of defenders
+        current_attackers_status (np.ndarray, (num_attackers, )): the current moment attackers' status, 0 stands for free, -1 stands for captured, 1 stands for arrived
+        EscapedAttacker1vs1 (list): the attacker that could escape from the defender in a 1 vs 1 game
+        EscapedPairs2vs1 (list): the pair of attackers that could escape from the defender in a 2 vs 1 game
+        weights (np.ndarray, (num_free_attackers, num_defenders)): the preference of each assignment, default all 1
+
+    Returns:
+        assignments (a list of lists): the list of attackers that the defender assigned to capture
+    """
+    free_attackers = np.flatnonzero(np.asarray(current_attackers_status) == 0).tolist()
+    num_attackers = len(current_attackers_status)
+    table = np.zeros((num_attackers, num_defenders))
+    table[free_attackers] = 1.0 if weights is None else weights
+    for j in range(num_defenders):
+        table[EscapedAttacker1vs1[j], j] = 0.0
+    escaped_pairs = [{frozenset(pair) for pair in EscapedPairs2vs1[j]} for j in range(num_defenders)]
+
+    assignments = [[] for _ in range(num_defenders)]
+    assigned = set()
+    # Attackers with fewer capturing defenders first among equal weights, they are the hardest to place
+    options = (table > 0).sum(axis=1)
+    edges = sorted(((i, j) for i in free_attackers for j in range(num_defenders) if table[i, j] > 0),
+                   key=lambda edge: (-table[edge], options[edge[0]]))
+    for i, j in edges:
+        if i in assigned or len(assignments[j]) == 2:
+            continue
+        if assignments[j] and frozenset((i, assignments[j][0])) in escaped_pairs[j]:
+            continue
+        assignments[j].append(i)
+        assigned.add(i)
+
+    return _repair(assignments, table, free_attackers, escaped_pairs)
+
+
+def weighted_assignment_solver(num_defenders, current_attackers_status, weights, EscapedPairs2vs1,
+                               method='hungarian'):
+    """ Returns the assignment of maximum total weight with at most 2 attackers per defender and no escaped pairs.
+
+    Every defender gets two slots, the slots are assigned with the Hungarian or the auction algorithm, and a defender
+    given an escaped pair keeps the attacker of larger weight, the other one being repaired like in
+    greedy_assignment_solver.
+
+    Args:
+        num_defenders (int): the number of defenders
+        current_attackers_status (np.ndarray, (num_attackers, )): the current moment attackers' status, 0 stands for free, -1 stands for captured, 1 stands for arrived
+        weights (np.ndarray, (num_free_attackers, num_defenders)): the weights for each assignment, 0 for the forbidden ones, see capture_weights
+        EscapedPairs2vs1 (list): the pair of attackers that could escape from the defender in a 2 vs 1 game
+        method (str): "hungarian" or "auction"
+
+    Returns:
+        assignments (a list of lists): the list of attackers that the defender assigned to capture
+    """
+    free_attackers = np.flatnonzero(np.asarray(current_attackers_status) == 0).tolist()
+    weights = np.asarray(weights, dtype=float)
+    assignments = [[] for _ in range(num_defenders)]
+    if free_attackers:
+        slots = np.repeat(weights, 2, axis=1)
+        if method == 'hungarian':
+            rows, cols = hungarian(-slots)
+        elif method == 'auction':
+            rows, cols = auction(slots)
+        else:
+            raise ValueError("Invalid assignment method, use 'hungarian' or 'auction'.")
+        for i, slot in zip(rows, cols):
+            if slots[i, slot] > 0:
+                assignments[slot // 2].append(free_attackers[i])
+
+    num_attackers = len(current_attackers_status)
+    table = np.zeros((num_attackers, num_defenders))
+    table[free_attackers] = weights
+    escaped_pairs = [{frozenset(pair) for pair in EscapedPairs2vs1[j]} for j in range(num_defenders)]
+    for j in range(num_defenders):
+        if len(assignments[j]) == 2 and frozenset(assignments[j]) in escaped_pairs[j]:
+            assignments[j] = [max(assignments[j], key=lambda attacker: table[attacker, j])]
+
+    return _repair(assignments, table, free_attackers, escaped_pairs)
@@ -0,0 +1,132 @@
+'''Benchmark of the capture-assignment solvers against mip_solver.
+
+The 6 vs. 2 and 8 vs. 4 games (MRAG/games/game6vs2_sig.py and game8vs4_sig.py) are sampled around their initial
+states, the judges give the escape sets of every sample and every solver assigns the attackers. The solve time and
+the number of samples where a solver assigns as many attackers as the MIP are reported. A swarm of random escape
+sets shows the scaling of the heuristics beyond the sizes of the games.
+
+Usage:
+    python -m MRAG.assignment_benchmark
+'''
+
+import contextlib
+import io
+import time
+import numpy as np
+
+from MRAG.assignment import capture_weights, greedy_assignment_solver, hopcroft_karp, weighted_assignment_solver
+from MRAG.solvers import exact_assignment_solver, mip_solver
+from MRAG.utilities import hj_preparations_sig, judges
+
+
+# The initial states of the attackers and the defenders of the games
+SCENARIOS = {'6vs2': (np.array([(0.0, 0.0), (0.0, 0.8), (-0.8, 0.0), (0.5, -0.5), (-0.5, -0.3), (0.8, -0.5)]),
+                      np.array([(0.3, 0.5), (-0.3, -0.5)])),
+             '8vs4': (np.array([(0.5, 0.5), (-0.8, 0.8), (-0.8, 0.3), (0.0, 0.8),
+                                (-0.8, -0.2), (-0.8, -0.8), (0.8, -0.8), (0.6, -0.5)]),
+                      np.array([(0.3, 0.3), (0.3, -0.3), (-0.3, 0.3), (-0.3, -0.3)]))}
+
+
+def quiet_mip_solver(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedPairs2vs1):
+    '''mip_solver without its progress messages.'''
+    with contextlib.redirect_stdout(io.StringIO()):
+        return mip_solver(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedPairs2vs1)
+
+
+def matching_bound(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedPairs2vs1):
+    '''Hopcroft-Karp with 2 attackers per defender, ignoring the 2 vs. 1 pairs, an upper bound of the others.'''
+    bigraph = np.zeros((len(current_attackers_status), num_defenders), dtype=int)
+    bigraph[np.asarray(current_attackers_status) == 0] = 1
+    for j in range(num_defenders):
+        bigraph[EscapedAttacker1vs1[j], j] = 0
+    return hopcroft_karp(bigraph, capacity=2)[1]
+
+
+def hungarian_solver(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedPairs2vs1):
+    weights = capture_weights(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedAttacker1vs1)
+    return weighted_assignment_solver(num_defenders, current_attackers_status, weights, EscapedPairs2vs1)
+
+
+def auction_solver(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedPairs2vs1):
+    weights = capture_weights(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedAttacker1vs1)
+    return weighted_assignment_solver(num_defenders, current_attackers_status, weights, EscapedPairs2vs1,
+                                      method='auction')
+
+
+SOLVERS = {'mip': quiet_mip_solver,
+           'exact': exact_assignment_solver,
+           'greedy': greedy_assignment_solver,
+           'hungarian': hungarian_solver,
+           'auction': auction_solver,
+           'matching bound': matching_bound}
+
+
+def run_solvers(instances, solvers=SOLVERS):
+    '''Solves every instance (num_defenders, status, EscapedAttacker1vs1, EscapedPairs2vs1) with every solver.
+
+    Returns:
+        results (dict): per solver, the mean time in ms, the mean number of assigned attackers and the number of
+            instances with as many assigned attackers as the MIP
+    '''
+    counts = {name: [] for name in solvers}
+    times = {name: [] for name in solvers}
+    for instance in instances:
+        for name, solver in solvers.items():
+            start = time.perf_counter()
+            assignments = solver(*instance)
+            times[name].append(time.perf_counter() - start)
+            counts[name].append(sum(len(assigned) for assigned in assignments))
+    reference = np.array(counts['mip']) if 'mip' in counts else None
+    results = {}
+    for name in solvers:
+        results[name] = {'time_ms': 1e3 * float(np.mean(times[name])),
+                         'assigned': float(np.mean(counts[name])),
+                         'as_mip': int(np.sum(np.array(counts[name]) == reference)) if reference is not None else None}
+    return results
+
+
+def game_instances(values, scenario, num_samples=50, noise=0.2, seed=0):
+    '''The initial state of the game and num_samples states around it, with their escape sets.'''
+    value1vs1, value2vs1, value1vs2 = values
+    attackers, defenders = SCENARIOS[scenario]
+    rng = np.random.default_rng(seed)
+    status = np.zeros(len(attackers))
+    instances = []
+    for sample in range(num_samples + 1):
+        scale = 0.0 if sample == 0 else noise
+        sample_attackers = np.clip(attackers + scale * rng.standard_normal(attackers.shape), -0.95, 0.95)
+        sample_defenders = np.clip(defenders + scale * rng.standard_normal(defenders.shape), -0.95, 0.95)
+        EscapedAttacker1vs1, EscapedPairs2vs1, _, _ = judges(sample_attackers, sample_defenders, status,
+                                                             value1vs1, value2vs1, value1vs2)
+        instances.append((len(defenders), status, EscapedAttacker1vs1, EscapedPairs2vs1))
+    return instances
+
+
+def swarm_instances(num_attackers=60, num_defenders=25, num_samples=5, escape=0.8, pair_escape=0.05, seed=0):
+    '''Random escape sets of a swarm, every attacker escaping each defender with probability escape.'''
+    rng = np.random.default_rng(seed)
+    status = np.zeros(num_attackers)
+    instances = []
+    for _ in range(num_samples):
+        EscapedAttacker1vs1 = [np.flatnonzero(rng.random(num_attackers) < escape).tolist()
+                               for _ in range(num_defenders)]
+        EscapedPairs2vs1 = [np.argwhere(np.triu(rng.random((num_attackers, num_attackers)) < pair_escape, 1)).tolist()
+                            for _ in range(num_defenders)]
+        instances.append((num_defenders, status, EscapedAttacker1vs1, EscapedPairs2vs1))
+    return instances
+
+
+def print_results(title, results):
+    print(f"============= {title} =============")
+    for name, result in results.items():
+        as_mip = '' if result['as_mip'] is None else f", as many as the MIP in {result['as_mip']} instances"
+        print(f"{name:>15}: {result['time_ms']:9.3f} ms, {result['assigned']:.2f} attackers assigned{as_mip}")
+
+
+if __name__ == '__main__':
+    _, value1vs1, value2vs1, value1vs2, _, _, _, _ = hj_preparations_sig()
+    for scenario in SCENARIOS:
+        instances = game_instances((value1vs1, value2vs1, value1vs2), scenario)
+        print_results(f"{scenario}, {len(instances)} states", run_solvers(instances))
+    swarm_solvers = {name: SOLVERS[name] for name in ('mip', 'greedy', 'hungarian', 'auction', 'matching bound')}
+    print_results("60vs25 swarm, random escape sets", run_solvers(swarm_instances(), swarm_solvers))
@@ -86,7 +86,7 @@ def find_sign_change1vs0_dub(grid1vs0, value1vs0, attacker):
     return np.where(checklist==1)[0], np.where(checklist==-1)[0]
 
 
-def attacker_control_1vs0_dub(game, grid1vs0, value1vs0, attacker, neg2pos):
+def attacker_control_1vs0_dub(game, grid1vs0, value1vs0, attacker, neg2pos, grad_table=None):
     """Return a list of 1-dimensional control inputs of one defender based on the value function
     
     Args:
@@ -95,17 +95,21 @@ def attacker_control_1vs0_dub(game, grid1vs0, value1vs0, attacker, neg2pos):
     value1vs0 (ndarray): 1vs1 HJ reachability value function with only final slice
     attacker (ndarray, (dim,)): the current state of one attacker
     neg2pos (list): the positions of the value function that change from negative to positive
+    grad_table (GradientTable): the precomputed gradients of all time slices of value1vs0, None to differentiate at runtime
     """
-    current_value = grid1vs0.get_value(value1vs0[..., 0], list(attacker))
-    if current_value > 0:
-        value1vs0 = value1vs0 - current_value
-    v = value1vs0[..., neg2pos] # Minh: v = value1v0[..., neg2pos[0]]
-    # print(neg2pos)
-    # current_slices = po2slice1vs0_dub(attacker, value1vs0.shape[0])
-    # computeSpatDerivArray(grid1vs0, value1vs0[..., 0], deriv_dim=0, accuracy="low")
-    # computeSpatDerivArray(grid1vs0, value1vs0[..., 0], deriv_dim=1, accuracy="low")
-    
-    spat_deriv_vector = spa_deriv(grid1vs0.get_index(attacker), v, grid1vs0, [2])
+    if grad_table is not None:  # shifting the value function does not change its gradient
+        spat_deriv_vector = grad_table.lookup(grid1vs0, attacker, neg2pos[0])
+    else:
+        current_value = grid1vs0.get_value(value1vs0[..., 0], list(attacker))
+        if current_value > 0:
+            value1vs0 = value1vs0 - current_value
+        v = value1vs0[..., neg2pos] # Minh: v = value1v0[..., neg2pos[0]]
+        # print(neg2pos)
+        # current_slices = po2slice1vs0_dub(attacker, value1vs0.shape[0])
+        # computeSpatDerivArray(grid1vs0, value1vs0[..., 0], deriv_dim=0, accuracy="low")
+        # computeSpatDerivArray(grid1vs0, value1vs0[..., 0], deriv_dim=1, accuracy="low")
+
+        spat_deriv_vector = spa_deriv(grid1vs0.get_index(attacker), v, grid1vs0, [2])
     # spat_deriv_vector[2] = computeSpatDerivArray(grid1vs0, value1vs0[..., neg2pos[0]], deriv_dim=3, accuracy="medium")[grid1vs0.get_index(attacker)]
     # print(f"The spatial derivative vector is {spat_deriv_vector}. \n")
     opt_u = game.optCtrl_1vs0(spat_deriv_vector)
@@ -113,7 +117,7 @@ def attacker_control_1vs0_dub(game, grid1vs0, value1vs0, attacker, neg2pos):
     return (opt_u)
 
 
-def hj_contoller_attackers_dub(game, value1vs0_dub, grid1vs0_dub):
+def hj_contoller_attackers_dub(game, value1vs0_dub, grid1vs0_dub, grad_table=None):
     """This function computes the control for the attackers based on the control_attackers. 
        Assume dynamics are single integrator.
 
@@ -121,6 +125,7 @@ def hj_contoller_attackers_dub(game, value1vs0_dub, grid1vs0_dub):
         game (class): the corresponding ReachAvoidGameEnv instance
         value1vs0 (np.ndarray): the value function for 1 vs 0 game with all time slices
         grid1vs0 (Grid): the grid for 1 vs 0 game
+        grad_table (GradientTable): the precomputed gradients of value1vs0_dub, None to differentiate at runtime
     
     Returns:
         control_attackers (ndarray): the control of attackers
@@ -133,7 +138,7 @@ def hj_contoller_attackers_dub(game, value1vs0_dub, grid1vs0_dub):
         if not current_attackers_status[i]:  # the attacker is free
             neg2pos, pos2neg = find_sign_change1vs0_dub(grid1vs0_dub, value1vs0_dub, attackers[i])
             if len(neg2pos):
-                control_attackers[i] = attacker_control_1vs0_dub(game, grid1vs0_dub, value1vs0_dub, attackers[i], neg2pos)
+                control_attackers[i] = attacker_control_1vs0_dub(game, grid1vs0_dub, value1vs0_dub, attackers[i], neg2pos, grad_table)
             else:
                 control_attackers[i] = (0.0)
         else:  # the attacker is captured or arrived
@@ -142,7 +147,7 @@ def hj_contoller_attackers_dub(game, value1vs0_dub, grid1vs0_dub):
     return control_attackers
 
 
-def hj_contoller_defenders_dub_1vs1(game, value1vs1_dub, grid1vs1_dub):
+def hj_contoller_defenders_dub_1vs1(game, value1vs1_dub, grid1vs1_dub, grad_table=None):
     """Return a tuple of 1-dimensional control inputs of one defender based on the value function
     
     Args:
@@ -150,6 +155,7 @@ def hj_contoller_defenders_dub_1vs1(game, value1vs1_dub, grid1vs1_dub):
         grid1v1 (class): the corresponding Grid instance
         value1v1 (ndarray): 1vs1 HJ reachability value function with only final slice
         agents_1v1 (class): the corresponding AttackerDefender instance
+        grad_table (GradientTable): the precomputed gradients of value1vs1_dub, None to differentiate at runtime
     
     Returns:
         opt_d (tuple): the optimal control of the defender
@@ -164,13 +170,13 @@ def hj_contoller_defenders_dub_1vs1(game, value1vs1_dub, grid1vs1_dub):
     d1x, d1y, d1o = defenders[0]
     jointstate_1vs1 = (a1x, a1y, a1o, d1x, d1y, d1o)
 
-    opt_d = defender_control_1vs1_dub(game, grid1vs1_dub, value1vs1_dub, jointstate_1vs1)
+    opt_d = defender_control_1vs1_dub(game, grid1vs1_dub, value1vs1_dub, jointstate_1vs1, grad_table)
     control_defenders[0] = (opt_d)
 
     return control_defenders
 
 
-def defender_control_1vs1_dub(game, grid1vs1_dub, value1vs1_dub, jointstate_1vs1):
+def defender_control_1vs1_dub(game, grid1vs1_dub, value1vs1_dub, jointstate_1vs1, grad_table=None):
     """Return a tuple of 2-dimensional control inputs of one defender based on the value function
     
     Args:
@@ -179,12 +185,16 @@ def defender_control_1vs1_dub(game, grid1vs1_dub, value1vs1_dub, jointstate_1vs1
         value1v1 (ndarray): 1vs1 HJ reachability value function with only final slice
         agents_1v1 (class): the corresponding AttackerDefender instance
         joint_states1v1 (tuple): the corresponding positions of (A1, D1)
+        grad_table (GradientTable): the precomputed gradients of value1vs1_dub, None to differentiate at runtime
     
     Returns:
         opt_d (tuple): the optimal control of the defender
     """
-    value1vs1s = value1vs1_dub[..., np.newaxis] 
-    spat_deriv_vector = spa_deriv(grid1vs1_dub.get_index(jointstate_1vs1), value1vs1s, grid1vs1_dub, [2,5])
+    if grad_table is not None:
+        spat_deriv_vector = grad_table.lookup(grid1vs1_dub, jointstate_1vs1)
+    else:
+        value1vs1s = value1vs1_dub[..., np.newaxis] 
+        spat_deriv_vector = spa_deriv(grid1vs1_dub.get_index(jointstate_1vs1), value1vs1s, grid1vs1_dub, [2,5])
     opt_d = game.optDistb_1vs1(spat_deriv_vector) 
 
     return (opt_d)
@@ -202,7 +212,7 @@ def optDistb_1vs1(spat_deriv, dMode, dMax=1.0):
     return opt_d
 
 
-def hj_controller_dub_1vs1(uMode, dMode, uMax, dMax, speed, attacker_state, defender_state, value1vs1_dub, grid1vs1_dub,  current_status):
+def hj_controller_dub_1vs1(uMode, dMode, uMax, dMax, speed, attacker_state, defender_state, value1vs1_dub, grid1vs1_dub,  current_status, grad_table=None):
     """Return a tuple of 1-dimensional control inputs of one defender based on the value function
     
     Args:
@@ -210,6 +220,7 @@ def hj_controller_dub_1vs1(uMode, dMode, uMax, dMax, speed, attacker_state, defe
         defender_state (ndarray, (1, 3)): the current state of the defender
         grid1vs1 (class): the corresponding Grid instance
         value1vs1 (ndarray): 1vs1 HJ reachability value function with only final slice
+        grad_table (GradientTable): the precomputed gradients of value1vs1_dub, None to differentiate at runtime
 
     Returns:
         opt_d (tuple): the optimal control of the defender
@@ -218,8 +229,11 @@ def hj_controller_dub_1vs1(uMode, dMode, uMax, dMax, speed, attacker_state, defe
     a1x, a1y, a1o = attacker_state[0]
     d1x, d1y, d1o = defender_state[0]
     jointstate_1vs1 = (a1x, a1y, a1o, d1x, d1y, d1o)
-    value1vs1s = value1vs1_dub[..., np.newaxis] 
-    spat_deriv_vector = spa_deriv(grid1vs1_dub.get_index(jointstate_1vs1), value1vs1s, grid1vs1_dub, [2,5])
+    if grad_table is not None:
+        spat_deriv_vector = grad_table.lookup(grid1vs1_dub, jointstate_1vs1)
+    else:
+        value1vs1s = value1vs1_dub[..., np.newaxis] 
+        spat_deriv_vector = spa_deriv(grid1vs1_dub.get_index(jointstate_1vs1), value1vs1s, grid1vs1_dub, [2,5])
     opt_d = dMax
     if spat_deriv_vector[5] > 0:
         if dMode == "min":
@@ -43,6 +43,15 @@ class BaseDynamics:
 
         """
         raise NotImplementedError
+
+
+    def step_all(self, states, actions):
+        """Return the next states of all agents, and optionally of a batch of games, after executing the actions.
+
+        Must be implemented in a subclass.
+
+        """
+        raise NotImplementedError
     
 
     def _get_state(self):
@@ -39,6 +39,7 @@ class DubinsCar(BaseDynamics):
 
     def forward(self, state, action):
         """Update and return the next state of one agent with the action based on the Runge Kutta method.
+        Scalar reference of step_all, the games step through step_all.
                 
         Args:
             state (np.ndarray,  shape(3, )): the state of one agent
@@ -92,6 +93,31 @@ class DubinsCar(BaseDynamics):
         return next_state
 
 
+    def step_all(self, states, actions):
+        """Return the next states of all agents after executing the actions, with the Runge Kutta method of forward.
+
+        Args:
+            states (np.ndarray, shape (..., num, 3)): the states of all agents, optionally of a batch of games
+            actions (np.ndarray, shape (..., num, 1)): the actions of all agents
+
+        Returns:
+            next_states (np.ndarray, shape (..., num, 3)): the next states of all agents
+        """
+        dt = 1.0 / self.frequency
+        theta = states[..., 2]
+        u = np.asarray(actions)[..., 0]
+        # The stages only depend on the heading, which turns at the constant rate u
+        theta2 = theta + 0.5 * dt * u
+        theta4 = theta + dt * u
+        next_states = np.empty(np.broadcast_shapes(states.shape, np.shape(u) + (3,)))
+        next_states[..., 0] = states[..., 0] + dt / 6 * self.speed * (np.cos(theta) + 4 * np.cos(theta2) + np.cos(theta4))
+        next_states[..., 1] = states[..., 1] + dt / 6 * self.speed * (np.sin(theta) + 4 * np.sin(theta2) + np.sin(theta4))
+        # Check the boundary, and make sure the angle is in the range of [-pi, pi)
+        next_states[..., :2] = np.clip(next_states[..., :2], -1.0, 1.0)
+        next_states[..., 2] = np.mod(theta4 + np.pi, 2 * np.pi) - np.pi
+        return next_states
+
+
     def step(self, action):
         """Update and return the next state of all agents after executing the action.
         
@@ -99,5 +125,4 @@ class DubinsCar(BaseDynamics):
             action (np.ndarray, shape (num, 1)): the actions of all agents
 
         """
-        for i in range(self.numbers):
-            self.state[i] = self.forward(self.state[i], action[i])
\ No newline at end of file
+        self.state[:] = self.step_all(self.state, action)
\ No newline at end of file
@@ -37,6 +37,7 @@ class SingleIntegrator(BaseDynamics):
 
     def forward(self, state, action):
         """Update and return the next state of one agent with the action based on the Runge Kutta method.
+        Scalar reference of step_all, the games step through step_all.
         
         Args:
             state (np.ndarray, ): the state of one agent
@@ -72,14 +73,29 @@ class SingleIntegrator(BaseDynamics):
         return x_new, y_new
 
 
+    def step_all(self, states, actions):
+        """Return the next states of all agents after executing the actions.
+        The velocity is constant over one step, so the Runge Kutta update of forward is exactly x + v * u * dt.
+
+        Args:
+            states (np.ndarray, shape (..., num, 2)): the states of all agents, optionally of a batch of games
+            actions (np.ndarray, shape (..., num, 2)): the actions of all agents
+
+        Returns:
+            next_states (np.ndarray, shape (..., num, 2)): the next states of all agents
+        """
+        next_states = states + (self.speed / self.frequency) * np.asarray(actions)
+        # Check the boundary
+        return np.clip(next_states, -1.0, 1.0)
+
+
     def step(self, action):
         """Update and return the next state of all agents after executing the action.
         
         Args:
             action (np.ndarray, shape num_attacker x action_dim): the actions of all agents
         """
-        for i in range(self.numbers):
-            self.state[i] = self.forward(self.state[i], action[i])
+        self.state[:] = self.step_all(self.state, action)
     
 
     def _get_state(self):
@@ -3,9 +3,11 @@
 This module also contains enumerations for cost functions, tasks, disturbances, and quadrotor types.
 '''
 
+import os
 import numpy as np
 import gymnasium as gym
 from MRAG.utilities import make_agents
+from MRAG.envs.TrajectoryLog import TrajectoryLog
 
 
 class Dynamics:
@@ -29,6 +31,9 @@ class BaseGameEnv(gym.Env):
                  initial_defender: np.ndarray=None,  # shape (num_defenders, state_dim)
                  ctrl_freq: int = 200,
                  output_folder='results',
+                 game_length_sec=20,
+                 log_trajectory=True,
+                 log_last_steps=2,
                  ):
         """Initialization of a generic aviary environment.
 
@@ -50,11 +55,18 @@ class BaseGameEnv(gym.Env):
             The control frequency of the environment.
         output_folder : str, optional
             The folder where to save logs.
+        game_length_sec=20 : int, optional
+            The maximum length of the game in seconds, which sizes the logs.
+        log_trajectory : bool, optional
+            Log the whole episode, otherwise only the last log_last_steps steps are kept.
+        log_last_steps : int, optional
+            The number of steps kept when log_trajectory is False, at least the 2 the reward needs.
 
         """
         #### Constants #############################################
         self.CTRL_FREQ = ctrl_freq
         self.SIM_TIMESTEP = 1. / self.CTRL_FREQ  # 0.005s
+        self.GAME_LENGTH_SEC = game_length_sec
         #### Parameters ############################################
         self.NUM_ATTACKERS = num_attackers
         self.NUM_DEFENDERS = num_defenders
@@ -63,6 +75,10 @@ class BaseGameEnv(gym.Env):
         self.ATTACKER_PHYSICS = attackers_dynamics
         self.DEFENDER_PHYSICS = defenders_dynamics
         self.OUTPUT_FOLDER = output_folder
+        self.LOG_TRAJECTORY = log_trajectory
+        self.LOG_LAST_STEPS = log_last_steps
+        assert log_trajectory or log_last_steps >= 2, "At least the last 2 steps must be logged for the reward."
+        self.episode_counter = 0
         #### Input initial states ####################################
         self.init_attackers = initial_attacker
         self.init_defenders = initial_defender
@@ -86,8 +102,8 @@ class BaseGameEnv(gym.Env):
         self.attackers = make_agents(self.ATTACKER_PHYSICS, self.NUM_ATTACKERS, self.init_attackers, self.CTRL_FREQ)
         if self.NUM_DEFENDERS != 0:
             self.defenders = make_agents(self.DEFENDER_PHYSICS, self.NUM_DEFENDERS, self.init_defenders, self.CTRL_FREQ)
-            self.defenders_traj = []
-            self.defenders_actions = []
+            self.defenders_traj = self._makeLog(self.defenders._get_state().shape)
+            self.defenders_actions = self._makeLog((self.NUM_DEFENDERS, self.DEFENDER_PHYSICS['action_dim']))
         else:
             if self.DEFENDER_PHYSICS['id'] == 'fsig':
                 self.defenders = make_agents(self.DEFENDER_PHYSICS, 1, np.zeros((1, 2)), self.CTRL_FREQ)
@@ -96,13 +112,25 @@ class BaseGameEnv(gym.Env):
             self.defenders_traj = None
         #### Initialize/reset counters, players' trajectories and attackers status ###
         self.step_counter = 0
-        self.attackers_traj = []
+        self.attackers_traj = self._makeLog(self.attackers._get_state().shape)
         # self.defenders_traj = []
-        self.attackers_status = []  # 0 stands for free, -1 stands for captured, 1 stands for arrived 
-        self.attackers_actions = []
+        self.attackers_status = self._makeLog((self.NUM_ATTACKERS,))  # 0 stands for free, -1 stands for captured, 1 stands for arrived 
+        self.attackers_actions = self._makeLog((self.NUM_ATTACKERS, self.ATTACKER_PHYSICS['action_dim']))
         # self.defenders_actions = []
 
 
+    def _makeLog(self, shape):
+        """Returns an empty log of the per-step arrays of the given shape.
+
+        The log holds the initial step and GAME_LENGTH_SEC * CTRL_FREQ + 1 steps until truncation, and grows
+        beyond. If LOG_TRAJECTORY is False, it is a ring buffer of the last LOG_LAST_STEPS steps.
+
+        """
+        if self.LOG_TRAJECTORY:
+            return TrajectoryLog(int(self.GAME_LENGTH_SEC * self.CTRL_FREQ) + 2, shape)
+        return TrajectoryLog(self.LOG_LAST_STEPS, shape, ring=True)
+
+
     def _updateAndLog(self):
         """Update and log all players' information after inialization, reset(), or step.
 
@@ -141,11 +169,42 @@ class BaseGameEnv(gym.Env):
 
         """        
         #### Housekeeping ##########################################
+        self.episode_counter += 1
         self._housekeeping()
         #### Update and all players' information #####
         self._updateAndLog()
         
         return self.state
+
+
+    def saveEpisode(self, path=None):
+        """Saves the logs of the current episode to a single compressed .npz file.
+
+        Call it before reset(), which starts a new episode with empty logs.
+
+        Parameters
+        ----------
+        path : str, optional
+            The file to write, default is episode<number>.npz in the output folder.
+
+        Returns
+        -------
+        str
+            The path of the written file.
+
+        """
+        if path is None:
+            os.makedirs(self.OUTPUT_FOLDER, exist_ok=True)
+            path = os.path.join(self.OUTPUT_FOLDER, f'episode{self.episode_counter}.npz')
+        logs = {'attackers_traj': self.attackers_traj.to_array(),
+                'attackers_status': self.attackers_status.to_array(),
+                'attackers_actions': self.attackers_actions.to_array(),
+                'ctrl_freq': self.CTRL_FREQ}
+        if self.NUM_DEFENDERS != 0:
+            logs['defenders_traj'] = self.defenders_traj.to_array()
+            logs['defenders_actions'] = self.defenders_actions.to_array()
+        np.savez_compressed(path, **logs)
+        return path
     
 
     def step(self,
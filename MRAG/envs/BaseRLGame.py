@@ -26,6 +26,9 @@ class BaseRLGameEnv(BaseGameEnv):
                  initial_defender: np.ndarray=None,  # shape (num_defenders, state_dim)
                  ctrl_freq: int = 200,
                  output_folder='results',
+                 game_length_sec=20,
+                 log_trajectory=True,
+                 log_last_steps=2,
                  ):
         """Initialization of a generic aviary environment.
 
@@ -47,13 +50,20 @@ class BaseRLGameEnv(BaseGameEnv):
             The control frequency of the environment.
         output_folder : str, optional
             The folder where to save logs.
+        game_length_sec=20 : int, optional
+            The maximum length of the game in seconds.
+        log_trajectory : bool, optional
+            Log the whole episode, otherwise only the last log_last_steps steps are kept.
+        log_last_steps : int, optional
+            The number of steps kept when log_trajectory is False.
 
         """
            
         super().__init__(num_attackers=num_attackers, num_defenders=num_defenders, 
                          attackers_dynamics=attackers_dynamics, defenders_dynamics=defenders_dynamics, 
                          initial_attacker=initial_attacker, initial_defender=initial_defender, 
-                         ctrl_freq=ctrl_freq, output_folder=output_folder
+                         ctrl_freq=ctrl_freq, output_folder=output_folder, game_length_sec=game_length_sec,
+                         log_trajectory=log_trajectory, log_last_steps=log_last_steps
                          )
 
    
@@ -28,6 +28,8 @@ class DubinCarGameEnv(BaseRLGameEnv):
                  map={'map': [-1.0, 1.0, -1.0, 1.0]},  # Hanyang: rectangele [xmin, xmax, ymin, ymax]
                  des={'goal0': [0.6, 0.8, 0.1, 0.3]},  # Hanyang: rectangele [xmin, xmax, ymin, ymax]
                  obstacles: dict = {'obs1': [-0.1, 0.1, -1.0, -0.3], 'obs2': [-0.1, 0.1, 0.3, 0.6]},  # Hanyang: rectangele [xmin, xmax, ymin, ymax],  
+                 log_trajectory=True,
+                 log_last_steps=2,
                  ):
         """Initialization of a generic aviary environment.
 
@@ -61,13 +63,18 @@ class DubinCarGameEnv(BaseRLGameEnv):
             The goal in the environment, default is a rectangle.
         obstacles : dict, optional
             The obstacles in the environment, default is rectangle.
+        log_trajectory : bool, optional
+            Log the whole episode, otherwise only the last log_last_steps steps are kept.
+        log_last_steps : int, optional
+            The number of steps kept when log_trajectory is False.
 
         """
            
         super().__init__(num_attackers=num_attackers, num_defenders=num_defenders, 
                          attackers_dynamics=attackers_dynamics, defenders_dynamics=defenders_dynamics, 
                          initial_attacker=initial_attacker, initial_defender=initial_defender, 
-                         ctrl_freq=ctrl_freq, output_folder=output_folder
+                         ctrl_freq=ctrl_freq, output_folder=output_folder, game_length_sec=game_length_sec,
+                         log_trajectory=log_trajectory, log_last_steps=log_last_steps
                          )
         
         assert map is not None, "Map must be provided in the game."
@@ -79,7 +86,6 @@ class DubinCarGameEnv(BaseRLGameEnv):
         self.map = map
         self.des = des
         self.obstacles = obstacles
-        self.GAME_LENGTH_SEC = game_length_sec
         self.uMode = uMode
         self.dMode = dMode
 
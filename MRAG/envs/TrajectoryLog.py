@@ -0,0 +1,80 @@
+'''Array-backed logs of the game environments.
+
+A TrajectoryLog stores one array of a fixed shape per step in a single preallocated buffer instead of a list of
+small arrays. It indexes like the lists the environments used to keep (log[-1], log[-2], log[step], len(log),
+iteration and np.array(log)), so the plotting and controller functions take it unchanged.
+
+'''
+
+import numpy as np
+
+
+class TrajectoryLog:
+    """Preallocated log of the per-step arrays of one episode.
+
+    """
+    def __init__(self, capacity, shape, dtype=float, ring=False):
+        """Initialization of an empty log.
+
+        Parameters
+        ----------
+        capacity : int
+            The number of steps the buffer holds. A full log doubles its buffer, unless ring is set.
+        shape : tuple
+            The shape of the array logged at every step.
+        dtype : data-type, optional
+            The type of the logged arrays.
+        ring : bool, optional
+            Keep only the last capacity steps, overwriting the oldest ones.
+
+        """
+        assert capacity > 0, "The capacity of the log must be positive."
+        self.ring = ring
+        self.buffer = np.zeros((capacity,) + tuple(shape), dtype=dtype)
+        self.count = 0  # the number of steps appended so far
+
+
+    def append(self, value):
+        """Logs the array of the current step.
+
+        """
+        capacity = self.buffer.shape[0]
+        if self.count >= capacity and not self.ring:
+            self.buffer = np.concatenate([self.buffer, np.zeros_like(self.buffer)])
+        self.buffer[self.count % self.buffer.shape[0]] = value
+        self.count += 1
+
+
+    def __len__(self):
+        return min(self.count, self.buffer.shape[0])
+
+
+    def _order(self):
+        """Returns the buffer positions of the kept steps, oldest first."""
+        length = len(self)
+        return (np.arange(self.count - length, self.count)) % self.buffer.shape[0]
+
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            length = len(self)
+            if not -length <= index < length:
+                raise IndexError(f"Step {index} is out of the {length} logged steps.")
+            index = index % length
+            return self.buffer[(self.count - length + index) % self.buffer.shape[0]].copy()
+        return self.buffer[self._order()[index]]
+
+
+    def __iter__(self):
+        for position in self._order():
+            yield self.buffer[position].copy()
+
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.buffer[self._order()]
+        return array if dtype is None else array.astype(dtype)
+
+
+    def to_array(self):
+        """Returns the kept steps, oldest first, as one array of shape (steps,) + shape."""
+        return self.buffer[self._order()]
@@ -0,0 +1,261 @@
+'''Vectorized environment class module for the reach-avoid game.
+
+VecReachAvoidGameEnv runs num_envs reach-avoid games side by side, holding the states of all games in
+(num_envs, num_agents, state_dim) arrays. Dynamics, arrival and capture checks, rewards and resets are computed for
+all games at once with NumPy, for PPO training and Monte-Carlo evaluation over many episodes.
+
+'''
+
+import numpy as np
+from gymnasium.vector.utils import batch_space
+
+from MRAG.envs.BaseGame import Dynamics
+from MRAG.envs.ReachAvoidGame import ReachAvoidGameEnv
+
+
+class VecReachAvoidGameEnv:
+    """Batch of multi-agent reach-avoid games with the rules of ReachAvoidGameEnv.
+
+    """
+    def __init__(self,
+                 num_envs: int=1,
+                 num_attackers: int=1,
+                 num_defenders: int=1,
+                 attackers_dynamics=Dynamics.SIG,
+                 defenders_dynamics=Dynamics.FSIG,
+                 initial_attacker: np.ndarray=None,  # shape (num_atackers, state_dim) or (num_envs, num_atackers, state_dim)
+                 initial_defender: np.ndarray=None,  # shape (num_defenders, state_dim) or (num_envs, num_defenders, state_dim)
+                 initializer=None,
+                 ctrl_freq: int = 200,
+                 game_length_sec=20,
+                 map={'map': [-1., 1., -1., 1.]},  # Hanyang: rectangele [xmin, xmax, ymin, ymax]
+                 des={'goal0': [0.6, 0.8, 0.1, 0.3]},  # Hanyang: rectangele [xmin, xmax, ymin, ymax]
+                 obstacles: dict = None,
+                 capture_radius=0.1,
+                 autoreset=True,
+                 seed: int = None,
+                 ):
+        """Initialization of the batch of games.
+
+        Parameters
+        ----------
+        num_envs : int, optional
+            The number of games played side by side.
+        num_attackers : int, optional
+            The number of attackers in each game.
+        num_defenders : int, optional
+            The number of defenders in each game.
+        attackers_dynamics : Physics instance
+            A dictionary contains the dynamics of the attackers.
+        defenders_dynamics : Physics instance
+            A dictionary contains the dynamics of the defenders.
+        initial_attacker : np.ndarray, optional
+            The initial states of the attackers, shared by all games or one per game.
+        initial_defender : np.ndarray, optional
+            The initial states of the defenders, shared by all games or one per game.
+        initializer : callable, optional
+            Draws new initial states when games are reset, initializer(rng, num) returns the attackers and the
+            defenders of num games with shapes (num, num_attackers, state_dim) and (num, num_defenders, state_dim).
+            Defaults to the initial states given above.
+        ctrl_freq : int, optional
+            The control frequency of the environment.
+        game_length_sec=20 : int, optional
+            The maximum length of the game in seconds.
+        map : dict, optional
+            The map of the environment, default is rectangle.
+        des : dict, optional
+            The goal in the environment, default is a rectangle.
+        obstacles : dict, optional
+            The obstacles in the environment, default is rectangle.
+        capture_radius : float, optional
+            The distance at which a defender captures an attacker.
+        autoreset : bool, optional
+            Reset the games that terminated or were truncated at the end of step.
+        seed : int, optional
+            Seed of the random generator given to initializer.
+
+        """
+        self.num_envs = num_envs
+        self.NUM_ATTACKERS = num_attackers
+        self.NUM_DEFENDERS = num_defenders
+        self.NUM_PLAYERS = num_attackers + num_defenders
+        self.ATTACKER_PHYSICS = attackers_dynamics
+        self.DEFENDER_PHYSICS = defenders_dynamics
+        self.CTRL_FREQ = ctrl_freq
+        self.SIM_TIMESTEP = 1. / self.CTRL_FREQ
+        self.GAME_LENGTH_SEC = game_length_sec
+        self.map = map
+        self.des = des
+        self.obstacles = obstacles
+        self.capture_radius = capture_radius
+        self.autoreset = autoreset
+        self.initializer = initializer
+        self.rng = np.random.default_rng(seed)
+
+        if initializer is None:
+            assert initial_attacker is not None, "Initial attacker or an initializer must be provided in the game."
+            if num_defenders > 0:
+                assert initial_defender is not None, "Initial defender or an initializer must be provided in the game."
+        self.init_attackers = initial_attacker
+        self.init_defenders = initial_defender
+
+        #### Spaces of one game, and of the batch ##################
+        attackers, defenders = self._initialStates(np.arange(num_envs) == 0)
+        template = ReachAvoidGameEnv(num_attackers=num_attackers, num_defenders=num_defenders,
+                                     attackers_dynamics=attackers_dynamics, defenders_dynamics=defenders_dynamics,
+                                     initial_attacker=attackers[0].copy(),
+                                     initial_defender=defenders[0].copy() if num_defenders > 0 else None,
+                                     ctrl_freq=ctrl_freq, game_length_sec=game_length_sec,
+                                     map=map, des=des, obstacles=obstacles)
+        # The dynamics objects of the template integrate the agents of all games at once, see step_all
+        self.attacker_agents = template.attackers
+        self.defender_agents = template.defenders
+        self.single_action_space = template.action_space
+        self.single_observation_space = template.observation_space
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        self.reset()
+
+
+    def _initialStates(self, mask):
+        """Returns the initial states of the games selected by mask, shapes (num, num_attackers, dim)
+        and (num, num_defenders, dim) with num the number of selected games."""
+        num = int(np.count_nonzero(mask))
+        if self.initializer is not None:
+            return self.initializer(self.rng, num)
+        attackers = np.broadcast_to(self.init_attackers,
+                                    (self.num_envs, self.NUM_ATTACKERS, self.ATTACKER_PHYSICS['state_dim']))[mask]
+        if self.NUM_DEFENDERS == 0:
+            defenders = np.zeros((num, 0, self.DEFENDER_PHYSICS['state_dim']))
+        else:
+            defenders = np.broadcast_to(self.init_defenders,
+                                        (self.num_envs, self.NUM_DEFENDERS, self.DEFENDER_PHYSICS['state_dim']))[mask]
+        return attackers, defenders
+
+
+    def reset(self, seed : int = None, mask=None):
+        """Resets all games, or the games selected by mask.
+
+        Parameters
+        ----------
+        seed : int, optional
+            Random seed of the initializer.
+        mask : ndarray of bool, shape (num_envs,), optional
+            The games to reset, all of them by default.
+
+        Returns
+        -------
+        ndarray, shape (num_envs, NUM_PLAYERS, dim)
+            The observations of all games.
+
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+            self.attackers = np.zeros((self.num_envs, self.NUM_ATTACKERS, self.ATTACKER_PHYSICS['state_dim']))
+            self.defenders = np.zeros((self.num_envs, self.NUM_DEFENDERS, self.DEFENDER_PHYSICS['state_dim']))
+            self.attackers_status = np.zeros((self.num_envs, self.NUM_ATTACKERS))
+            self.step_counter = np.zeros(self.num_envs, dtype=int)
+        if np.any(mask):
+            attackers, defenders = self._initialStates(mask)
+            self.attackers[mask] = attackers
+            self.defenders[mask] = defenders
+            self.attackers_status[mask] = 0
+            self.step_counter[mask] = 0
+
+        return self._computeObs()
+
+
+    def step(self, actions):
+        """Advances all games by one simulation step.
+
+        Parameters
+        ----------
+        actions : ndarray, shape (num_envs, NUM_PLAYERS, dim_action)
+            The actions of all players of all games (in the sequence of attackers + defenders).
+
+        Returns
+        -------
+        ndarray, shape (num_envs, NUM_PLAYERS, dim)
+            The observations, of the new games for the games that were reset.
+        ndarray, shape (num_envs,)
+            The rewards.
+        ndarray of bool, shape (num_envs,)
+            Whether the games are over.
+        ndarray of bool, shape (num_envs,)
+            Whether the games timed out.
+        dict[..]
+            The steps and the status of the attackers of every game, and the final observations of the games
+            that were reset under 'final_observation', selected by '_final_observation'.
+
+        """
+        assert actions.shape[:2] == (self.num_envs, self.NUM_PLAYERS), \
+            "The action dimension does not match the games, attackers and defenders."
+
+        self.attackers = self.attacker_agents.step_all(self.attackers, actions[:, :self.NUM_ATTACKERS])
+        if self.NUM_DEFENDERS > 0:
+            self.defenders = self.defender_agents.step_all(self.defenders, actions[:, self.NUM_ATTACKERS:])
+
+        last_status = self.attackers_status
+        self.attackers_status = self._getAttackersStatus()
+
+        obs = self._computeObs()
+        # Same rules as ReachAvoidGameEnv._computeReward, _computeTerminated and _computeTruncated
+        reward = -1.0 - 10 * np.sum(self.attackers_status - last_status, axis=1)
+        terminated = np.all(self.attackers_status != 0, axis=1)
+        truncated = self.step_counter / self.CTRL_FREQ > self.GAME_LENGTH_SEC
+        info = {'current_steps': self.step_counter.copy(), 'current_attackers_status': self.attackers_status.copy()}
+
+        self.step_counter += 1
+
+        done = terminated | truncated
+        if self.autoreset and np.any(done):
+            info['final_observation'] = obs
+            info['_final_observation'] = done
+            obs = self.reset(mask=done)
+
+        return obs, reward, terminated, truncated, info
+
+
+    def _getAttackersStatus(self):
+        """Returns the current status of all attackers of all games.
+
+        0 stands for free, -1 stands for captured, 1 stands for arrived. Like ReachAvoidGameEnv, the status is
+        only updated from the second step of a game on.
+
+        Returns
+            ndarray, shape (num_envs, num_attackers)
+
+        """
+        status = self.attackers_status.copy()
+        positions = self.attackers[..., :2]
+        arrived = np.zeros(status.shape, dtype=bool)
+        for x_lower, x_upper, y_lower, y_upper in self.des.values():
+            arrived |= ((x_lower <= positions[..., 0]) & (positions[..., 0] <= x_upper)
+                        & (y_lower <= positions[..., 1]) & (positions[..., 1] <= y_upper))
+        if self.NUM_DEFENDERS > 0:
+            # Distances of every attacker to every defender, shape (num_envs, num_attackers, num_defenders)
+            distances = np.linalg.norm(positions[:, :, np.newaxis] - self.defenders[:, np.newaxis, :, :2], axis=-1)
+            captured = np.any(distances <= self.capture_radius, axis=-1)
+        else:
+            captured = np.zeros(status.shape, dtype=bool)
+
+        free = (status == 0) & (self.step_counter > 0)[:, np.newaxis]
+        status[free & arrived] = 1
+        status[free & ~arrived & captured] = -1
+        return status
+
+
+    def _computeObs(self):
+        """Returns the current observations, the states of the attackers followed by the defenders of every game.
+
+        Returns
+        -------
+        ndarray, shape (num_envs, NUM_PLAYERS, dim)
+
+        """
+        if self.NUM_DEFENDERS == 0:
+            return self.attackers.copy()
+        return np.concatenate([self.attackers, self.defenders], axis=1)
@@ -1,7 +1,8 @@
 import numpy as np
 
 from MRAG.envs.ReachAvoidGame import ReachAvoidGameEnv
-from MRAG.solvers import mip_solver, extend_mip_solver
+from MRAG.solvers import AssignmentSolver
+from MRAG.gradient_tables import load_gradient_tables_sig
 from MRAG.utilities import *
 from MRAG.sig_controllers import hj_controller_attackers_1vs0, hj_controller_defenders
 from MRAG.plots import animation
@@ -9,6 +10,7 @@ from MRAG.plots import animation
 
 #### Game Settings ####
 value1vs0, value1vs1, value2vs1, value1vs2, grid1vs0, grid1vs1, grid2vs1, grid1vs2  = hj_preparations_sig()
+grad_tables = load_gradient_tables_sig(missing_ok=True)  # python -m MRAG.gradient_tables computes them
 num_attackers = 6
 num_defenders = 2
 initial_attacker = np.array([(0.0, 0.0), (0.0, 0.8), (-0.8, 0.0), (0.5, -0.5), (-0.5, -0.3), (0.8, -0.5)])
@@ -23,14 +25,15 @@ total_steps = int(T * ctrl_freq)
 game = ReachAvoidGameEnv(num_attackers=num_attackers, num_defenders=num_defenders, 
                          initial_attacker=initial_attacker, initial_defender=initial_defender, 
                          ctrl_freq=ctrl_freq)
+solver = AssignmentSolver(num_defenders)
 
 #### Game Loop ####
 print(f"================ The game starts now. ================")
 for step in range(total_steps):
     EscapedAttacker1vs1, EscapedPairs2vs1, EscapedAttackers1vs2, EscapedTri1vs2 = judges(game.attackers.state, game.defenders.state, game.attackers_status[-1], value1vs1, value2vs1, value1vs2)
-    assignments = mip_solver(num_defenders, game.attackers_status[-1],  EscapedAttacker1vs1, EscapedPairs2vs1)
-    control_defenders = hj_controller_defenders(game, assignments, value1vs1, value2vs1, grid1vs1, grid2vs1)
-    control_attackers = hj_controller_attackers_1vs0(game, value1vs0, grid1vs0)
+    assignments = solver.solve(game.attackers_status[-1],  EscapedAttacker1vs1, EscapedPairs2vs1)
+    control_defenders = hj_controller_defenders(game, assignments, value1vs1, value2vs1, grid1vs1, grid2vs1, grad_tables)
+    control_attackers = hj_controller_attackers_1vs0(game, value1vs0, grid1vs0, grad_tables.get('1vs0'))
     obs, reward, terminated, truncated, info = game.step(np.vstack((control_attackers, control_defenders)))
     
     if terminated or truncated:
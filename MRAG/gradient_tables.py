@@ -0,0 +1,173 @@
+'''Precomputed spatial gradient tables for the HJ controllers.
+
+The controllers need the averaged spatial derivatives of a value function at the current joint state.
+Instead of differentiating the value function at every control step, the derivatives of every grid node
+are computed once with computeSpatDerivArray and stored next to the value function as <name>_grad.npy,
+with shape grid_shape + (dims,), or grid_shape + (len(tau), dims) for value functions with all time slices.
+
+Usage:
+    python -m MRAG.gradient_tables  # computes the tables of the single integrator and Dubins car values
+'''
+
+import functools
+import os
+import numpy as np
+
+from odp.solver import computeSpatDerivArray
+from MRAG.value_registry import DUB_VALUE_FILES, SIG_VALUE_FILES, open_game_value
+
+
+def gradient_table_path(value_path):
+    '''Returns the path of the gradient table stored next to the value function at value_path.'''
+    return os.path.splitext(value_path)[0] + '_grad.npy'
+
+
+def compute_gradient_table(value_path, grid, time_slices=False, accuracy="low", dtype=np.float32):
+    '''Computes the averaged spatial derivatives of a value function at every grid node and stores them.
+    With accuracy "low" they are the same derivatives as spa_deriv computes at runtime.
+
+    Args:
+        value_path (str): path of the .npy value function
+        grid (Grid): the grid of the value function
+        time_slices (bool): True if the last axis of the value function holds the time slices
+        accuracy (str): "low" or "medium", the ENO order used by computeSpatDerivArray
+        dtype (np.dtype): storage type of the table, np.float32 or np.float16
+
+    Returns:
+        table_path (str): the path of the stored gradient table
+    '''
+    value = np.load(value_path, mmap_mode='r')
+    grid_shape = tuple(int(n) for n in grid.pts_each_dim)
+    slices = [None]
+    table_shape = grid_shape + (grid.dims,)
+    if time_slices:
+        slices = list(range(value.shape[-1]))
+        table_shape = grid_shape + (value.shape[-1], grid.dims)
+
+    table_path = gradient_table_path(value_path)
+    table = np.lib.format.open_memmap(table_path, mode='w+', dtype=dtype, shape=table_shape)
+    for t in slices:
+        V = np.asarray(value if t is None else value[..., t], dtype=np.float32)
+        for dim in range(grid.dims):
+            deriv = computeSpatDerivArray(grid, V, deriv_dim=dim + 1, accuracy=accuracy)
+            if t is None:
+                table[..., dim] = deriv
+            else:
+                table[..., t, dim] = deriv
+    table.flush()
+    del table
+
+    return table_path
+
+
+class GradientTable:
+    '''Read-only, memory-mapped access to a gradient table written by compute_gradient_table.'''
+
+    def __init__(self, table_path, interpolate=False):
+        '''
+        Args:
+            table_path (str): path of the gradient table
+            interpolate (bool): interpolate the table multilinearly in lookup instead of
+                taking the gradient of the closest grid node, for coarse grids
+        '''
+        self.table = np.load(table_path, mmap_mode='r')
+        self.interpolate = interpolate
+
+    def lookup(self, grid, state, time_index=None):
+        '''Returns the spatial derivatives at a state, as the controllers use them.
+
+        Args:
+            grid (Grid): the grid of the value function
+            state (tuple): the joint state
+            time_index (int): the time slice, only for tables with time slices
+
+        Returns:
+            spat_deriv_vector (list): the derivative along each dimension
+        '''
+        if not self.interpolate:
+            return self.gradient(grid.get_index(state), time_index)
+        table = self.table if time_index is None else self.table[..., time_index, :]
+        return [float(deriv) for deriv in grid.interpolate(table, state)[0]]
+
+    def gradient(self, slice_index, time_index=None):
+        '''Returns the spatial derivatives at one grid index, like spa_deriv.
+
+        Args:
+            slice_index (tuple): the grid index, e.g. from Grid.get_index
+            time_index (int): the time slice, only for tables with time slices
+
+        Returns:
+            spat_deriv_vector (list): the derivative along each dimension
+        '''
+        index = tuple(slice_index) if time_index is None else tuple(slice_index) + (time_index,)
+        return [float(deriv) for deriv in self.table[index]]
+
+    def gradients(self, slice_indices, time_index=None):
+        '''Returns the spatial derivatives at many grid indices at once.
+
+        Args:
+            slice_indices (np.ndarray, (num, dims)): the grid indices
+            time_index (int): the time slice, only for tables with time slices
+
+        Returns:
+            spat_derivs (np.ndarray, (num, dims)): the derivatives at each index
+        '''
+        index = tuple(np.asarray(slice_indices).T)
+        if time_index is not None:
+            index = index + (time_index,)
+        return np.asarray(self.table[index], dtype=np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def load_gradient_table(table_path, interpolate=False):
+    '''Returns the GradientTable stored at table_path, opened only once per process.'''
+    return GradientTable(table_path, interpolate)
+
+
+def load_gradient_tables(value_files, interpolate=False, missing_ok=False):
+    '''Loads the gradient tables of registered value functions, see compute_gradient_tables.
+
+    Args:
+        value_files (dict): the path of each value function and whether it holds all time slices, keyed by game,
+            e.g. SIG_VALUE_FILES
+        interpolate (bool): interpolate the gradients between grid nodes, see GradientTable
+        missing_ok (bool): leave out the games whose table has not been computed instead of failing
+
+    Returns:
+        grad_tables (dict): the GradientTable of each game
+    '''
+    grad_tables = {}
+    for game, (value_path, _) in value_files.items():
+        table_path = gradient_table_path(value_path)
+        if missing_ok and not os.path.exists(table_path):
+            continue
+        grad_tables[game] = load_gradient_table(table_path, interpolate)
+    return grad_tables
+
+
+def load_gradient_tables_sig(interpolate=False, missing_ok=False):
+    '''Loads the gradient tables of the single integrator value functions, keyed by '1vs0', '1vs1', '2vs1' and '1vs2'.'''
+    return load_gradient_tables(SIG_VALUE_FILES, interpolate, missing_ok)
+
+
+def load_gradient_tables_dub(interpolate=False, missing_ok=False):
+    '''Loads the gradient tables of the Dubins car value functions, keyed by '1vs0_dub' and '1vs1_dub'.'''
+    return load_gradient_tables(DUB_VALUE_FILES, interpolate, missing_ok)
+
+
+def compute_gradient_tables(value_files, accuracy="low", dtype=np.float32):
+    '''Computes the gradient tables of registered value functions, e.g. SIG_VALUE_FILES.'''
+    for game, (value_path, time_slices) in value_files.items():
+        _, grid = open_game_value(game)
+        table_path = compute_gradient_table(value_path, grid, time_slices, accuracy, dtype)
+        print(f"============= Gradient table of {game} saved to {table_path} =============")
+
+
+def compute_gradient_tables_sig(accuracy="low", dtype=np.float32):
+    '''Computes the gradient tables of all value functions loaded by hj_preparations_sig.'''
+    compute_gradient_tables(SIG_VALUE_FILES, accuracy, dtype)
+
+
+if __name__ == '__main__':
+    compute_gradient_tables_sig()
+    compute_gradient_tables({game: files for game, files in DUB_VALUE_FILES.items() if os.path.exists(files[0])})
@@ -0,0 +1,63 @@
+'''Quantized storage of the HJ value functions used by the games.
+
+The games only need the sign of the value functions and their gradient near the zero level set, so the
+value functions can be loaded with their magnitude clamped and stored in float16, int8 or int16
+(see odp.value_store.save_quantized), next to the original as <name>_<dtype>.npy. hj_preparations_sig(quantized=dtype)
+then memory-maps them instead of loading the float arrays, and the judges and controllers read them like arrays.
+
+Usage:
+    python -m MRAG.quantized_values [dtype] [clamp]  # quantizes the values loaded by hj_preparations_sig and validates them
+'''
+
+import os
+import sys
+import numpy as np
+
+from odp.value_store import QuantizedValueFunction, compare_quantized, save_quantized
+from MRAG.utilities import EPSILON_1VS2
+from MRAG.value_registry import SIG_VALUE_FILES, quantized_value_path
+
+
+# The values the games take their decisions at: the sign changes of 1vs0, the escapes of the judges
+DECISION_THRESHOLDS = {'1vs0': 0.0, '1vs1': 0.0, '2vs1': 0.0, '1vs2': EPSILON_1VS2}
+
+
+def quantize_values_sig(dtype="int16", clamp=0.5):
+    '''Stores quantized copies of all value functions loaded by hj_preparations_sig.
+
+    Args:
+        dtype (str): "float16", "int8" or "int16"
+        clamp (float): magnitude the values are clamped to, a few grid cells of distance from the zero level set
+    '''
+    for game, (value_path, _) in SIG_VALUE_FILES.items():
+        path = quantized_value_path(value_path, dtype)
+        save_quantized(path, np.load(value_path, mmap_mode='r'), dtype, clamp)
+        print(f"============= Quantized value function of {game} saved to {path} =============")
+
+
+def validate_quantized_sig(dtype="int16"):
+    '''Compares the capture decisions of the quantized value functions against the full precision originals,
+    at the threshold each game decides at, see DECISION_THRESHOLDS.
+
+    Returns:
+        reports (dict): the report of odp.value_store.compare_quantized of each game
+    '''
+    reports = {}
+    for game, (value_path, _) in SIG_VALUE_FILES.items():
+        original = np.load(value_path, mmap_mode='r')
+        quantized = QuantizedValueFunction(quantized_value_path(value_path, dtype))
+        reports[game] = compare_quantized(original, quantized, threshold=DECISION_THRESHOLDS[game])
+        report = reports[game]
+        print(f"{game} ({dtype}, clamp {quantized.clamp}): decision mismatch at {DECISION_THRESHOLDS[game]} "
+              f"{report['decision_mismatch']:.2e}, "
+              f"sampled decision mismatch {report['sample_mismatch']:.2e}, "
+              f"max error near the zero level set {report['band_max_error']:.2e}, "
+              f"size {os.path.getsize(value_path) / 1e9:.2f} GB -> {quantized.data.nbytes / 1e9:.2f} GB")
+    return reports
+
+
+if __name__ == '__main__':
+    dtype = sys.argv[1] if len(sys.argv) > 1 else "int16"
+    clamp = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    quantize_values_sig(dtype, clamp)
+    validate_quantized_sig(dtype)
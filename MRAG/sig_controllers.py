@@ -8,64 +8,46 @@ def spa_deriv(slice_index, value_function, grid, periodic_dims=[]):
     """
     Calculates the spatial derivatives of V at an index for each dimension
 
+    Only the grid nodes next to slice_index are read, so that memory-mapped and quantized value functions
+    are not loaded or dequantized as a whole.
+
     Args:
         slice_index: (a1x, a1y)
-        value_function (ndarray): [..., neg2pos] where neg2pos is a list [scalar] or []
+        value_function (ndarray): [..., neg2pos] where neg2pos is a list [scalar] or [], or the value function
+            with only the grid axes
         grid (class): the instance of the corresponding Grid
         periodic_dims (list): the corrsponding periodical dimensions []
 
     Returns:
         List of left and right spatial derivatives for each dimension
     """
+    shape = value_function.shape
+    # The neighbours of slice_index along each grid axis, wrapped around the periodic boundaries
+    neighbours = np.ix_(*[np.arange(idx - 1, idx + 2) % shape[dim] for dim, idx in enumerate(slice_index)])
+    block = np.asarray(value_function[neighbours])
+    if block.ndim == len(slice_index):
+        block = block[..., np.newaxis]
+    center = (1,) * len(slice_index)
+    value = block[center]
+
     spa_derivatives = []
     for dim, idx in enumerate(slice_index):
-        if dim == 0:
-            left_index = []
-        else:
-            left_index = list(slice_index[:dim])
+        next_value = block[center[:dim] + (2,) + center[dim + 1:]]
+        prev_value = block[center[:dim] + (0,) + center[dim + 1:]]
 
-        if dim == len(slice_index) - 1:
-            right_index = []
-        else:
-            right_index = list(slice_index[dim + 1:])
-
-        next_index = tuple(
-            left_index + [slice_index[dim] + 1] + right_index
-        )
-        prev_index = tuple(
-            left_index + [slice_index[dim] - 1] + right_index
-        )
-
-        if idx == 0:
-            if dim in periodic_dims:
-                left_periodic_boundary_index = tuple(
-                    left_index + [value_function.shape[dim] - 1] + right_index
-                )
-                left_boundary = value_function[left_periodic_boundary_index]
-            else:
-                left_boundary = value_function[slice_index] + np.abs(value_function[next_index] - value_function[slice_index]) * np.sign(value_function[slice_index])
-            left_deriv = (value_function[slice_index] - left_boundary) / grid.dx[dim]
-            right_deriv = (value_function[next_index] - value_function[slice_index]) / grid.dx[dim]
-        elif idx == value_function.shape[dim] - 1:
-            if dim in periodic_dims:
-                right_periodic_boundary_index = tuple(
-                    left_index + [0] + right_index
-                )
-                right_boundary = value_function[right_periodic_boundary_index]
-            else:
-                right_boundary = value_function[slice_index] + np.abs(value_function[slice_index] - value_function[prev_index]) * np.sign([value_function[slice_index]])
-            left_deriv = (value_function[slice_index] - value_function[prev_index]) / grid.dx[dim]
-            right_deriv = (right_boundary - value_function[slice_index]) / grid.dx[dim]
-        else:
-            left_deriv = (value_function[slice_index] - value_function[prev_index]) / grid.dx[dim]
-            right_deriv = (value_function[next_index] - value_function[slice_index]) / grid.dx[dim]
+        if idx == 0 and dim not in periodic_dims:
+            prev_value = value + np.abs(next_value - value) * np.sign(value)
+        elif idx == shape[dim] - 1 and dim not in periodic_dims:
+            next_value = value + np.abs(value - prev_value) * np.sign(value)
+        left_deriv = (value - prev_value) / grid.dx[dim]
+        right_deriv = (next_value - value) / grid.dx[dim]
 
         spa_derivatives.append(((left_deriv + right_deriv) / 2)[0])
         
     return spa_derivatives
 
 
-def defender_control_2vs1(game, grid2vs1, value2vs1, jointstate_2vs1):
+def defender_control_2vs1(game, grid2vs1, value2vs1, jointstate_2vs1, grad_table=None):
     """Return a tuple of 2-dimensional control inputs of one defender based on the value function
     
     Args:
@@ -74,18 +56,21 @@ def defender_control_2vs1(game, grid2vs1, value2vs1, jointstate_2vs1):
         value2vs1 (ndarray, (grid_size*dim, 1)): 1v1 HJ reachability value function with only final slice
         game (class instance): the corresponding ReachAvoidGameEnv instance
         jointstate_2vs1 (tuple): the corresponding positions of (A1, A2, D1)
+        grad_table (GradientTable): the precomputed gradients of value2vs1, None to differentiate at runtime
 
     Returns:
         opt_d1, opt_d2 (tuple): the optimal control of the defender
     """
-    value2vs1s = value2vs1[..., np.newaxis] 
-    spat_deriv_vector = spa_deriv(grid2vs1.get_index(jointstate_2vs1), value2vs1s, grid2vs1)
+    if grad_table is not None:
+        spat_deriv_vector = grad_table.lookup(grid2vs1, jointstate_2vs1)
+    else:
+        spat_deriv_vector = spa_deriv(grid2vs1.get_index(jointstate_2vs1), value2vs1, grid2vs1)
     opt_d1, opt_d2 = game.optDistb_2vs1(spat_deriv_vector)
 
     return (opt_d1, opt_d2)
 
 
-def defender_control_1vs1(game, grid1vs1, value1vs1, jointstate_1vs1):
+def defender_control_1vs1(game, grid1vs1, value1vs1, jointstate_1vs1, grad_table=None):
     """Return a tuple of 2-dimensional control inputs of one defender based on the value function
     
     Args:
@@ -94,18 +79,21 @@ def defender_control_1vs1(game, grid1vs1, value1vs1, jointstate_1vs1):
         value1v1 (ndarray): 1vs1 HJ reachability value function with only final slice
         agents_1v1 (class): the corresponding AttackerDefender instance
         joint_states1v1 (tuple): the corresponding positions of (A1, D1)
+        grad_table (GradientTable): the precomputed gradients of value1vs1, None to differentiate at runtime
     
     Returns:
         opt_d1, opt_d2 (tuple): the optimal control of the defender
     """
-    value1vs1s = value1vs1[..., np.newaxis] 
-    spat_deriv_vector = spa_deriv(grid1vs1.get_index(jointstate_1vs1), value1vs1s, grid1vs1)
+    if grad_table is not None:
+        spat_deriv_vector = grad_table.lookup(grid1vs1, jointstate_1vs1)
+    else:
+        spat_deriv_vector = spa_deriv(grid1vs1.get_index(jointstate_1vs1), value1vs1, grid1vs1)
     opt_d1, opt_d2 = game.optDistb_1vs1(spat_deriv_vector)
 
     return (opt_d1, opt_d2)
 
 
-def defender_control_1vs2(game, grid1vs2, value1vs2, jointstate_1vs2):
+def defender_control_1vs2(game, grid1vs2, value1vs2, jointstate_1vs2, grad_table=None):
     """Return a tuple of 4-dimensional control inputs of one defender based on the value function
     
     Args:
@@ -114,18 +102,21 @@ def defender_control_1vs2(game, grid1vs2, value1vs2, jointstate_1vs2):
         value1vs2 (ndarray, (grid_size*dim, 1)): 1vs2 HJ reachability value function with only final slice
         game (class instance): the corresponding ReachAvoidGameEnv instance
         jointstate_1vs2 (tuple): the corresponding positions of (A1, D1, D2)
+        grad_table (GradientTable): the precomputed gradients of value1vs2, None to differentiate at runtime
 
     Returns:
         opt_d1, opt_d2 (tuple): the optimal control of the defender
     """
-    value1vs2s = value1vs2[..., np.newaxis] 
-    spat_deriv_vector = spa_deriv(grid1vs2.get_index(jointstate_1vs2), value1vs2s, grid1vs2)
+    if grad_table is not None:
+        spat_deriv_vector = grad_table.lookup(grid1vs2, jointstate_1vs2)
+    else:
+        spat_deriv_vector = spa_deriv(grid1vs2.get_index(jointstate_1vs2), value1vs2, grid1vs2)
     opt_d1, opt_d2, opt_d3, opt_d4 = game.optDistb_1vs2(spat_deriv_vector)
 
     return (opt_d1, opt_d2, opt_d3, opt_d4)
 
 
-def attacker_control_1vs0(game, grid1vs0, value1vs0, attacker, neg2pos):
+def attacker_control_1vs0(game, grid1vs0, value1vs0, attacker, neg2pos, grad_table=None):
     """Return a list of 2-dimensional control inputs of one defender based on the value function
     
     Args:
@@ -134,18 +125,22 @@ def attacker_control_1vs0(game, grid1vs0, value1vs0, attacker, neg2pos):
     value1vs0 (ndarray): 1v1 HJ reachability value function with only final slice
     attacker (ndarray, (dim,)): the current state of one attacker
     neg2pos (list): the positions of the value function that change from negative to positive
+    grad_table (GradientTable): the precomputed gradients of all time slices of value1vs0, None to differentiate at runtime
     """
-    current_value = grid1vs0.get_value(value1vs0[..., 0], list(attacker))
-    if current_value > 0:
-        value1vs0 = value1vs0 - current_value
-    v = value1vs0[..., neg2pos] # Minh: v = value1v0[..., neg2pos[0]]
-    spat_deriv_vector = spa_deriv(grid1vs0.get_index(attacker), v, grid1vs0)
+    if grad_table is not None:  # shifting the value function does not change its gradient
+        spat_deriv_vector = grad_table.lookup(grid1vs0, attacker, neg2pos[0])
+    else:
+        current_value = grid1vs0.get_value(value1vs0[..., 0], list(attacker))
+        if current_value > 0:
+            value1vs0 = value1vs0 - current_value
+        v = value1vs0[..., neg2pos] # Minh: v = value1v0[..., neg2pos[0]]
+        spat_deriv_vector = spa_deriv(grid1vs0.get_index(attacker), v, grid1vs0)
     opt_a1, opt_a2 = game.optCtrl_1vs0(spat_deriv_vector)
 
     return (opt_a1, opt_a2)
 
 
-def attacker_control_1vs1(game, grid1vs1, value1vs1, current_state, neg2pos):
+def attacker_control_1vs1(game, grid1vs1, value1vs1, current_state, neg2pos, grad_table=None):
     """Return a list of 2-dimensional control inputs of one defender based on the value function
     
     Args:
@@ -153,12 +148,16 @@ def attacker_control_1vs1(game, grid1vs1, value1vs1, current_state, neg2pos):
     value1vs1 (ndarray): 1v1 HJ reachability value function with only final slice
     current_state (ndarray, (dim,)): the current state of one attacker + one defender
     neg2pos (list): the positions of the value function that change from negative to positive
+    grad_table (GradientTable): the precomputed gradients of all time slices of value1vs1, None to differentiate at runtime
     """
-    current_value = grid1vs1.get_value(value1vs1[..., 0], list(current_state))
-    if current_value > 0:
-        value1vs1 = value1vs1 - current_value
-    v = value1vs1[..., neg2pos]
-    spat_deriv_vector = spa_deriv(grid1vs1.get_index(current_state), v, grid1vs1)
+    if grad_table is not None:  # shifting the value function does not change its gradient
+        spat_deriv_vector = grad_table.lookup(grid1vs1, current_state, neg2pos[0])
+    else:
+        current_value = grid1vs1.get_value(value1vs1[..., 0], list(current_state))
+        if current_value > 0:
+            value1vs1 = value1vs1 - current_value
+        v = value1vs1[..., neg2pos]
+        spat_deriv_vector = spa_deriv(grid1vs1.get_index(current_state), v, grid1vs1)
     opt_a1, opt_a2 = game.optCtrl_1vs1(spat_deriv_vector)
 
     return (opt_a1, opt_a2)
@@ -200,7 +199,7 @@ def find_sign_change1vs1(grid1vs1, value1vs1, current_state):
 
 def hj_controller_defenders(game, assignments, 
                             value1vs1, value2vs1, 
-                            grid1vs1, grid2vs1): 
+                            grid1vs1, grid2vs1, grad_tables=None): 
     """This fuction computes the control for the defenders based on the assignments. 
        Assume dynamics are single integrator.
 
@@ -213,6 +212,7 @@ def hj_controller_defenders(game, assignments,
         grid1vs1 (Grid): the grid for 1 vs 1 game
         grid2vs1 (Grid): the grid for 2 vs 1 game
         grid1vs2 (Grid): the grid for 1 vs 2 game
+        grad_tables (dict): the GradientTable of each game from load_gradient_tables_sig, None to differentiate at runtime
     
     Returns:
         control_defenders ((ndarray): the control of defenders
@@ -221,6 +221,7 @@ def hj_controller_defenders(game, assignments,
     defenders = game.defenders.state.copy()
     num_defenders = game.NUM_DEFENDERS 
     control_defenders = np.zeros((num_defenders, 2))
+    grad_tables = grad_tables or {}
 
     for j in range(num_defenders):
         d1x, d1y = defenders[j]
@@ -228,11 +229,11 @@ def hj_controller_defenders(game, assignments,
             a1x, a1y = attackers[assignments[j][0]]
             a2x, a2y = attackers[assignments[j][1]]
             jointstate_2vs1 = (a1x, a1y, a2x, a2y, d1x, d1y)
-            control_defenders[j] = defender_control_2vs1(game, grid2vs1, value2vs1, jointstate_2vs1)
+            control_defenders[j] = defender_control_2vs1(game, grid2vs1, value2vs1, jointstate_2vs1, grad_tables.get('2vs1'))
         elif len(assignments[j]) == 1:
             a1x, a1y = attackers[assignments[j][0]]
             jointstate_1vs1 = (a1x, a1y, d1x, d1y)
-            control_defenders[j] = defender_control_1vs1(game, grid1vs1, value1vs1, jointstate_1vs1)
+            control_defenders[j] = defender_control_1vs1(game, grid1vs1, value1vs1, jointstate_1vs1, grad_tables.get('1vs1'))
         elif len(assignments[j]) == 0: # defender j could not capture any of attackers
             control_defenders[j] = (0.0, 0.0)
         else:
@@ -244,7 +245,7 @@ def hj_controller_defenders(game, assignments,
 def extend_hj_controller_defenders(game, 
                                    assignments, weights, attacker_views,
                                    value1vs1, value2vs1, value1vs2, 
-                                   grid1vs1, grid2vs1, grid1vs2):
+                                   grid1vs1, grid2vs1, grid1vs2, grad_tables=None):
     """This fuction computes the control for the defenders based on the assignments.
        Assume dynamics are single integrator.
 
@@ -259,6 +260,7 @@ def extend_hj_controller_defenders(game,
         grid1vs1 (Grid): the grid for 1 vs 1 game
         grid2vs1 (Grid): the grid for 2 vs 1 game
         grid1vs2 (Grid): the grid for 1 vs 2 game
+        grad_tables (dict): the GradientTable of each game from load_gradient_tables_sig, None to differentiate at runtime
 
     Returns:
         control_defenders ((ndarray): the control of defenders
@@ -269,6 +271,7 @@ def extend_hj_controller_defenders(game,
     control_defenders = np.zeros((num_defenders, 2))
     calculated_defenders = []  # store the calculated defenders which should not calculate the control again
     flag_1vs2 = False
+    grad_tables = grad_tables or {}
 
     for j in range(num_defenders):
 
@@ -280,7 +283,7 @@ def extend_hj_controller_defenders(game,
             a1x, a1y = attackers[assignments[j][0]]
             a2x, a2y = attackers[assignments[j][1]]
             jointstate_2vs1 = (a1x, a1y, a2x, a2y, d1x, d1y)
-            control_defenders[j] = defender_control_2vs1(game, grid2vs1, value2vs1, jointstate_2vs1)
+            control_defenders[j] = defender_control_2vs1(game, grid2vs1, value2vs1, jointstate_2vs1, grad_tables.get('2vs1'))
         elif len(assignments[j]) == 1:
             a1x, a1y = attackers[assignments[j][0]]
 
@@ -288,14 +291,14 @@ def extend_hj_controller_defenders(game,
                 collaborate_defender = attacker_views[assignments[j][0]][-1]
                 d2x, d2y = defenders[collaborate_defender]
                 jointstate_1vs2 = (a1x, a1y, d1x, d1y, d2x, d2y)
-                opt_d1, opt_d2, opt_d3, opt_d4 = defender_control_1vs2(game, grid1vs2, value1vs2, jointstate_1vs2)
+                opt_d1, opt_d2, opt_d3, opt_d4 = defender_control_1vs2(game, grid1vs2, value1vs2, jointstate_1vs2, grad_tables.get('1vs2'))
                 control_defenders[j] = (opt_d1, opt_d2)
                 control_defenders[collaborate_defender] = (opt_d3, opt_d4)
                 calculated_defenders.append(collaborate_defender)
                 flag_1vs2 = True
             else:  # use 1 vs. 1 game based control
                 jointstate_1vs1 = (a1x, a1y, d1x, d1y)
-                control_defenders[j] = defender_control_1vs1(game, grid1vs1, value1vs1, jointstate_1vs1)
+                control_defenders[j] = defender_control_1vs1(game, grid1vs1, value1vs1, jointstate_1vs1, grad_tables.get('1vs1'))
 
         elif len(assignments[j]) == 0: # defender j could not capture any of attackers
             control_defenders[j] = (0.0, 0.0)
@@ -325,7 +328,7 @@ def single_1vs2_controller_defender(game, value1vs2, grid1vs2):
     return control_defenders
 
 
-def hj_controller_attackers_1vs0(game, value1vs0, grid1vs0):
+def hj_controller_attackers_1vs0(game, value1vs0, grid1vs0, grad_table=None):
     """This function computes the control for the attackers based on the control_attackers. 
        Assume dynamics are single integrator.
 
@@ -333,6 +336,7 @@ def hj_controller_attackers_1vs0(game, value1vs0, grid1vs0):
         game (class): the corresponding ReachAvoidGameEnv instance
         value1vs0 (np.ndarray): the value function for 1 vs 0 game with all time slices
         grid1vs0 (Grid): the grid for 1 vs 0 game
+        grad_table (GradientTable): the precomputed gradients of value1vs0, None to differentiate at runtime
     
     Returns:
         control_attackers (ndarray): the control of attackers
@@ -345,7 +349,7 @@ def hj_controller_attackers_1vs0(game, value1vs0, grid1vs0):
         if not current_attackers_status[i]:  # the attacker is free
             neg2pos, pos2neg = find_sign_change1vs0(grid1vs0, value1vs0, attackers[i])
             if len(neg2pos):
-                control_attackers[i] = attacker_control_1vs0(game, grid1vs0, value1vs0, attackers[i], neg2pos)
+                control_attackers[i] = attacker_control_1vs0(game, grid1vs0, value1vs0, attackers[i], neg2pos, grad_table)
             else:
                 control_attackers[i] = (0.0, 0.0)
         else:  # the attacker is captured or arrived
@@ -355,7 +359,7 @@ def hj_controller_attackers_1vs0(game, value1vs0, grid1vs0):
 
 
 
-def hj_contoller_attackers_1vs1(game, value1vs1, grid1vs1):
+def hj_contoller_attackers_1vs1(game, value1vs1, grid1vs1, grad_table=None):
     """This function computes the control for the attackers based on the control_attackers. 
        Assume dynamics are single integrator.
 
@@ -363,6 +367,7 @@ def hj_contoller_attackers_1vs1(game, value1vs1, grid1vs1):
         game (class): the corresponding ReachAvoidGameEnv instance
         value1vs0 (np.ndarray): the value function for 1 vs 0 game with all time slices
         grid1vs0 (Grid): the grid for 1 vs 0 game
+        grad_table (GradientTable): the precomputed gradients of value1vs1 with all time slices, None to differentiate at runtime
     
     Returns:
         control_attackers (ndarray): the control of attackers
@@ -376,7 +381,7 @@ def hj_contoller_attackers_1vs1(game, value1vs1, grid1vs1):
         if not current_attackers_status[i]:  # the attacker is free
             neg2pos, pos2neg = find_sign_change1vs1(grid1vs1, value1vs1, current_state)
             if len(neg2pos):
-                control_attackers[i] = attacker_control_1vs1(game, grid1vs1, value1vs1, current_state, neg2pos)
+                control_attackers[i] = attacker_control_1vs1(game, grid1vs1, value1vs1, current_state, neg2pos, grad_table)
             else:
                 control_attackers[i] = (0.0, 0.0)
         else:  # the attacker is captured or arrived
@@ -462,7 +467,7 @@ def optCtrl_1vs0(spat_deriv, uMax, uMode, a_speed):
     return (opt_a1, opt_a2)
 
 
-def hj_controller_1vs0(uMode, uMax, a_speed, value1vs0, grid1vs0, attackers, current_status):
+def hj_controller_1vs0(uMode, uMax, a_speed, value1vs0, grid1vs0, attackers, current_status, grad_table=None):
     """This function computes the control for the attackers based on the control_attackers. 
        Assume dynamics are single integrator.   
 
@@ -474,6 +479,7 @@ def hj_controller_1vs0(uMode, uMax, a_speed, value1vs0, grid1vs0, attackers, cur
         grid1vs0 (Grid): the grid for 1 vs 0 game
         attackers (np.ndarray, (num_players, 2)): the current states of attackers
         current_status (np.ndarray): the current status of attackers
+        grad_table (GradientTable): the precomputed gradients of value1vs0, None to differentiate at runtime
     """
     attackers = attackers.copy()    
     num_attackers = attackers.shape[0]
@@ -483,11 +489,14 @@ def hj_controller_1vs0(uMode, uMax, a_speed, value1vs0, grid1vs0, attackers, cur
         if not current_attackers_status[i]:  # the attacker is free
             neg2pos, pos2neg = find_sign_change1vs0(grid1vs0, value1vs0, attackers[i])
             if len(neg2pos):
-                current_value = grid1vs0.get_value(value1vs0[..., 0], list(attackers[i]))
-                if current_value > 0:
-                    value1vs0 = value1vs0 - current_value
-                v = value1vs0[..., neg2pos] 
-                spat_deriv_vector = spa_deriv(grid1vs0.get_index(attackers[i]), v, grid1vs0)
+                if grad_table is not None:
+                    spat_deriv_vector = grad_table.lookup(grid1vs0, attackers[i], neg2pos[0])
+                else:
+                    current_value = grid1vs0.get_value(value1vs0[..., 0], list(attackers[i]))
+                    if current_value > 0:
+                        value1vs0 = value1vs0 - current_value
+                    v = value1vs0[..., neg2pos] 
+                    spat_deriv_vector = spa_deriv(grid1vs0.get_index(attackers[i]), v, grid1vs0)
                 control_attackers[i] = optCtrl_1vs0(spat_deriv_vector, uMax, uMode, a_speed)
             else:
                 control_attackers[i] = (0.0, 0.0)
@@ -619,7 +628,7 @@ def optDistb_1vs2(spat_deriv, dMax, dMode, d_speed):
     return (opt_d1, opt_d2, opt_d3, opt_d4)
 
 
-def hj_controller_1vs1_defender(dMode, dMax, d_speed, value1vs1, grid1vs1, jointstate_1vs1):
+def hj_controller_1vs1_defender(dMode, dMax, d_speed, value1vs1, grid1vs1, jointstate_1vs1, grad_table=None):
     """This function computes the control for the defender based on 1 vs. 1 value function. 
        Assume dynamics are single integrator.   
 
@@ -630,15 +639,18 @@ def hj_controller_1vs1_defender(dMode, dMax, d_speed, value1vs1, grid1vs1, joint
         value1vs1 (np.ndarray): the value function for 1 vs 1 game with the final time slices
         grid1vs1 (Grid): the grid for 1 vs 1 game
         jointstate_1vs1 (a1x, a1y, d1x, d1y): the current joint state of one attacker and one defender
+        grad_table (GradientTable): the precomputed gradients of the value function, None to differentiate at runtime
     """
-    value1vs1s = value1vs1[..., np.newaxis] 
-    spat_deriv_vector = spa_deriv(grid1vs1.get_index(jointstate_1vs1), value1vs1s, grid1vs1)
+    if grad_table is not None:
+        spat_deriv_vector = grad_table.lookup(grid1vs1, jointstate_1vs1)
+    else:
+        spat_deriv_vector = spa_deriv(grid1vs1.get_index(jointstate_1vs1), value1vs1, grid1vs1)
     opt_d1, opt_d2 = optDistb_1vs1(spat_deriv_vector, dMax, dMode, d_speed)
 
     return (opt_d1, opt_d2)
 
 
-def hj_controller_2vs1_defender(dMode, dMax, d_speed, value2vs1, grid2vs1, jointstate_2vs1):
+def hj_controller_2vs1_defender(dMode, dMax, d_speed, value2vs1, grid2vs1, jointstate_2vs1, grad_table=None):
     """This function computes the control for the defender based on 2 vs. 1 value function. 
        Assume dynamics are single integrator.   
 
@@ -649,15 +661,18 @@ def hj_controller_2vs1_defender(dMode, dMax, d_speed, value2vs1, grid2vs1, joint
         value1vs1 (np.ndarray): the value function for 2 vs 1 game with the final time slices
         grid1vs1 (Grid): the grid for 2 vs 1 game
         jointstate_2vs1 (a1x, a1y, a2x, a2y, d1x, d1y): the current joint state of two attackers and one defender
+        grad_table (GradientTable): the precomputed gradients of the value function, None to differentiate at runtime
     """
-    value1vs1s = value2vs1[..., np.newaxis] 
-    spat_deriv_vector = spa_deriv(grid2vs1.get_index(jointstate_2vs1), value1vs1s, grid2vs1)
+    if grad_table is not None:
+        spat_deriv_vector = grad_table.lookup(grid2vs1, jointstate_2vs1)
+    else:
+        spat_deriv_vector = spa_deriv(grid2vs1.get_index(jointstate_2vs1), value2vs1, grid2vs1)
     opt_d1, opt_d2 = optDistb_2vs1(spat_deriv_vector, dMax, dMode, d_speed)
 
     return (opt_d1, opt_d2)
 
 
-def hj_controller_1vs2_defender(dMode, dMax, d_speed, value1vs2, grid1vs2, jointstate_1vs2):
+def hj_controller_1vs2_defender(dMode, dMax, d_speed, value1vs2, grid1vs2, jointstate_1vs2, grad_table=None):
     """This function computes the control for the defender based on 1 vs. 2 value function. 
        Assume dynamics are single integrator.   
 
@@ -668,9 +683,12 @@ def hj_controller_1vs2_defender(dMode, dMax, d_speed, value1vs2, grid1vs2, joint
         value1vs2 (np.ndarray): the value function for 1 vs 2 game with the final time slices
         grid1vs2 (Grid): the grid for 1 vs 2 game
         jointstate_1vs2 (a1x, a1y, d1x, d1y, d2x, d2y): the current joint state of one attacker and two defenders
+        grad_table (GradientTable): the precomputed gradients of the value function, None to differentiate at runtime
     """
-    value1vs2s = value1vs2[..., np.newaxis] 
-    spat_deriv_vector = spa_deriv(grid1vs2.get_index(jointstate_1vs2), value1vs2s, grid1vs2)
+    if grad_table is not None:
+        spat_deriv_vector = grad_table.lookup(grid1vs2, jointstate_1vs2)
+    else:
+        spat_deriv_vector = spa_deriv(grid1vs2.get_index(jointstate_1vs2), value1vs2, grid1vs2)
     opt_d1, opt_d2, opt_d3, opt_d4 = optDistb_1vs2(spat_deriv_vector, dMax, dMode, d_speed)
 
     return (opt_d1, opt_d2, opt_d3, opt_d4)
@@ -679,7 +697,7 @@ def hj_controller_1vs2_defender(dMode, dMax, d_speed, value1vs2, grid1vs2, joint
 def hj_controller_defenders_independent(attackers, defenders,
                                         assignments, weights, attacker_views,
                                         value1vs1, value2vs1, value1vs2, 
-                                        grid1vs1, grid2vs1, grid1vs2):
+                                        grid1vs1, grid2vs1, grid1vs2, grad_tables=None):
     """This fuction computes the control for the defenders based on the assignments.
        Assume dynamics are single integrator.
 
@@ -695,6 +713,7 @@ def hj_controller_defenders_independent(attackers, defenders,
         grid1vs1 (Grid): the grid for 1 vs 1 game
         grid2vs1 (Grid): the grid for 2 vs 1 game
         grid1vs2 (Grid): the grid for 1 vs 2 game
+        grad_tables (dict): the GradientTable of each game from load_gradient_tables_sig, None to differentiate at runtime
 
     Returns:
         control_defenders ((ndarray): the control of defenders
@@ -705,6 +724,7 @@ def hj_controller_defenders_independent(attackers, defenders,
     control_defenders = np.zeros((num_defenders, 2))
     calculated_defenders = []  # store the calculated defenders which should not calculate the control again
     flag_1vs2 = False
+    grad_tables = grad_tables or {}
 
     for j in range(num_defenders):
 
@@ -716,7 +736,7 @@ def hj_controller_defenders_independent(attackers, defenders,
             a1x, a1y = attackers[assignments[j][0]]
             a2x, a2y = attackers[assignments[j][1]]
             jointstate_2vs1 = (a1x, a1y, a2x, a2y, d1x, d1y)
-            control_defenders[j] = hj_controller_2vs1_defender('max', 1.0, 1.5, value2vs1, grid2vs1, jointstate_2vs1)
+            control_defenders[j] = hj_controller_2vs1_defender('max', 1.0, 1.5, value2vs1, grid2vs1, jointstate_2vs1, grad_tables.get('2vs1'))
         elif len(assignments[j]) == 1:
             a1x, a1y = attackers[assignments[j][0]]
 
@@ -724,14 +744,14 @@ def hj_controller_defenders_independent(attackers, defenders,
                 collaborate_defender = attacker_views[assignments[j][0]][-1]
                 d2x, d2y = defenders[collaborate_defender]
                 jointstate_1vs2 = (a1x, a1y, d1x, d1y, d2x, d2y)
-                opt_d1, opt_d2, opt_d3, opt_d4 = hj_controller_1vs2_defender('min', 1.0, 1.5, value1vs2, grid1vs2, jointstate_1vs2)
+                opt_d1, opt_d2, opt_d3, opt_d4 = hj_controller_1vs2_defender('min', 1.0, 1.5, value1vs2, grid1vs2, jointstate_1vs2, grad_tables.get('1vs2'))
                 control_defenders[j] = (opt_d1, opt_d2)
                 control_defenders[collaborate_defender] = (opt_d3, opt_d4)
                 calculated_defenders.append(collaborate_defender)
                 flag_1vs2 = True
             else:  # use 1 vs. 1 game based control
                 jointstate_1vs1 = (a1x, a1y, d1x, d1y)
-                control_defenders[j] = hj_controller_1vs1_defender('max', 1.0, 1.5, value1vs1, grid1vs1, jointstate_1vs1)
+                control_defenders[j] = hj_controller_1vs1_defender('max', 1.0, 1.5, value1vs1, grid1vs1, jointstate_1vs1, grad_tables.get('1vs1'))
 
         elif len(assignments[j]) == 0: # defender j could not capture any of attackers
             control_defenders[j] = (0.0, 0.0)
@@ -1,12 +1,13 @@
 '''Solvers for the reach-avoid game.
 
 '''
+import itertools
 import numpy as np
 
 from mip import Model, xsum, maximize, BINARY, CBC, OptimizationStatus
 
 
-def mip_solver(num_defenders, current_attackers_status,  EscapedAttacker1vs1, EscapedPairs2vs1):
+def mip_solver(num_defenders, current_attackers_status,  EscapedAttacker1vs1, EscapedPairs2vs1, start=None):
     """ Returns a list selected that contains all allocated attackers that the defender could capture, [[a1, a3], ...]
 
     Args:
@@ -14,6 +15,7 @@ def mip_solver(num_defenders, current_attackers_status,  EscapedAttacker1vs1, Es
         current_attackers_status (np.ndarray, (num_attackers, )): the current moment attackers' status, 0 stands for free, -1 stands for captured, 1 stands for arrived
         EscapedAttacker1vs1 (list): the attacker that could escape from the defender in a 1 vs 1 game
         EscapedPairs2vs1 (list): the pair of attackers that could escape from the defender in a 2 vs 1 game
+        start (a list of lists): a feasible assignment of free attackers to warm start the solver with, e.g. the previous one
     
     Returns:
         assignments (a list of lists): the list of attackers that the defender assigned to capture
@@ -42,6 +44,9 @@ def mip_solver(num_defenders, current_attackers_status,  EscapedAttacker1vs1, Es
             
     # set up objective functions
     model.objective = maximize(xsum(e[i][j] for j in range(num_defenders) for i in range(num_free_attackers)))
+    if start is not None:
+        index = {attacker: i for i, attacker in enumerate(free_attackers_positions)}
+        model.start = [(e[index[attacker]][j], 1.0) for j in range(num_defenders) for attacker in start[j]]
     
     # problem solving
     model.max_gap = 0.05
@@ -64,6 +69,122 @@ def mip_solver(num_defenders, current_attackers_status,  EscapedAttacker1vs1, Es
     return assignments
 
 
+def exact_assignment_solver(num_defenders, current_attackers_status, EscapedAttacker1vs1, EscapedPairs2vs1, previous=None):
+    """ Returns the maximum assignment of mip_solver by enumeration, exact and fast for a few free attackers.
+
+    Every defender takes one option, nothing, one attacker it captures in the 1 vs. 1 game, or a pair of them that
+    cannot escape in the 2 vs. 1 game. The options are combined defender by defender, keeping for every set of
+    assigned attackers only the best partial assignment, which is at most 2^num_free_attackers of them.
+
+    Args:
+        num_defenders (int): the number of defenders
+        current_attackers_status (np.ndarray, (num_attackers, )): the current moment attackers' status, 0 stands for free, -1 stands for captured, 1 stands for arrived
+        EscapedAttacker1vs1 (list): the attacker that could escape from the defender in a 1 vs 1 game
+        EscapedPairs2vs1 (list): the pair of attackers that could escape from the defender in a 2 vs 1 game
+        previous (a list of lists): among the maximum assignments, the one keeping most of these pairs is returned
+
+    Returns:
+        assignments (a list of lists): the list of attackers that the defender assigned to capture
+    """
+    free_attackers = np.flatnonzero(np.asarray(current_attackers_status) == 0).tolist()
+    # best[mask] = (number of assigned attackers, number of kept previous pairs, options), mask the assigned attackers
+    best = {0: (0, 0, ())}
+    for j in range(num_defenders):
+        escaped = set(EscapedAttacker1vs1[j])
+        escaped_pairs = {frozenset(pair) for pair in EscapedPairs2vs1[j]}
+        kept = set(previous[j]) if previous is not None else set()
+        capturable = [attacker for attacker in free_attackers if attacker not in escaped]
+        options = [()] + [(attacker,) for attacker in capturable] + \
+                  [pair for pair in itertools.combinations(capturable, 2) if frozenset(pair) not in escaped_pairs]
+        options = [(option, sum(1 << attacker for attacker in option), len(kept.intersection(option)))
+                   for option in options]
+        new_best = {}
+        for mask, (size, score, choice) in best.items():
+            for option, bits, option_score in options:
+                if mask & bits:
+                    continue
+                candidate = (size + len(option), score + option_score, choice + (option,))
+                current = new_best.get(mask | bits)
+                if current is None or candidate[:2] > current[:2]:
+                    new_best[mask | bits] = candidate
+        best = new_best
+    size, score, choice = max(best.values(), key=lambda entry: entry[:2])
+
+    return [list(option) for option in choice]
+
+
+class AssignmentSolver:
+    """ Capture assignment of the game loop, re-solved only when the judges' results change.
+
+    The escape sets of the free attackers usually stay the same for many control steps, in which case solve returns
+    the last assignment right away. Otherwise instances with at most max_exact_attackers free attackers are solved
+    exactly by exact_assignment_solver, preferring the last assignment among the optimal ones so that the
+    defenders do not switch targets needlessly, and larger ones by mip_solver warm started with the last assignment.
+    """
+    def __init__(self, num_defenders, max_exact_attackers=10):
+        """ Initialize the solver.
+
+        Args:
+            num_defenders (int): the number of defenders
+            max_exact_attackers (int): the largest number of free attackers solved by exact_assignment_solver
+        """
+        self.num_defenders = num_defenders
+        self.max_exact_attackers = max_exact_attackers
+        self.raw = None
+        self.key = None
+        self.assignments = None
+        self.num_solves = 0
+
+
+    def solve(self, current_attackers_status, EscapedAttacker1vs1, EscapedPairs2vs1):
+        """ Returns the capture assignment, same arguments and result as mip_solver.
+
+        Args:
+            current_attackers_status (np.ndarray, (num_attackers, )): the current moment attackers' status, 0 stands for free, -1 stands for captured, 1 stands for arrived
+            EscapedAttacker1vs1 (list): the attacker that could escape from the defender in a 1 vs 1 game
+            EscapedPairs2vs1 (list): the pair of attackers that could escape from the defender in a 2 vs 1 game
+
+        Returns:
+            assignments (a list of lists): the list of attackers that the defender assigned to capture
+        """
+        free_attackers = tuple(np.flatnonzero(np.asarray(current_attackers_status) == 0).tolist())
+        # The judges list the escape sets in a fixed order, so unchanged results usually compare equal as given
+        raw = (free_attackers, EscapedAttacker1vs1, EscapedPairs2vs1)
+        if raw == self.raw:
+            return [list(assigned) for assigned in self.assignments]
+        self.raw = (free_attackers, [list(escaped) for escaped in EscapedAttacker1vs1],
+                    [[list(pair) for pair in pairs] for pairs in EscapedPairs2vs1])
+        key = (free_attackers,
+               tuple(frozenset(escaped) for escaped in EscapedAttacker1vs1),
+               tuple(frozenset(frozenset(pair) for pair in pairs) for pairs in EscapedPairs2vs1))
+        if key != self.key:
+            if len(free_attackers) <= self.max_exact_attackers:
+                self.assignments = exact_assignment_solver(self.num_defenders, current_attackers_status,
+                                                           EscapedAttacker1vs1, EscapedPairs2vs1, self.assignments)
+            else:
+                self.assignments = [[int(attacker) for attacker in assigned] for assigned in
+                                    mip_solver(self.num_defenders, current_attackers_status, EscapedAttacker1vs1,
+                                               EscapedPairs2vs1, self._feasibleStart(key))]
+            self.key = key
+            self.num_solves += 1
+
+        return [list(assigned) for assigned in self.assignments]
+
+
+    def _feasibleStart(self, key):
+        """ Returns the part of the last assignment that is still feasible under the escape sets in key, or None. """
+        if self.assignments is None:
+            return None
+        free_attackers, escaped, escaped_pairs = key
+        start = []
+        for j, assigned in enumerate(self.assignments):
+            assigned = [attacker for attacker in assigned if attacker in free_attackers and attacker not in escaped[j]]
+            if len(assigned) == 2 and frozenset(assigned) in escaped_pairs[j]:
+                assigned = assigned[:1]
+            start.append(assigned)
+        return start
+
+
 def extend_mip_solver(num_defenders, current_attackers_status,  
                       EscapedAttacker1vs1, EscapedPairs2vs1,
                       EscapedAttackers1vs2, EscapedTri1vs2):
@@ -0,0 +1,89 @@
+'''Registry of the HJ value functions used by the games.
+
+Every value function is stored with the grid it was computed on in <name>.grid.json (see odp.value_store.save_grid),
+so the grids are rebuilt from that metadata instead of being hard-coded. The arrays are memory-mapped read-only,
+which makes loading them near-instant: only the pages the games touch are read, and parallel game workers opening
+the same files share those pages instead of holding a copy each.
+
+Usage:
+    python -m MRAG.value_registry  # writes the grid metadata of the registered value functions
+'''
+
+import functools
+import math
+import os
+import numpy as np
+
+from odp.Grid import Grid
+from odp.value_store import grid_meta_path, load_value, open_value, save_grid
+
+
+# The registered value functions: path, whether the last axis holds the time slices,
+# and the bounds and periodic dimensions of the grid. The number of grid points is read from the array.
+VALUES = {'1vs0': ('MRAG/values/1vs0_SIG_g100_medium_speed1.0.npy', True, [-1.0] * 2, [1.0] * 2, []),
+          '1vs1': ('MRAG/values/1vs1_SIG_g45_medium_dspeed1.5.npy', False, [-1.0] * 4, [1.0] * 4, []),
+          '2vs1': ('MRAG/values/2vs1AttackDefend_g30_speed1.5.npy', False, [-1.0] * 6, [1.0] * 6, []),
+          '1vs2': ('MRAG/values/1vs2_SIG_g32_medium_dspeed1.5.npy', False, [-1.0] * 6, [1.0] * 6, []),
+          '1vs0_dub': ('MRAG/values/DubinCar1vs0_grid100_medium_1.0angularv.npy', True,
+                       [-1.0, -1.0, -math.pi], [1.0, 1.0, math.pi], [2]),
+          '1vs1_dub': ('MRAG/values/DubinCar1vs1_grid28_medium_1.0angularv.npy', False,
+                       [-1.0, -1.0, -math.pi, -1.0, -1.0, -math.pi], [1.0, 1.0, math.pi, 1.0, 1.0, math.pi], [2, 5])}
+
+# The value functions loaded by hj_preparations_sig, and whether they hold all time slices
+SIG_VALUE_FILES = {game: VALUES[game][:2] for game in ('1vs0', '1vs1', '2vs1', '1vs2')}
+
+# The value functions of the Dubins car games, see MRAG.dub_controllers
+DUB_VALUE_FILES = {game: VALUES[game][:2] for game in ('1vs0_dub', '1vs1_dub')}
+
+
+def quantized_value_path(value_path, dtype):
+    '''Returns the path of the quantized copy of the value function at value_path, see MRAG.quantized_values.'''
+    return os.path.splitext(value_path)[0] + f'_{dtype}.npy'
+
+
+def registered_grid(name):
+    '''Builds the grid of the registered value function name from its bounds and the shape of its array.'''
+    value_path, time_slices, minBounds, maxBounds, pDim = VALUES[name]
+    shape = np.load(value_path, mmap_mode='r').shape
+    dims = len(minBounds)
+    assert len(shape) == dims + int(time_slices), f"{value_path} has shape {shape}, expected {dims} grid dimensions"
+    return Grid(np.array(minBounds), np.array(maxBounds), dims, np.array(shape[:dims]), list(pDim))
+
+
+def register_value(name):
+    '''Writes the grid metadata of the registered value function name next to its array.
+
+    Returns:
+        grid (Grid): the grid of the value function
+    '''
+    grid = registered_grid(name)
+    save_grid(VALUES[name][0], grid)
+    return grid
+
+
+@functools.lru_cache(maxsize=None)
+def open_game_value(name, quantized=None):
+    '''Memory-maps a registered value function and builds its grid, only once per process.
+    The grid is read from the metadata written by python -m MRAG.value_registry, or built from the registry
+    without writing anything if there is none.
+
+    Args:
+        name (str): the key of the value function in VALUES, e.g. '1vs2'
+        quantized (str): None for the full precision array, or the dtype of its quantized copy
+
+    Returns:
+        value (np.memmap or QuantizedValueFunction): the read-only value function
+        grid (Grid): its grid
+    '''
+    value_path = VALUES[name][0]
+    path = value_path if quantized is None else quantized_value_path(value_path, quantized)
+    if os.path.exists(grid_meta_path(value_path)):
+        return open_value(path, grid_path=value_path)
+    return load_value(path, mmap_mode='r'), registered_grid(name)
+
+
+if __name__ == '__main__':
+    for name, (value_path, *_) in VALUES.items():
+        if os.path.exists(value_path):
+            register_value(name)
+            print(f"============= Grid of {name} saved to {grid_meta_path(value_path)} =============")
@@ -41,67 +41,23 @@ print("1. Gigabytes consumed {}".format(process.memory_info().rss/1e9))  # in by
 agents_1v2 = AttackerDefender1vs2(uMode="max", dMode="min")  # Hanyang: from the defender view
 
 # 3. Avoid set, no constraint means inf
-avoid1 = ShapeRectangle(grids, [0.6, 0.1, -1000, -1000, -1000, -1000], [0.8, 0.3, 1000, 1000, 1000, 1000])  # avoid attacker arrives the target
-avoid1 = np.array(avoid1, dtype='float32')
-
-avoid2_escapeD1 = agents_1v2.capture_set1(grids, 0.1, "escape")  # avoid attacker escapes from defender 1
-avoid2_escapeD2 = agents_1v2.capture_set2(grids, 0.1, "escape")  # avoid attacker escapes from defender 2
-avoid2 = np.maximum(avoid2_escapeD1, avoid2_escapeD2)  # the intersection of escaping from defender 1 and 2
-avoid2 = np.array(avoid2, dtype='float32')
-del avoid2_escapeD1
-del avoid2_escapeD2
-
-avoid3_obs1D1 = ShapeRectangle(grids, [-1000, -1000, -0.1, -1.0, -1000, -1000], [1000, 1000, 0.1, -0.3, 1000, 1000])  # avoid defender 1 gets stuck in obs1
-avoid3_obs2D1 = ShapeRectangle(grids, [-1000, -1000, -0.1, 0.30, -1000, -1000], [1000, 1000, 0.1, 0.60, 1000, 1000])  # avoid defender 1 gets stuck in obs2
-avoid3_obsD1 = np.minimum(avoid3_obs1D1, avoid3_obs2D1)  # the union of getting stuck in obs1 or obs2
-avoid3_obsD1 = np.array(avoid3_obsD1, dtype='float32')
-del avoid3_obs1D1
-del avoid3_obs2D1
-
-avoid4_obs1D2 = ShapeRectangle(grids, [-1000, -1000, -1000, -1000, -0.1, -1.0], [1000, 1000, 1000, 1000, 0.1, -0.3])  # avoid defender 2 gets stuck in obs1
-avoid4_obs2D2 = ShapeRectangle(grids, [-1000, -1000, -1000, -1000, -0.1, 0.30], [1000, 1000, 1000, 1000, 0.1, 0.60])  # avoid defender 2 gets stuck in obs2
-avoid4_obsD2 = np.minimum(avoid4_obs1D2, avoid4_obs2D2)  # the union of getting stuck in obs1 or obs2
-avoid4_obsD2 = np.array(avoid4_obsD2, dtype='float32')
-del avoid4_obs1D2
-del avoid4_obs2D2
-
-avoid_set = np.minimum(np.maximum(avoid1, avoid2), np.minimum(avoid3_obsD1, avoid4_obsD2)) 
-avoid_set = np.array(avoid_set, dtype='float32')
-del avoid1
-del avoid2
+# The sets are described with shape expressions and evaluated in one float32 pass each,
+# without the intermediate full-grid arrays of ShapeRectangle and capture_set1/2
+target = Rectangle([0.6, 0.1], [0.8, 0.3], dims=[0, 1])  # the attacker arrives the target
+captureD1 = Capture([0, 1], [2, 3], 0.1)  # the attacker is captured by defender 1
+captureD2 = Capture([0, 1], [4, 5], 0.1)  # the attacker is captured by defender 2
+obsA = Rectangle([-0.1, -1.0], [0.1, -0.3], dims=[0, 1]) | Rectangle([-0.1, 0.30], [0.1, 0.60], dims=[0, 1])  # the attacker gets stuck in obs1 or obs2
+obsD1 = Rectangle([-0.1, -1.0], [0.1, -0.3], dims=[2, 3]) | Rectangle([-0.1, 0.30], [0.1, 0.60], dims=[2, 3])  # defender 1 gets stuck in obs1 or obs2
+obsD2 = Rectangle([-0.1, -1.0], [0.1, -0.3], dims=[4, 5]) | Rectangle([-0.1, 0.30], [0.1, 0.60], dims=[4, 5])  # defender 2 gets stuck in obs1 or obs2
+
+# avoid the attacker arriving the target while escaping from defender 1 and 2, or a defender getting stuck in an obstacle
+avoid_set = ((target & ~captureD1 & ~captureD2) | obsD1 | obsD2).evaluate(grids)
+process = psutil.Process(os.getpid())
 print("2. After generaing avoid set, the Gigabytes consumed {}".format(process.memory_info().rss/1e9))  # in bytes
 
 # 4. Reach set, no constraint means inf
-reach1 = - ShapeRectangle(grids, [0.6, 0.1, -1000, -1000, -1000, -1000], [0.8, 0.3, 1000, 1000, 1000, 1000])  # attacker has not arrived at the target
-reach1 = np.array(reach1, dtype='float32')
-
-reach2_captureD1 = agents_1v2.capture_set1(grids, 0.1, "capture")  # attacker is captured by defender 1
-reach_captureD1 = np.maximum(reach1, reach2_captureD1)  # the intersection of being captured by defender 1
-reach_captureD1 = np.array(reach_captureD1, dtype='float32')
-del reach2_captureD1
-
-reach2_captureD2 = agents_1v2.capture_set2(grids, 0.1, "capture")  # attacker is captured by defender 2
-reach_captureD2 = np.maximum(reach1, reach2_captureD2)  # the intersection of being captured by defender 2
-reach_captureD2 = np.array(reach_captureD2, dtype='float32')
-del reach2_captureD2
-del reach1
-
-reach2 = np.minimum(reach_captureD1, reach_captureD2)  # the union of being captured by defender 1 or 2, and the attacker has not arrived at the target
-reach2 = np.array(reach2, dtype='float32')
-del reach_captureD1
-del reach_captureD2
-
-reach3_obs1A = ShapeRectangle(grids, [-0.1, -1.0, -1000, -1000, -1000, -1000], [0.1, -0.3, 1000, 1000, 1000, 1000])
-reach3_obs2A = ShapeRectangle(grids, [-0.1, 0.30, -1000, -1000, -1000, -1000], [0.1, 0.60, 1000, 1000, 1000, 1000])
-reach3_obsA = np.minimum(reach3_obs1A, reach3_obs2A)  # the union of attacker not getting stuck in obs1 or obs2
-reach3_obsA = np.array(reach3_obsA, dtype='float32')
-del reach3_obs1A
-del reach3_obs2A
-
-reach_set = np.minimum(reach2, reach3_obsA)
-reach_set = np.array(reach_set, dtype='float32')
-del reach2
-del reach3_obsA
+# the attacker has not arrived at the target and is captured by defender 1 or 2, or the attacker gets stuck in an obstacle
+reach_set = ((~target & (captureD1 | captureD2)) | obsA).evaluate(grids)
 gc.collect()
 process = psutil.Process(os.getpid())
 print("3. After generating reach set, the Gigabytes consumed {}".format(process.memory_info().rss/1e9))  # in bytes
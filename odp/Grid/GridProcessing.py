@@ -1,3 +1,4 @@
+import itertools
 import numpy as np
 import math
 
@@ -71,7 +72,24 @@ class Grid:
 
         return tuple(index)
 
-    def get_value(self, V, state):
+    def get_indices(self, states):
+        """ Returns the closest index of many states in the grid at once
+
+        Args:
+            states (np.array, (num_states, dims)): states of dynamic objects
+
+        Returns:
+            np.array, (num_states, dims): the closest grid index of each state
+        """
+        states = np.atleast_2d(np.asarray(states, dtype=float))
+        index = np.empty(states.shape, dtype=int)
+        for i in range(self.dims):
+            n = self.pts_each_dim[i]
+            pos = np.rint((states[:, i] - self.min[i]) / self.dx[i]).astype(int)
+            index[:, i] = pos % n if i in self.pDim else np.clip(pos, 0, n - 1)
+        return index
+
+    def get_value(self, V, state, interpolate=False):
         """Obtain the approximate value of a state
 
         Assumes that the state is within the bounds of the grid
@@ -79,9 +97,83 @@ class Grid:
         Args:
             V (np.array): value function of solved HJ PDE 
             state (tuple): state of dynamic object
+            interpolate (bool, optional): interpolate V multilinearly instead of taking the
+                value of the closest grid point. Defaults to False.
 
         Returns:
             [float]: V(state)
         """
+        if interpolate:
+            return self.interpolate(V, state)[0]
         index = self.get_index(state)
         return V[index]
+
+    def _interp_cells(self, states):
+        """ Lower and upper corner indices of the grid cell holding each state, and the
+        fractional position of the state inside the cell along each dimension
+
+        States outside the grid are clamped to its bounds, except along periodic
+        dimensions where they wrap around.
+        """
+        states = np.atleast_2d(np.asarray(states, dtype=float))
+        lower = np.empty(states.shape, dtype=int)
+        upper = np.empty(states.shape, dtype=int)
+        frac = np.empty(states.shape)
+        for i in range(self.dims):
+            n = self.pts_each_dim[i]
+            pos = (states[:, i] - self.min[i]) / self.dx[i]
+            if i in self.pDim:
+                pos = np.mod(pos, n)
+                lower[:, i] = np.minimum(np.floor(pos).astype(int), n - 1)
+                upper[:, i] = (lower[:, i] + 1) % n
+            else:
+                pos = np.clip(pos, 0, n - 1)
+                lower[:, i] = np.clip(np.floor(pos).astype(int), 0, max(n - 2, 0))
+                upper[:, i] = np.minimum(lower[:, i] + 1, n - 1)
+            frac[:, i] = pos - lower[:, i]
+        return lower, upper, frac
+
+    def _interp_corners(self, V, states):
+        """ Yields the values of V at the 2^dims corners of the cell of each state, with the
+        side (0 lower, 1 upper) of each corner along every dimension """
+        lower, upper, frac = self._interp_cells(states)
+        for corner in itertools.product((0, 1), repeat=self.dims):
+            index = tuple(upper[:, i] if side else lower[:, i] for i, side in enumerate(corner))
+            yield corner, np.asarray(V[index], dtype=float), frac
+
+    def interpolate(self, V, states):
+        """ Multilinear interpolation of V at many states at once
+
+        Args:
+            V (np.array): array whose first dims axes span the grid, e.g. a value function,
+                optionally followed by further axes such as time slices
+            states (np.array, (num_states, dims) or (dims,)): states of dynamic objects
+
+        Returns:
+            np.array, (num_states,) + V.shape[dims:]: interpolated values of V
+        """
+        result = 0
+        for corner, V_c, frac in self._interp_corners(V, states):
+            weight = np.prod(np.where(corner, frac, 1 - frac), axis=1)
+            result = result + weight.reshape(weight.shape + (1,) * (V_c.ndim - 1)) * V_c
+        return result
+
+    def interpolate_gradient(self, V, states):
+        """ Gradient of the multilinear interpolant of V at many states at once
+
+        Args:
+            V (np.array): value function with the same shape as the grid
+            states (np.array, (num_states, dims) or (dims,)): states of dynamic objects
+
+        Returns:
+            np.array, (num_states, dims): the spatial derivative along each dimension
+        """
+        result = 0
+        for corner, V_c, frac in self._interp_corners(V, states):
+            weights = np.where(corner, frac, 1 - frac)
+            grad = np.empty(weights.shape)
+            for i in range(self.dims):
+                others = np.prod(np.delete(weights, i, axis=1), axis=1)
+                grad[:, i] = (1 if corner[i] else -1) * others / self.dx[i]
+            result = result + grad * V_c[:, np.newaxis]
+        return result
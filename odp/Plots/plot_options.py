@@ -12,16 +12,6 @@ class PlotOptions:
     
     if plot_type not in ["set", "value"]:
         raise Exception("Illegal plot type !")
-<<<<<<< HEAD
-
-    if plot_type == "2d_plot":
-        if len(plotDims) != 2:
-            raise Exception("Make sure that dim_plot size is 2 !!")
-
-    if plot_type == "3d_plot":
-        if len(plotDims) != 3:
-            raise Exception("Make sure that dim_plot size is 3 !!")
-=======
     
     if len(plotDims) != 1 and len(plotDims) != 2 and len(plotDims) != 3:
         raise Exception("Make sure that dim_plot size is 1, 2, or 3!!")
@@ -31,7 +21,6 @@ class PlotOptions:
     
     if plot_type == "set" and len(plotDims) == 1:
         raise Exception("Make sure that dim_plot size is 2 or 3 for 0 sublevel set plot!!")
->>>>>>> dev_hhy
 
     self.do_plot = do_plot
     self.dims_plot = plotDims
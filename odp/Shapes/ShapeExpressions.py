@@ -0,0 +1,173 @@
+import numpy as np
+
+""" Lazy implicit surface expressions
+
+The functions of ShapesFunctions build full float64 arrays for every intermediate shape. The
+classes below only describe a shape; Shape.evaluate computes the whole expression in a single
+pass over the grid, a slab of the first axis at a time, so that the temporaries never exceed
+one slab and the result is written straight into a float32 (or any given) buffer:
+
+    capture = Capture([0, 1], [2, 3], 0.1) | Capture([0, 1], [4, 5], 0.1)
+    obstacle = Rectangle([-0.1, -1.0], [0.1, -0.3], dims=[0, 1]) | Rectangle([-0.1, -1.0], [0.1, -0.3], dims=[2, 3])
+    target = (capture & ~obstacle).evaluate(grid)
+
+Like the implicit surface functions, a shape is negative inside and positive outside; union
+is the minimum, intersection the maximum and complement the negation.
+"""
+
+# Number of grid points evaluated at once
+SLAB_POINTS = 2**22
+
+
+class Shape:
+    def evaluate(self, grid, out=None, dtype=np.float32):
+        """ Evaluates the shape on every grid point
+
+        Args:
+            grid (Grid): grid object
+            out (np.ndarray, optional): buffer of the grid shape receiving the result, e.g. an
+                np.memmap or the target array of the solver. Defaults to None, a new array.
+            dtype (np.dtype, optional): type of the new array. Defaults to np.float32.
+
+        Returns:
+            np.ndarray: implicit surface function of the shape, of size grid.pts_each_dim
+        """
+        shape = tuple(int(n) for n in grid.pts_each_dim)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        assert out.shape == shape
+        rows = max(1, SLAB_POINTS // max(1, int(np.prod(shape[1:]))))
+        for start in range(0, shape[0], rows):
+            coords = [np.asarray(grid.vs[0][start:start + rows], dtype=out.dtype)] + \
+                     [np.asarray(grid.vs[d], dtype=out.dtype) for d in range(1, grid.dims)]
+            out[start:start + rows] = self.values(coords)
+        return out
+
+    def values(self, coords):
+        """ Implicit surface function at the points spanned by coords
+
+        Args:
+            coords (list): the coordinates of each dimension, broadcastable against each other
+                like grid.vs
+        """
+        raise NotImplementedError
+
+    def __or__(self, other):
+        return UnionShape(self, other)
+
+    def __and__(self, other):
+        return IntersectionShape(self, other)
+
+    def __invert__(self):
+        return ComplementShape(self)
+
+    def __sub__(self, other):
+        return IntersectionShape(self, ComplementShape(other))
+
+
+class UnionShape(Shape):
+    def __init__(self, *shapes):
+        self.shapes = shapes
+
+    def values(self, coords):
+        data = self.shapes[0].values(coords)
+        for shape in self.shapes[1:]:
+            data = np.minimum(data, shape.values(coords))
+        return data
+
+
+class IntersectionShape(Shape):
+    def __init__(self, *shapes):
+        self.shapes = shapes
+
+    def values(self, coords):
+        data = self.shapes[0].values(coords)
+        for shape in self.shapes[1:]:
+            data = np.maximum(data, shape.values(coords))
+        return data
+
+
+class ComplementShape(Shape):
+    def __init__(self, shape):
+        self.shape = shape
+
+    def values(self, coords):
+        return -self.shape.values(coords)
+
+
+class Rectangle(Shape):
+    def __init__(self, target_min, target_max, dims=None):
+        """ Axis aligned box, like ShapeRectangle
+
+        Args:
+            target_min (list): lower corner of the box
+            target_max (list): upper corner of the box
+            dims (list, optional): the dimensions the corners refer to, the other ones are
+                unbounded. Defaults to None, all dimensions.
+        """
+        self.target_min = target_min
+        self.target_max = target_max
+        self.dims = dims
+
+    def values(self, coords):
+        dims = range(len(coords)) if self.dims is None else self.dims
+        data = None
+        for n, d in enumerate(dims):
+            side = np.maximum(coords[d] - self.target_max[n], self.target_min[n] - coords[d])
+            data = side if data is None else np.maximum(data, side)
+        return data
+
+
+class Cylinder(Shape):
+    def __init__(self, ignore_dims, center, radius):
+        """ Axis aligned cylinder, like CylinderShape the squared distance minus the squared radius
+
+        Args:
+            ignore_dims (list): dimensions along which the cylinder is aligned (0-indexed)
+            center (list): center of the cylinder, one entry per dimension
+            radius (float): radius of the cylinder
+        """
+        self.ignore_dims = ignore_dims
+        self.center = center
+        self.radius = radius
+
+    def values(self, coords):
+        data = -self.radius * self.radius
+        for d in range(len(coords)):
+            if d not in self.ignore_dims:
+                data = data + np.square(coords[d] - self.center[d])
+        return data
+
+
+class Capture(Shape):
+    def __init__(self, dims_a, dims_b, radius):
+        """ Pairwise distance capture set, the distance between two agents minus the capture radius
+
+        Args:
+            dims_a (list): position dimensions of the first agent, e.g. [0, 1]
+            dims_b (list): position dimensions of the second agent, e.g. [2, 3]
+            radius (float): capture radius
+        """
+        assert len(dims_a) == len(dims_b)
+        self.dims_a = dims_a
+        self.dims_b = dims_b
+        self.radius = radius
+
+    def values(self, coords):
+        data = 0
+        for a, b in zip(self.dims_a, self.dims_b):
+            data = data + np.square(coords[a] - coords[b])
+        return np.sqrt(data) - self.radius
+
+
+class HalfSpace(Shape):
+    def __init__(self, dim, value, lower=True):
+        """ Axis aligned half space x[dim] < value, or x[dim] > value if lower is False """
+        self.dim = dim
+        self.value = value
+        self.lower = lower
+
+    def values(self, coords):
+        if self.lower:
+            return coords[self.dim] - self.value
+        return self.value - coords[self.dim]
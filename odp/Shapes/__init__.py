@@ -6,3 +6,11 @@ from odp.Shapes.ShapesFunctions import Upper_Half_Space
 from odp.Shapes.ShapesFunctions import Intersection
 from odp.Shapes.ShapesFunctions import Union
 from odp.Shapes.ShapesFunctions import ShapeEllipsoid
+from odp.Shapes.ShapeExpressions import Shape
+from odp.Shapes.ShapeExpressions import UnionShape
+from odp.Shapes.ShapeExpressions import IntersectionShape
+from odp.Shapes.ShapeExpressions import ComplementShape
+from odp.Shapes.ShapeExpressions import Rectangle
+from odp.Shapes.ShapeExpressions import Cylinder
+from odp.Shapes.ShapeExpressions import Capture
+from odp.Shapes.ShapeExpressions import HalfSpace
@@ -0,0 +1,143 @@
+import heterocl as hcl
+import numpy as np
+from contextlib import ExitStack
+from odp.computeGraphs.CustomGraphFunctions import *
+from odp.TimeToReach.TimeToReach_ND import phiCandidate_ND, EvalBoundary_ND
+
+""" Fast iterative method (FIM) for the N-D time-to-reach problem
+
+Instead of sweeping every cell in every direction, only the cells of an active list are
+updated. status marks each cell as
+    0: not in the active list
+    1: active, updated at every iteration until its value changes less than epsilon
+    2: converged during the current iteration
+A cell outside the active list is added to it when a neighbour converges and the update
+of the cell lowers its value by more than epsilon, so each cell is only revisited when
+its neighbourhood changed. The solver iterates until the active list is empty.
+"""
+
+FAR = 0
+ACTIVE = 1
+CONVERGED = 2
+
+
+def interior_loops(stack, g):
+    """ Opens one hcl.for_ per axis over the interior nodes, i.e. skipping the boundary nodes
+    of non-periodic axes, and returns the loop variables i0, ..., i{N-1} """
+    return tuple(stack.enter_context(hcl.for_(0 if d in g.pDim else 1,
+                                              g.pts_each_dim[d] if d in g.pDim else g.pts_each_dim[d] - 1,
+                                              name="i" + str(d)))
+                 for d in range(g.dims))
+
+
+def neighbour_index(idx, d, step, g):
+    """ Index of the neighbour of the interior node idx along axis d, wrapping periodic axes """
+    n = g.pts_each_dim[d]
+    pos = idx[d] + step
+    if d in g.pDim:
+        pos = hcl.select(pos < 0, n - 1, hcl.select(pos > n - 1, 0, pos))
+    return tuple(pos if e == d else idx[e] for e in range(len(idx)))
+
+
+def initial_active_list(init_value, g):
+    """ Status array whose active cells are the interior cells outside the target (phi > 0)
+    with a neighbour inside the target (phi == 0) """
+    inside = init_value <= 0
+    near = np.zeros(init_value.shape, dtype=bool)
+    for d in range(g.dims):
+        for step in (1, -1):
+            shifted = np.roll(inside, step, axis=d)
+            if d not in g.pDim:
+                edge = [slice(None)] * g.dims
+                edge[d] = 0 if step == 1 else -1
+                shifted[tuple(edge)] = False
+            near |= shifted
+    interior = [slice(None) if d in g.pDim else slice(1, -1) for d in range(g.dims)]
+    status = np.zeros(init_value.shape, dtype=np.uint8)
+    status[tuple(interior)] = (near & ~inside)[tuple(interior)] * ACTIVE
+    return status
+
+
+######################################### TIME-TO-REACH COMPUTATION ##########################################
+
+def TTR_FIM(my_object, g):
+    """ Builds the executable performing one iteration of the fast iterative method
+
+    The executable is called as solve_FIM(phi, x1, ..., xN, epsilon, status, active_count), where
+    status (UInt8, same shape as phi) holds the active list and active_count has one element per
+    node of the first axis, receiving the number of active cells on that slice after the iteration.
+
+    Args:
+        my_object: dynamics object providing opt_ctrl, opt_dstb and dynamics
+        g (Grid): grid object
+    """
+    dims = g.dims
+
+    def solve_FIM(phi, *args):
+        x = args[:dims]
+        epsilon, status, active_count = args[dims:]
+
+        # Update the active cells and mark those that converged
+        with hcl.Stage("Update"):
+            with ExitStack() as loops:
+                idx = interior_loops(loops, g)
+                with hcl.if_(status[idx] == ACTIVE):
+                    phiOld = hcl.scalar(0, "phiOld")
+                    phiOld[0] = phi[idx]
+                    phi[idx] = my_min(phiOld[0], phiCandidate_ND(idx, my_object, phi, g, x))
+                    with hcl.if_(phiOld[0] - phi[idx] <= epsilon[0]):
+                        status[idx] = CONVERGED
+            EvalBoundary_ND(phi, g)
+
+        # Add the neighbours of converged cells whose value improves
+        with hcl.Stage("Activate"):
+            with ExitStack() as loops:
+                idx = interior_loops(loops, g)
+                with hcl.if_(status[idx] == FAR):
+                    near = hcl.scalar(0, "near")
+                    for d in range(dims):
+                        for step in (1, -1):
+                            with hcl.if_(status[neighbour_index(idx, d, step, g)] == CONVERGED):
+                                near[0] = 1
+                    with hcl.if_(near[0] == 1):
+                        candidate = hcl.scalar(0, "candidate")
+                        candidate[0] = phiCandidate_ND(idx, my_object, phi, g, x)
+                        with hcl.if_(candidate[0] < phi[idx] - epsilon[0]):
+                            phi[idx] = candidate[0]
+                            status[idx] = ACTIVE
+
+        # Retire the converged cells and count the active ones
+        with hcl.Stage("Count"):
+            with hcl.for_(0, g.pts_each_dim[0], name="i0") as i0:
+                active_count[i0] = 0
+                with ExitStack() as loops:
+                    idx = (i0,) + tuple(loops.enter_context(hcl.for_(0, g.pts_each_dim[d], name="i" + str(d)))
+                                        for d in range(1, dims))
+                    with hcl.if_(status[idx] == CONVERGED):
+                        status[idx] = FAR
+                    with hcl.elif_(status[idx] == ACTIVE):
+                        active_count[i0] = active_count[i0] + 1
+
+    ###################################### SETUP PLACEHOLDERS ######################################
+
+    # Initialize the HCL environment
+    hcl.init()
+    hcl.config.init_dtype = hcl.Float()
+
+    # Positions vector
+    xs = [hcl.placeholder((g.pts_each_dim[d],), name="x" + str(d + 1), dtype=hcl.Float())
+          for d in range(dims)]
+    phi = hcl.placeholder(tuple(g.pts_each_dim), name="phi", dtype=hcl.Float())
+    epsilon = hcl.placeholder((1,), name="epsilon", dtype=hcl.Float())
+    status = hcl.placeholder(tuple(g.pts_each_dim), name="status", dtype=hcl.UInt(8))
+    active_count = hcl.placeholder((g.pts_each_dim[0],), name="active_count", dtype=hcl.Int())
+
+    # Create a static schedule -- graph
+    s = hcl.create_schedule([phi] + xs + [epsilon, status, active_count], solve_FIM)
+
+    # Thread parallelize the stages over the first axis
+    for stage in (solve_FIM.Update, solve_FIM.Activate, solve_FIM.Count):
+        s[stage].parallel(stage.i0)
+
+    # Build an executable and return
+    return hcl.build(s)
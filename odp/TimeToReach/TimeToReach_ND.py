@@ -0,0 +1,169 @@
+import heterocl as hcl
+import itertools
+import math
+from contextlib import ExitStack
+from odp.computeGraphs.CustomGraphFunctions import *
+from odp.spatialDerivatives.firstOrderENO.first_orderENOND import spa_deriv_ND
+
+""" Parallel fast sweeping for the N-D time-to-reach problem
+
+The interior of the grid is split into num_blocks blocks of rows along the first axis. Every
+sweep direction is one stage in which the blocks are swept concurrently, each block updating
+its own rows Gauss-Seidel style in that direction. Blocks read the edge rows of their
+neighbours while these are being updated; since an update can only lower phi, any read order
+gives an upper bound of the solution that the following iterations tighten, as in parallel
+fast sweeping with domain decomposition.
+
+The executable also returns, for every block, the largest change of phi over the iteration,
+so that the solver can test convergence without copying phi back.
+"""
+
+
+def ttr_blocks(g, num_blocks):
+    """ Number of blocks and rows per block used by TTR_ND for the first axis of g """
+    interior = g.pts_each_dim[0] - (0 if 0 in g.pDim else 2)
+    num_blocks = max(1, min(int(num_blocks), interior))
+    return num_blocks, int(math.ceil(interior / num_blocks))
+
+
+def sweep_directions(dims):
+    """ The 2^dims orderings of the grid, +1 sweeping an axis forward and -1 backward """
+    return list(itertools.product((1, -1), repeat=dims))
+
+
+# Candidate value of phi at position idx from its neighbours
+def phiCandidate_ND(idx, my_object, phi, g, x):
+    dims = g.dims
+    dV_dx_L = [hcl.scalar(0, "dV_dx" + str(d + 1) + "_L") for d in range(dims)]
+    dV_dx_R = [hcl.scalar(0, "dV_dx" + str(d + 1) + "_R") for d in range(dims)]
+    dV_dx = [hcl.scalar(0, "dV_dx" + str(d + 1)) for d in range(dims)]
+    for d in range(dims):
+        dV_dx_L[d][0], dV_dx_R[d][0] = spa_deriv_ND(idx, d, phi, g)
+        # Calculate average gradient
+        dV_dx[d][0] = (dV_dx_L[d][0] + dV_dx_R[d][0]) / 2
+    spat_deriv = tuple(dV_dx[d][0] for d in range(dims))
+    state = tuple(x[d][idx[d]] for d in range(dims))
+
+    # Find the optimal control through my_object's API
+    uOpt = my_object.opt_ctrl(0, state, spat_deriv)
+    dOpt = my_object.opt_dstb(0, state, spat_deriv)
+
+    # Calculate dynamical rates of changes
+    dx_dt = my_object.dynamics(0, state, uOpt, dOpt)
+
+    # Calculate Hamiltonian terms:
+    H = hcl.scalar(0, "H")
+    H[0] = 1
+    for d in range(dims):
+        H[0] = H[0] + dx_dt[d] * dV_dx[d][0]
+    H[0] = -H[0]
+
+    # Calculate the "dissipation"
+    sigma = [hcl.scalar(0, "sigma" + str(d + 1)) for d in range(dims)]
+    c = hcl.scalar(0, "c")
+    diss = hcl.scalar(0, "diss")
+    for d in range(dims):
+        sigma[d][0] = my_abs(dx_dt[d])
+        c[0] = c[0] + sigma[d][0] / g.dx[d]
+        diss[0] = diss[0] + sigma[d][0] * ((dV_dx_R[d][0] - dV_dx_L[d][0]) / 2 + phi[idx] / g.dx[d])
+
+    # New phi
+    phiNew = hcl.scalar(0, "phiNew")
+    phiNew[0] = (-H[0] + diss[0]) / c[0]
+    return phiNew[0]
+
+
+# Update phi at position idx and return how much it decreased
+def updatePhi_ND(idx, my_object, phi, g, x):
+    phiOld = hcl.scalar(0, "phiOld")
+    phiOld[0] = phi[idx]
+    phi[idx] = my_min(phiOld[0], phiCandidate_ND(idx, my_object, phi, g, x))
+    return phiOld[0] - phi[idx]
+
+
+def EvalBoundary_ND(phi, g):
+    """ Extrapolates phi to the boundary nodes of every non-periodic axis """
+    dims = g.dims
+    for d in range(dims):
+        if d in g.pDim:
+            continue
+        n = phi.shape[d]
+        with ExitStack() as loops:
+            others = [loops.enter_context(hcl.for_(0, phi.shape[e], name="e" + str(e)))
+                      for e in range(dims) if e != d]
+
+            def at(pos):
+                return tuple(others[:d]) + (pos,) + tuple(others[d:])
+
+            tmp1 = hcl.scalar(0, "tmp1")
+            tmp1[0] = 2 * phi[at(1)] - phi[at(2)]
+            tmp1[0] = my_max(tmp1[0], phi[at(2)])
+            phi[at(0)] = my_min(tmp1[0], phi[at(0)])
+
+            tmp2 = hcl.scalar(0, "tmp2")
+            tmp2[0] = 2 * phi[at(n - 2)] - phi[at(n - 3)]
+            tmp2[0] = my_max(tmp2[0], phi[at(n - 3)])
+            phi[at(n - 1)] = my_min(tmp2[0], phi[at(n - 1)])
+
+######################################### TIME-TO-REACH COMPUTATION ##########################################
+
+def TTR_ND(my_object, g, num_blocks=8):
+    """ Builds the executable performing one fast sweeping iteration over all 2^N directions
+
+    The executable is called as solve_TTR(phi, x1, ..., xN, residual), where residual has
+    ttr_blocks(g, num_blocks)[0] elements and receives the largest decrease of phi in each block.
+
+    Args:
+        my_object: dynamics object providing opt_ctrl, opt_dstb and dynamics
+        g (Grid): grid object
+        num_blocks (int, optional): number of blocks swept concurrently. Defaults to 8.
+    """
+    dims = g.dims
+    num_blocks, block_len = ttr_blocks(g, num_blocks)
+    lows = [0 if d in g.pDim else 1 for d in range(dims)]
+    highs = [g.pts_each_dim[d] if d in g.pDim else g.pts_each_dim[d] - 1 for d in range(dims)]
+    directions = sweep_directions(dims)
+
+    def solve_phiNew(phi, *args):
+        x = args[:dims]
+        residual = args[dims]
+        for n, direction in enumerate(directions):
+            with hcl.Stage("Sweep_" + str(n + 1)):
+                with hcl.for_(0, num_blocks, name="b") as b:
+                    if n == 0:
+                        residual[b] = 0
+                    with ExitStack() as loops:
+                        local = loops.enter_context(hcl.for_(0, block_len, name="i0"))
+                        if direction[0] < 0:
+                            local = block_len - 1 - local
+                        idx = [lows[0] + b * block_len + local]
+                        for d in range(1, dims):
+                            i = loops.enter_context(hcl.for_(lows[d], highs[d], name="i" + str(d)))
+                            idx.append(i if direction[d] > 0 else lows[d] + highs[d] - 1 - i)
+                        loops.enter_context(hcl.if_(idx[0] < highs[0]))
+                        change = updatePhi_ND(tuple(idx), my_object, phi, g, x)
+                        residual[b] = my_max(residual[b], change)
+                EvalBoundary_ND(phi, g)
+
+    ###################################### SETUP PLACEHOLDERS ######################################
+
+    # Initialize the HCL environment
+    hcl.init()
+    hcl.config.init_dtype = hcl.Float()
+
+    # Positions vector
+    xs = [hcl.placeholder((g.pts_each_dim[d],), name="x" + str(d + 1), dtype=hcl.Float())
+          for d in range(dims)]
+    phi = hcl.placeholder(tuple(g.pts_each_dim), name="phi", dtype=hcl.Float())
+    residual = hcl.placeholder((num_blocks,), name="residual", dtype=hcl.Float())
+
+    # Create a static schedule -- graph
+    s = hcl.create_schedule([phi] + xs + [residual], solve_phiNew)
+
+    # Sweep the blocks in parallel
+    for n in range(len(directions)):
+        sweep = getattr(solve_phiNew, "Sweep_" + str(n + 1))
+        s[sweep].parallel(sweep.b)
+
+    # Build an executable and return
+    return hcl.build(s)
@@ -4,3 +4,5 @@ from odp.TimeToReach.TimeToReach_3D import TTR_3D
 from odp.TimeToReach.TimeToReach_4D import TTR_4D
 from odp.TimeToReach.TimeToReach_5D import TTR_5D
 # from odp.TimeToReach.TimeToReach_6D import TTR_6D
+from odp.TimeToReach.TimeToReach_ND import TTR_ND, ttr_blocks
+from odp.TimeToReach.TimeToReach_FIM import TTR_FIM, initial_active_list
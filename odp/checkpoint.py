@@ -0,0 +1,63 @@
+import json
+import os
+import numpy as np
+
+""" Checkpoints of HJSolver
+
+HJSolver(..., checkpoint_dir=...) periodically stores the value function together with the
+position of the solver in tau, so that a run stopped by a crash or a wall-clock limit can be
+continued with HJSolver(..., resume_from=checkpoint_dir). The solver parameters are stored as
+well and have to match when resuming, otherwise the result would not be the one of an
+uninterrupted run.
+"""
+
+CHECKPOINT_FILE = "checkpoint.npz"
+
+
+def solver_parameters(grid, tau, compMethod, **kwargs):
+    """ The parameters a checkpoint is only valid for, as a JSON serializable dict """
+    params = {"pts_each_dim": [int(n) for n in grid.pts_each_dim],
+              "min": [float(v) for v in grid.min], "max": [float(v) for v in grid.max],
+              "pDim": [int(d) for d in grid.pDim],
+              "tau": [float(t) for t in tau], "compMethod": dict(compMethod)}
+    params.update(kwargs)
+    return params
+
+
+def save_checkpoint(checkpoint_dir, params, V, **state):
+    """ Stores V and the solver state in checkpoint_dir, replacing the previous checkpoint
+
+    Args:
+        checkpoint_dir (str): directory of the checkpoint, created if it does not exist
+        params (dict): solver parameters, see solver_parameters
+        V (np.ndarray): value function
+        state: scalars or arrays describing the position of the solver, e.g. tNow and the tau index
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = os.path.join(checkpoint_dir, CHECKPOINT_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, V=V, params=json.dumps(params), **state)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(checkpoint_dir, params):
+    """ Loads the checkpoint stored in checkpoint_dir
+
+    Args:
+        checkpoint_dir (str): directory written by save_checkpoint
+        params (dict): parameters of the solver that resumes, see solver_parameters
+
+    Returns:
+        V (np.ndarray), state (dict): the value function and the solver state given to save_checkpoint
+    """
+    with np.load(os.path.join(checkpoint_dir, CHECKPOINT_FILE)) as data:
+        saved = json.loads(str(data["params"]))
+        # Round trip through JSON so that tuples and lists compare equal
+        current = json.loads(json.dumps(params))
+        if saved != current:
+            changed = sorted(k for k in set(saved) | set(current) if saved.get(k) != current.get(k))
+            raise ValueError("The checkpoint in {} was written with different solver parameters: {}"
+                             .format(checkpoint_dir, ", ".join(changed)))
+        state = {k: data[k] for k in data.files if k not in ("V", "params")}
+        return data["V"], state
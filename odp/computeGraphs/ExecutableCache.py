@@ -0,0 +1,182 @@
+import glob
+import hashlib
+import inspect
+import os
+import sys
+import numpy as np
+import heterocl as hcl
+
+""" On-disk cache of compiled HeteroCL executables
+
+Building a graph (hcl.init, schedule creation and LLVM compilation) costs the same every time
+a solver is called with identical inputs. Executables are stored as shared libraries under
+ODP_CACHE_DIR (default ~/.cache/odp) and keyed by a fingerprint of the graph builder and the odp
+modules it imports, the dynamics class and its parameters, the grid and the method arguments.
+At most ODP_CACHE_SIZE (default 32) executables are kept, the least recently used ones are evicted first.
+"""
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "odp")
+DEFAULT_CACHE_SIZE = 32
+
+
+def _source(obj):
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return ""
+
+
+def _imported_modules(module, package="odp"):
+    """ Returns the modules of package that module imports, directly or through other modules of package
+
+    Both the modules themselves and the modules of the functions and classes imported from them
+    (from ... import *) are followed, so a change in any stage of a graph changes the fingerprint.
+    """
+    found = {}
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        if current is None or current.__name__ in found:
+            continue
+        found[current.__name__] = current
+        for value in vars(current).values():
+            if inspect.ismodule(value):
+                name = value.__name__
+            else:
+                name = getattr(value, "__module__", None)
+                if not isinstance(name, str):
+                    continue
+            if (name == package or name.startswith(package + ".")) and name not in found:
+                pending.append(sys.modules.get(name))
+    return [found[name] for name in sorted(found)]
+
+
+def _describe(value, depth=0):
+    """ Returns a deterministic description of a value that ends up as a constant in the graph """
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.shape, str(value.dtype), hashlib.sha256(value.tobytes()).hexdigest())
+    if isinstance(value, (list, tuple)):
+        return [_describe(v, depth + 1) for v in value]
+    if isinstance(value, dict):
+        return sorted((str(k), _describe(v, depth + 1)) for k, v in value.items())
+    if isinstance(value, (bool, int, float, str, np.generic)) or value is None:
+        return value
+    if hasattr(value, "__dict__") and depth < 4:
+        return (type(value).__qualname__, _describe(vars(value), depth + 1))
+    return type(value).__qualname__
+
+
+def executable_fingerprint(builder, dynamics_obj, grid, *args, **kwargs):
+    """ Hash identifying the executable returned by builder(dynamics_obj, grid, *args, **kwargs)
+
+    Args:
+        builder (function): graph builder such as graph_ND or TTR_3D
+        dynamics_obj: dynamics object, or None for graphs without dynamics
+        grid (Grid): grid object
+        args, kwargs: remaining arguments of the builder
+    """
+    h = hashlib.sha256()
+
+    def feed(*items):
+        for item in items:
+            h.update(repr(item).encode())
+            h.update(b"\0")
+
+    feed(getattr(hcl, "__version__", ""), builder.__module__, builder.__qualname__)
+    for module in _imported_modules(inspect.getmodule(builder)):
+        feed(module.__name__, _source(module))
+    if dynamics_obj is not None:
+        for cls in type(dynamics_obj).__mro__[:-1]:
+            feed(cls.__module__, cls.__qualname__, _source(cls))
+        feed(_describe(vars(dynamics_obj)))
+    feed(np.asarray(grid.pts_each_dim).tolist(), np.asarray(grid.min).tolist(),
+         np.asarray(grid.max).tolist(), list(grid.pDim), np.asarray(grid.dx).tolist())
+    feed(_describe(list(args)), _describe(kwargs))
+    return h.hexdigest()[:32]
+
+
+class ExecutableCache:
+    def __init__(self, cache_dir=None, max_entries=None):
+        """ Least recently used cache of compiled executables on disk
+
+        Args:
+            cache_dir (str, optional): directory of the cache. Defaults to $ODP_CACHE_DIR or ~/.cache/odp
+            max_entries (int, optional): number of executables to keep. Defaults to $ODP_CACHE_SIZE or 32
+        """
+        self.cache_dir = cache_dir or os.environ.get("ODP_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_entries = max_entries or int(os.environ.get("ODP_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + ".so")
+
+    def load(self, key):
+        """ Returns the cached executable for key, or None if there is none """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            from heterocl.tvm import module as tvm_module
+            executable = tvm_module.load(path)
+        except Exception as e:
+            print("Discarding unreadable cached executable {}: {}".format(path, e))
+            self.remove(path)
+            return None
+        # Mark as recently used
+        os.utime(path, None)
+        return executable
+
+    def store(self, key, executable):
+        """ Writes executable to the cache and evicts the least recently used entries """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = os.path.join(self.cache_dir, "tmp-{}-{}.so".format(os.getpid(), key))
+        try:
+            executable.export_library(tmp_path)
+            os.replace(tmp_path, self.path(key))
+        except Exception as e:
+            print("Could not cache executable: {}".format(e))
+            self.remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        entries = [p for p in glob.glob(os.path.join(self.cache_dir, "*.so"))
+                   if not os.path.basename(p).startswith("tmp-")]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            self.remove(path)
+
+    def clear(self):
+        for path in glob.glob(os.path.join(self.cache_dir, "*.so")):
+            self.remove(path)
+
+    @staticmethod
+    def remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get_or_build(self, key, build):
+        """ Returns the cached executable for key, calling build() and caching its result on a miss """
+        executable = self.load(key)
+        if executable is not None:
+            print("Loaded cached executable\n")
+            return executable
+        executable = build()
+        self.store(key, executable)
+        return executable
+
+
+def cached_executable(builder, dynamics_obj, grid, *args, use_cache=True, **kwargs):
+    """ Returns builder(dynamics_obj, grid, *args, **kwargs), skipping graph construction on a cache hit
+
+    Args:
+        builder (function): graph builder such as graph_ND or TTR_3D
+        dynamics_obj: dynamics object, or None for graphs without dynamics
+        grid (Grid): grid object
+        use_cache (bool, optional): set to False to always rebuild. Defaults to True.
+    """
+    if not use_cache:
+        return builder(dynamics_obj, grid, *args, **kwargs)
+    key = executable_fingerprint(builder, dynamics_obj, grid, *args, **kwargs)
+    return ExecutableCache().get_or_build(key, lambda: builder(dynamics_obj, grid, *args, **kwargs))
@@ -0,0 +1,442 @@
+import heterocl as hcl
+from contextlib import ExitStack
+from odp.computeGraphs.CustomGraphFunctions import *
+from odp.spatialDerivatives.firstOrderENO.first_orderENOND import *
+from odp.spatialDerivatives.secondOrderENO.second_orderENOND import *
+
+########################## N-D graph definition ########################
+
+def grid_loops(stack, shape):
+    """ Opens one nested hcl.for_ per axis of shape and returns the loop variables
+
+    The loops are named i0, i1, ..., i{N-1} from the outermost to the innermost axis.
+
+    Args:
+        stack (ExitStack): stack that keeps the loops open
+        shape (tuple): shape of the iterated tensor
+    """
+    return tuple(stack.enter_context(hcl.for_(0, shape[d], name="i" + str(d)))
+                 for d in range(len(shape)))
+
+
+def spatial_derivative(idx, dim, V, g, accuracy, axis_range=None):
+    """ Left and right spatial derivatives along dim with the requested ENO order """
+    if accuracy == "low":
+        return spa_deriv_ND(idx, dim, V, g, axis_range)
+    if accuracy == "medium":
+        return secondOrder_ENO_ND(idx, dim, V, g, axis_range)
+    raise ValueError("Unsupported accuracy {}, expected 'low' or 'medium'".format(accuracy))
+
+
+def store_scalars(values, name):
+    """ Stores a tuple of hcl expressions into scalars and returns their values
+
+    Args:
+        values (tuple): e.g. the optimal control returned by opt_ctrl
+        name (str): prefix of the scalar names
+    """
+    scalars = [hcl.scalar(0, name + str(n + 1)) for n in range(len(values))]
+    for n in range(len(values)):
+        scalars[n][0] = values[n]
+    return tuple(s[0] for s in scalars)
+
+
+# Note that t has 2 elements t1, t2
+def graph_ND(my_object, g, compMethod, accuracy, generate_SpatDeriv=False, deriv_dim=1,
+             obstacleMode=None, computeDiff=False, narrowBand=False, fused=False):
+    """ Builds the HJ PDE executable for a grid of any dimension
+
+    The returned executable is called as solve_pde(V_new, V_init, x1, ..., xN, t, l0), followed by
+    the band mask and the (3,) band state if narrowBand is True, the (2, N) derivative bounds if fused
+    is True, the obstacle array if obstacleMode is given and by a (1,)
+    buffer receiving max |V_new - V_init| if computeDiff is True. With generate_SpatDeriv=True it is
+    called as compute_SpatDeriv(V, deriv) instead and computes the averaged derivative along
+    deriv_dim (1-indexed).
+
+    Args:
+        my_object: dynamics object providing opt_ctrl, opt_dstb and dynamics
+        g (Grid): grid object
+        compMethod (str): TargetSetMode of the computation
+        accuracy (str): "low" for first order ENO, "medium" for second order ENO
+        generate_SpatDeriv (bool): build the spatial derivative graph instead
+        deriv_dim (int): derivative axis for the spatial derivative graph (1-indexed)
+        obstacleMode (str): ObstacleSetMode of the computation, None if there is no obstacle
+        computeDiff (bool): compute the maximum change of V over the step, used for convergence
+        narrowBand (bool): only update the cells where the UInt(8) band mask is non-zero, the others
+            keep their value. The band state holds [width, rebuild period, substeps left]; once no
+            substeps are left, the mask is rebuilt from |V_init| <= width at the start of the step
+        fused (bool): compute the Hamiltonian and the dissipation in a single sweep without deriv_diff
+            tensors, and integrate and apply the target and obstacle sets in one more sweep. The
+            dissipation uses the derivative bounds [min, max] of the previous step, which the sweep
+            updates for the next one. Bounds with min > max, as passed on the first step, are computed
+            by a pre-pass first
+    """
+    dims = g.dims
+    V_f = hcl.placeholder(tuple(g.pts_each_dim), name="V_f", dtype=hcl.Float())
+    V_init = hcl.placeholder(tuple(g.pts_each_dim), name="V_init", dtype=hcl.Float())
+    l0 = hcl.placeholder(tuple(g.pts_each_dim), name="l0", dtype=hcl.Float())
+    t = hcl.placeholder((2,), name="t", dtype=hcl.Float())
+    obstacle = hcl.placeholder(tuple(g.pts_each_dim), name="obstacle", dtype=hcl.Float())
+    max_diff = hcl.placeholder((1,), name="max_diff", dtype=hcl.Float())
+    band = hcl.placeholder(tuple(g.pts_each_dim), name="band", dtype=hcl.UInt(8))
+    band_state = hcl.placeholder((3,), name="band_state", dtype=hcl.Float())
+    deriv_bounds = hcl.placeholder((2, g.dims), name="deriv_bounds", dtype=hcl.Float())
+
+    # Positions vector
+    xs = [hcl.placeholder((g.pts_each_dim[d],), name="x" + str(d + 1), dtype=hcl.Float())
+          for d in range(dims)]
+
+    def graph_create(V_new, V_init, *args):
+        x, t, l0 = args[:dims], args[dims], args[dims + 1]
+        extra = list(args[dims + 2:])
+        band, band_state = (extra.pop(0), extra.pop(0)) if narrowBand else (None, None)
+        deriv_bounds = extra.pop(0) if fused else None
+        obstacle = extra.pop(0) if obstacleMode is not None else None
+        max_diff = extra.pop(0) if computeDiff else None
+
+        # Rebuild the band every band_state[1] substeps, without leaving the executable
+        if narrowBand:
+            with hcl.Stage("BandRebuild"):
+                with hcl.if_(band_state[2] < 0.5):
+                    with ExitStack() as loops:
+                        idx = grid_loops(loops, V_init.shape)
+                        with hcl.if_(my_abs(V_init[idx]) <= band_state[0]):
+                            band[idx] = 1
+                        with hcl.else_():
+                            band[idx] = 0
+                    band_state[2] = band_state[1]
+                band_state[2] = band_state[2] - 1
+
+        # Specify intermediate tensors
+        if not fused:
+            deriv_diff = [hcl.compute(V_init.shape, lambda *idx: 0, "deriv_diff" + str(d + 1))
+                          for d in range(dims)]
+
+        # Maximum and minimum derivative for each dim
+        max_deriv = [hcl.scalar(-1e9, "max_deriv" + str(d + 1)) for d in range(dims)]
+        min_deriv = [hcl.scalar(1e9, "min_deriv" + str(d + 1)) for d in range(dims)]
+
+        # These variables are used to dissipation calculation
+        max_alpha = [hcl.scalar(-1e9, "max_alpha" + str(d + 1)) for d in range(dims)]
+
+        def step_bound():  # Function to calculate time step
+            stepBoundInv = hcl.scalar(0, "stepBoundInv")
+            stepBound = hcl.scalar(0, "stepBound")
+            for d in range(dims):
+                stepBoundInv[0] = stepBoundInv[0] + max_alpha[d][0] / g.dx[d]
+
+            stepBound[0] = 0.8 / stepBoundInv[0]
+            with hcl.if_(stepBound > t[1] - t[0]):
+                stepBound[0] = t[1] - t[0]
+
+            # Update the lower time ranges
+            t[0] = t[0] + stepBound[0]
+            return stepBound[0]
+
+        # Operation with target value array
+        def maxVWithV0(*idx):  # Take max
+            with hcl.if_(V_new[idx] < l0[idx]):
+                V_new[idx] = l0[idx]
+
+        def minVWithV0(*idx):  # Take min
+            with hcl.if_(V_new[idx] > l0[idx]):
+                V_new[idx] = l0[idx]
+
+        # Operations over time
+        def minVWithVInit(*idx):
+            with hcl.if_(V_new[idx] > V_init[idx]):
+                V_new[idx] = V_init[idx]
+
+        def maxVWithVInit(*idx):
+            with hcl.if_(V_new[idx] < V_init[idx]):
+                V_new[idx] = V_init[idx]
+
+        # Operation with obstacle array
+        def maxVWithObstacle(*idx):
+            with hcl.if_(V_new[idx] < -obstacle[idx]):
+                V_new[idx] = -obstacle[idx]
+
+        def minVWithObstacle(*idx):
+            with hcl.if_(V_new[idx] > -obstacle[idx]):
+                V_new[idx] = -obstacle[idx]
+
+        def cell_derivatives(idx):
+            """ Left and right derivatives of every axis at idx """
+            dV_dx_L = [hcl.scalar(0, "dV_dx" + str(d + 1) + "_L") for d in range(dims)]
+            dV_dx_R = [hcl.scalar(0, "dV_dx" + str(d + 1) + "_R") for d in range(dims)]
+            for d in range(dims):
+                dV_dx_L[d][0], dV_dx_R[d][0] = spatial_derivative(idx, d, V_init, g, accuracy)
+            return dV_dx_L, dV_dx_R
+
+        if fused:
+            # Pre-pass of the derivative bounds, only on the first step: the later steps reuse the bounds
+            # of the previous one instead of computing the ENO derivatives twice
+            with hcl.Stage("DerivBounds"):
+                with hcl.if_(deriv_bounds[0, 0] > deriv_bounds[1, 0]):
+                    with ExitStack() as loops:
+                        idx = grid_loops(loops, V_init.shape)
+                        if narrowBand:
+                            loops.enter_context(hcl.if_(band[idx] > 0))
+                        dV_dx_L, dV_dx_R = cell_derivatives(idx)
+                        for d in range(dims):
+                            deriv_bounds[0, d] = my_min(deriv_bounds[0, d], my_min(dV_dx_L[d][0], dV_dx_R[d][0]))
+                            deriv_bounds[1, d] = my_max(deriv_bounds[1, d], my_max(dV_dx_L[d][0], dV_dx_R[d][0]))
+
+            # Hamiltonian and dissipation in a single sweep, V_new holds the rate of change
+            with hcl.Stage("HamiltonianDissipation"):
+                min_derivs = store_scalars(tuple(deriv_bounds[0, d] for d in range(dims)), "min_bound")
+                max_derivs = store_scalars(tuple(deriv_bounds[1, d] for d in range(dims)), "max_bound")
+
+                # Same approximation of the disturbance bounds as below
+                corner_state = tuple(x[d][0] for d in range(dims))
+                dOptL = store_scalars(my_object.opt_dstb(t, corner_state, min_derivs), "dOptL")
+                dOptU = store_scalars(my_object.opt_dstb(t, corner_state, max_derivs), "dOptU")
+
+                alpha = [hcl.scalar(0, "alpha" + str(d + 1)) for d in range(dims)]
+
+                with ExitStack() as loops:
+                    idx = grid_loops(loops, V_init.shape)
+                    if narrowBand:
+                        V_new[idx] = 0
+                        loops.enter_context(hcl.if_(band[idx] > 0))
+                    state = tuple(x[d][idx[d]] for d in range(dims))
+                    dV_dx_L, dV_dx_R = cell_derivatives(idx)
+
+                    # Calculate average gradient, and the derivative bounds of the next step
+                    dV_dx = [hcl.scalar(0, "dV_dx" + str(d + 1)) for d in range(dims)]
+                    for d in range(dims):
+                        dV_dx[d][0] = (dV_dx_L[d][0] + dV_dx_R[d][0]) / 2
+                        min_deriv[d][0] = my_min(min_deriv[d][0], my_min(dV_dx_L[d][0], dV_dx_R[d][0]))
+                        max_deriv[d][0] = my_max(max_deriv[d][0], my_max(dV_dx_L[d][0], dV_dx_R[d][0]))
+                    spat_deriv = tuple(dV_dx[d][0] for d in range(dims))
+
+                    # Find optimal control and disturbance
+                    uOpt = my_object.opt_ctrl(t, state, spat_deriv)
+                    dOpt = my_object.opt_dstb(t, state, spat_deriv)
+
+                    # Calculate Hamiltonian terms:
+                    dx_dt = my_object.dynamics(t, state, uOpt, dOpt)
+                    hamiltonian = dx_dt[0] * dV_dx[0][0]
+                    for d in range(1, dims):
+                        hamiltonian = hamiltonian + dx_dt[d] * dV_dx[d][0]
+
+                    # Find LOWER and UPPER BOUND optimal control
+                    uOptL = store_scalars(my_object.opt_ctrl(t, state, min_derivs), "uOptL")
+                    uOptU = store_scalars(my_object.opt_ctrl(t, state, max_derivs), "uOptU")
+
+                    # Calculate alphas from the magnitude of rates of changes
+                    for d in range(dims):
+                        alpha[d][0] = 0
+                    for uOptB in (uOptL, uOptU):
+                        for dOptB in (dOptL, dOptU):
+                            dx_dt = my_object.dynamics(t, state, uOptB, dOptB)
+                            for d in range(dims):
+                                alpha[d][0] = my_max(alpha[d][0], my_abs(dx_dt[d]))
+
+                    diss = hcl.scalar(0, "diss")
+                    for d in range(dims):
+                        diss[0] = diss[0] + (dV_dx_R[d][0] - dV_dx_L[d][0]) * alpha[d][0]
+                    diss[0] = 0.5 * diss[0]
+
+                    V_new[idx] = hamiltonian + diss[0]
+
+                    # Get maximum alphas in each dimension
+                    for d in range(dims):
+                        with hcl.if_(alpha[d][0] > max_alpha[d][0]):
+                            max_alpha[d][0] = alpha[d][0]
+
+                for d in range(dims):
+                    deriv_bounds[0, d] = min_deriv[d][0]
+                    deriv_bounds[1, d] = max_deriv[d][0]
+        else:
+            # Calculate Hamiltonian for every grid point in V_init
+            with hcl.Stage("Hamiltonian"):
+                with ExitStack() as loops:
+                    idx = grid_loops(loops, V_init.shape)
+                    if narrowBand:
+                        # Cells outside of the band have no rate of change
+                        V_new[idx] = 0
+                        loops.enter_context(hcl.if_(band[idx] > 0))
+                    state = tuple(x[d][idx[d]] for d in range(dims))
+
+                    # Variables to calculate dV_dx
+                    dV_dx_L = [hcl.scalar(0, "dV_dx" + str(d + 1) + "_L") for d in range(dims)]
+                    dV_dx_R = [hcl.scalar(0, "dV_dx" + str(d + 1) + "_R") for d in range(dims)]
+                    dV_dx = [hcl.scalar(0, "dV_dx" + str(d + 1)) for d in range(dims)]
+
+                    for d in range(dims):
+                        dV_dx_L[d][0], dV_dx_R[d][0] = spatial_derivative(idx, d, V_init, g, accuracy)
+
+                        # Saves spatial derivative diff into tables
+                        deriv_diff[d][idx] = dV_dx_R[d][0] - dV_dx_L[d][0]
+
+                        # Calculate average gradient
+                        dV_dx[d][0] = (dV_dx_L[d][0] + dV_dx_R[d][0]) / 2
+
+                    spat_deriv = tuple(dV_dx[d][0] for d in range(dims))
+
+                    # Find optimal control and disturbance
+                    uOpt = my_object.opt_ctrl(t, state, spat_deriv)
+                    dOpt = my_object.opt_dstb(t, state, spat_deriv)
+
+                    # Find rates of changes based on dynamics equation
+                    dx_dt = my_object.dynamics(t, state, uOpt, dOpt)
+
+                    # Calculate Hamiltonian terms:
+                    hamiltonian = dx_dt[0] * dV_dx[0][0]
+                    for d in range(1, dims):
+                        hamiltonian = hamiltonian + dx_dt[d] * dV_dx[d][0]
+                    V_new[idx] = -hamiltonian
+
+                    # Get derivMin and derivMax
+                    for d in range(dims):
+                        with hcl.if_(dV_dx_L[d][0] < min_deriv[d][0]):
+                            min_deriv[d][0] = dV_dx_L[d][0]
+                        with hcl.if_(dV_dx_R[d][0] < min_deriv[d][0]):
+                            min_deriv[d][0] = dV_dx_R[d][0]
+
+                        with hcl.if_(dV_dx_L[d][0] > max_deriv[d][0]):
+                            max_deriv[d][0] = dV_dx_L[d][0]
+                        with hcl.if_(dV_dx_R[d][0] > max_deriv[d][0]):
+                            max_deriv[d][0] = dV_dx_R[d][0]
+
+            # Calculate dissipation amount
+            with hcl.Stage("Dissipation"):
+                min_derivs = tuple(min_deriv[d][0] for d in range(dims))
+                max_derivs = tuple(max_deriv[d][0] for d in range(dims))
+
+                """
+                    NOTE: If optimal adversarial disturbance is not dependent on states
+                    , the below approximate LOWER/UPPER BOUND optimal disturbance is  accurate.
+                    If that's not the case, move the next two statements into the nested loops and modify the states passed in
+                    as my_object.opt_dstb(t, state, ...).
+                    The reason we don't have this line in the nested loop by default is to avoid redundant computations
+                    for certain systems where disturbance are not dependent on states.
+                    In general, dissipation amount can just be approximates.
+                """
+                corner_state = tuple(x[d][0] for d in range(dims))
+                dOptL = store_scalars(my_object.opt_dstb(t, corner_state, min_derivs), "dOptL")
+                dOptU = store_scalars(my_object.opt_dstb(t, corner_state, max_derivs), "dOptU")
+
+                alpha = [hcl.scalar(0, "alpha" + str(d + 1)) for d in range(dims)]
+
+                with ExitStack() as loops:
+                    idx = grid_loops(loops, V_init.shape)
+                    if narrowBand:
+                        loops.enter_context(hcl.if_(band[idx] > 0))
+                    state = tuple(x[d][idx[d]] for d in range(dims))
+
+                    # Find LOWER and UPPER BOUND optimal control
+                    uOptL = store_scalars(my_object.opt_ctrl(t, state, min_derivs), "uOptL")
+                    uOptU = store_scalars(my_object.opt_ctrl(t, state, max_derivs), "uOptU")
+
+                    # Calculate alphas from the magnitude of rates of changes
+                    for d in range(dims):
+                        alpha[d][0] = 0
+                    for uOpt in (uOptL, uOptU):
+                        for dOpt in (dOptL, dOptU):
+                            dx_dt = my_object.dynamics(t, state, uOpt, dOpt)
+                            for d in range(dims):
+                                alpha[d][0] = my_max(alpha[d][0], my_abs(dx_dt[d]))
+
+                    diss = hcl.scalar(0, "diss")
+                    for d in range(dims):
+                        diss[0] = diss[0] + deriv_diff[d][idx] * alpha[d][0]
+                    diss[0] = 0.5 * diss[0]
+
+                    # Finally
+                    V_new[idx] = -(V_new[idx] - diss[0])
+
+                    # Get maximum alphas in each dimension
+                    for d in range(dims):
+                        with hcl.if_(alpha[d][0] > max_alpha[d][0]):
+                            max_alpha[d][0] = alpha[d][0]
+
+        # Determine time step
+        delta_t = hcl.compute((1,), lambda x: step_bound(), name="delta_t")
+        def elementwise(op):
+            return lambda *idx: op(*idx)
+
+        # Different computation method check
+        set_ops = []
+        if compMethod == 'maxVWithV0' or compMethod == 'maxVWithVTarget':
+            set_ops.append(maxVWithV0)
+        if compMethod == 'minVWithV0' or compMethod == 'minVWithVTarget':
+            set_ops.append(minVWithV0)
+        if compMethod == 'minVWithVInit':
+            set_ops.append(minVWithVInit)
+        if compMethod == 'maxVWithVInit':
+            set_ops.append(maxVWithVInit)
+        if obstacleMode == 'maxVWithObstacle':
+            set_ops.append(maxVWithObstacle)
+        if obstacleMode == 'minVWithObstacle':
+            set_ops.append(minVWithObstacle)
+
+        if fused:
+            # Integrate and apply the target and obstacle sets in one sweep
+            def integrate(*idx):
+                V_new[idx] = V_init[idx] + V_new[idx] * delta_t[0]
+                for op in set_ops:
+                    op(*idx)
+            result = hcl.update(V_new, lambda *idx: integrate(*idx))
+        else:
+            # Integrate
+            result = hcl.update(V_new, lambda *idx: V_init[idx] + V_new[idx] * delta_t[0])
+            for op in set_ops:
+                result = hcl.update(V_new, elementwise(op))
+
+        # Maximum change over the step, for the convergence check
+        if computeDiff:
+            with hcl.Stage("MaxDiff"):
+                diff = hcl.scalar(0, "diff")
+                with ExitStack() as loops:
+                    idx = grid_loops(loops, V_init.shape)
+                    diff[0] = my_max(diff[0], my_abs(V_new[idx] - V_init[idx]))
+                max_diff[0] = diff[0]
+
+        # Copy V_new to V_init
+        hcl.update(V_init, lambda *idx: V_new[idx])
+        return result
+
+    def returnDerivative(V_array, Deriv_array):
+        with hcl.Stage("ComputeDeriv"):
+            with ExitStack() as loops:
+                idx = grid_loops(loops, V_array.shape)
+                dV_dx_L = hcl.scalar(0, "dV_dx_L")
+                dV_dx_R = hcl.scalar(0, "dV_dx_R")
+                dV_dx_L[0], dV_dx_R[0] = spatial_derivative(idx, deriv_dim - 1, V_array, g, accuracy)
+                Deriv_array[idx] = (dV_dx_L[0] + dV_dx_R[0]) / 2
+
+    if generate_SpatDeriv == False:
+        inputs = [V_f, V_init] + xs + [t, l0]
+        if narrowBand:
+            inputs += [band, band_state]
+        if fused:
+            inputs.append(deriv_bounds)
+        if obstacleMode is not None:
+            inputs.append(obstacle)
+        if computeDiff:
+            inputs.append(max_diff)
+        s = hcl.create_schedule(inputs, graph_create)
+
+        ##################### CODE OPTIMIZATION HERE ###########################
+        print("Optimizing\n")
+
+        # Accessing the hamiltonian and dissipation stage
+        if fused:
+            s_H = graph_create.DerivBounds
+            s_D = graph_create.HamiltonianDissipation
+        else:
+            s_H = graph_create.Hamiltonian
+            s_D = graph_create.Dissipation
+
+        # Thread parallelize hamiltonian and dissipation, the fused bounds pre-pass only runs once
+        if not fused:
+            s[s_H].parallel(s_H.i0)
+        s[s_D].parallel(s_D.i0)
+    else:
+        s = hcl.create_schedule([V_init, V_f], returnDerivative)
+
+    # Return executable
+    return hcl.build(s)
+
@@ -0,0 +1,190 @@
+import heterocl as hcl
+from contextlib import ExitStack
+from odp.computeGraphs.CustomGraphFunctions import *
+from odp.computeGraphs.graph_ND import grid_loops, spatial_derivative, store_scalars
+
+########################## N-D slab graph definitions ########################
+# These graphs only hold slab_len rows of the grid along the first axis, padded with
+# halo rows on both sides, so that value functions larger than memory can be swept
+# slab by slab (see odp.out_of_core).
+
+
+def slab_halo(accuracy):
+    """ Number of halo rows needed on each side of a slab for the ENO stencil """
+    return 1 if accuracy == "low" else 2
+
+
+def slab_position(offset, idx, g):
+    """ Global index along the first axis and the axis_range of the slab point idx """
+    pos = offset[0] + idx[0]
+    return pos, (pos, g.pts_each_dim[0] - 1)
+
+
+def slab_derivatives(idx, offset, V, g, accuracy):
+    """ Left and right spatial derivatives of every axis at the slab point idx
+
+    Args:
+        idx (tuple): loop variables of the slab point, without halo
+        offset (hcl.Tensor): global index of the first row of the slab
+        V (hcl.Tensor): slab of the value function padded with halo rows
+        g (Grid): grid object
+        accuracy (str): "low" or "medium"
+    """
+    halo = slab_halo(accuracy)
+    padded_idx = (idx[0] + halo,) + tuple(idx[1:])
+    _, axis_range = slab_position(offset, idx, g)
+    dV_dx_L = [hcl.scalar(0, "dV_dx" + str(d + 1) + "_L") for d in range(g.dims)]
+    dV_dx_R = [hcl.scalar(0, "dV_dx" + str(d + 1) + "_R") for d in range(g.dims)]
+    for d in range(g.dims):
+        dV_dx_L[d][0], dV_dx_R[d][0] = spatial_derivative(padded_idx, d, V, g, accuracy,
+                                                          axis_range if d == 0 else None)
+    return dV_dx_L, dV_dx_R
+
+
+def graph_ND_slab_bounds(my_object, g, slab_len, accuracy):
+    """ Builds the executable computing the derivative bounds of one slab
+
+    The returned executable is called as slab_bounds(V, offset, bounds) where V has
+    slab_len + 2 * halo rows along the first axis, offset holds the global index of the
+    first slab row and bounds (2, N) receives the minimum and maximum derivative of each axis.
+    Rows past the end of the grid are ignored.
+
+    Args:
+        my_object: unused, kept so the builder has the signature expected by cached_executable
+        g (Grid): grid object
+        slab_len (int): number of rows of a slab along the first axis
+        accuracy (str): "low" for first order ENO, "medium" for second order ENO
+    """
+    dims = g.dims
+    halo = slab_halo(accuracy)
+    slab_shape = (slab_len,) + tuple(g.pts_each_dim[1:])
+    V = hcl.placeholder((slab_len + 2 * halo,) + slab_shape[1:], name="V", dtype=hcl.Float())
+    offset = hcl.placeholder((1,), name="offset", dtype=hcl.Int())
+    bounds = hcl.placeholder((2, dims), name="bounds", dtype=hcl.Float())
+
+    def graph_create(V, offset, bounds):
+        max_deriv = [hcl.scalar(-1e9, "max_deriv" + str(d + 1)) for d in range(dims)]
+        min_deriv = [hcl.scalar(1e9, "min_deriv" + str(d + 1)) for d in range(dims)]
+
+        with hcl.Stage("Bounds"):
+            with ExitStack() as loops:
+                idx = grid_loops(loops, slab_shape)
+                pos, _ = slab_position(offset, idx, g)
+                with hcl.if_(pos <= g.pts_each_dim[0] - 1):
+                    dV_dx_L, dV_dx_R = slab_derivatives(idx, offset, V, g, accuracy)
+                    for d in range(dims):
+                        min_deriv[d][0] = my_min(min_deriv[d][0], my_min(dV_dx_L[d][0], dV_dx_R[d][0]))
+                        max_deriv[d][0] = my_max(max_deriv[d][0], my_max(dV_dx_L[d][0], dV_dx_R[d][0]))
+
+            for d in range(dims):
+                bounds[0, d] = min_deriv[d][0]
+                bounds[1, d] = max_deriv[d][0]
+
+    s = hcl.create_schedule([V, offset, bounds], graph_create)
+    s_B = graph_create.Bounds
+    s[s_B].parallel(s_B.i0)
+    return hcl.build(s)
+
+
+# Note that t has 2 elements t1, t2
+def graph_ND_slab_rate(my_object, g, slab_len, accuracy):
+    """ Builds the executable computing the rate of change of V over one slab
+
+    The Hamiltonian and the dissipation are evaluated in a single sweep, the derivative
+    bounds of the whole grid are given as input instead of being reduced in the graph.
+    The returned executable is called as
+    slab_rate(V, x1, ..., xN, t, offset, bounds, rate, max_alpha), where x1, ..., xN span
+    the whole grid, rate has slab_len rows and max_alpha (N,) receives the largest
+    dissipation coefficient of each axis over the slab. The solution advances as
+    V + rate * dt.
+
+    Args:
+        my_object: dynamics object providing opt_ctrl, opt_dstb and dynamics
+        g (Grid): grid object
+        slab_len (int): number of rows of a slab along the first axis
+        accuracy (str): "low" for first order ENO, "medium" for second order ENO
+    """
+    dims = g.dims
+    halo = slab_halo(accuracy)
+    slab_shape = (slab_len,) + tuple(g.pts_each_dim[1:])
+    V = hcl.placeholder((slab_len + 2 * halo,) + slab_shape[1:], name="V", dtype=hcl.Float())
+    xs = [hcl.placeholder((g.pts_each_dim[d],), name="x" + str(d + 1), dtype=hcl.Float())
+          for d in range(dims)]
+    t = hcl.placeholder((2,), name="t", dtype=hcl.Float())
+    offset = hcl.placeholder((1,), name="offset", dtype=hcl.Int())
+    bounds = hcl.placeholder((2, dims), name="bounds", dtype=hcl.Float())
+    rate = hcl.placeholder(slab_shape, name="rate", dtype=hcl.Float())
+    max_alpha_out = hcl.placeholder((dims,), name="max_alpha", dtype=hcl.Float())
+
+    def graph_create(V, *args):
+        x = args[:dims]
+        t, offset, bounds, rate, max_alpha_out = args[dims:]
+
+        max_alpha = [hcl.scalar(-1e9, "max_alpha" + str(d + 1)) for d in range(dims)]
+
+        with hcl.Stage("Rate"):
+            min_derivs = tuple(bounds[0, d] for d in range(dims))
+            max_derivs = tuple(bounds[1, d] for d in range(dims))
+
+            # Same approximation of the disturbance bounds as in graph_ND
+            corner_state = tuple(x[d][0] for d in range(dims))
+            dOptL = store_scalars(my_object.opt_dstb(t, corner_state, min_derivs), "dOptL")
+            dOptU = store_scalars(my_object.opt_dstb(t, corner_state, max_derivs), "dOptU")
+
+            alpha = [hcl.scalar(0, "alpha" + str(d + 1)) for d in range(dims)]
+
+            with ExitStack() as loops:
+                idx = grid_loops(loops, slab_shape)
+                pos, _ = slab_position(offset, idx, g)
+                with hcl.if_(pos <= g.pts_each_dim[0] - 1):
+                    state = (x[0][pos],) + tuple(x[d][idx[d]] for d in range(1, dims))
+                    dV_dx_L, dV_dx_R = slab_derivatives(idx, offset, V, g, accuracy)
+
+                    # Calculate average gradient
+                    dV_dx = [hcl.scalar(0, "dV_dx" + str(d + 1)) for d in range(dims)]
+                    for d in range(dims):
+                        dV_dx[d][0] = (dV_dx_L[d][0] + dV_dx_R[d][0]) / 2
+                    spat_deriv = tuple(dV_dx[d][0] for d in range(dims))
+
+                    # Find optimal control and disturbance
+                    uOpt = my_object.opt_ctrl(t, state, spat_deriv)
+                    dOpt = my_object.opt_dstb(t, state, spat_deriv)
+
+                    # Calculate Hamiltonian terms:
+                    dx_dt = my_object.dynamics(t, state, uOpt, dOpt)
+                    hamiltonian = dx_dt[0] * dV_dx[0][0]
+                    for d in range(1, dims):
+                        hamiltonian = hamiltonian + dx_dt[d] * dV_dx[d][0]
+
+                    # Find LOWER and UPPER BOUND optimal control
+                    uOptL = store_scalars(my_object.opt_ctrl(t, state, min_derivs), "uOptL")
+                    uOptU = store_scalars(my_object.opt_ctrl(t, state, max_derivs), "uOptU")
+
+                    # Calculate alphas from the magnitude of rates of changes
+                    for d in range(dims):
+                        alpha[d][0] = 0
+                    for uOptB in (uOptL, uOptU):
+                        for dOptB in (dOptL, dOptU):
+                            dx_dt = my_object.dynamics(t, state, uOptB, dOptB)
+                            for d in range(dims):
+                                alpha[d][0] = my_max(alpha[d][0], my_abs(dx_dt[d]))
+
+                    diss = hcl.scalar(0, "diss")
+                    for d in range(dims):
+                        diss[0] = diss[0] + (dV_dx_R[d][0] - dV_dx_L[d][0]) * alpha[d][0]
+                    diss[0] = 0.5 * diss[0]
+
+                    rate[idx] = hamiltonian + diss[0]
+
+                    # Get maximum alphas in each dimension
+                    for d in range(dims):
+                        with hcl.if_(alpha[d][0] > max_alpha[d][0]):
+                            max_alpha[d][0] = alpha[d][0]
+
+            for d in range(dims):
+                max_alpha_out[d] = max_alpha[d][0]
+
+    s = hcl.create_schedule([V] + xs + [t, offset, bounds, rate, max_alpha_out], graph_create)
+    s_R = graph_create.Rate
+    s[s_R].parallel(s_R.i0)
+    return hcl.build(s)
@@ -1,21 +1,25 @@
 import numpy as np
 
 
-def find_sign_change(grids, values, state, tau):
+def find_sign_change(grids, values, state, tau, interpolate=False):
     """Finds the positions of the positive and negative transformation of the values.
 
     Args:
     grids (instance): The instance of the class Grid.
-    values (ndarray): The value function with all time slices, shapes like [grid, grid, ..., len(tau)].
+    values (ndarray or LazyValueFunction): The value function with all time slices, shapes like [grid, grid, ..., len(tau)].
     state (tuple): The current state.
     tau (ndarray): All time indices.
+    interpolate (bool): Interpolate the values at the state instead of using the closest grid point.
 
     Returns:
         The two positions (neg2pos, pos2neg) where the transformation happens.
     """
-    current_slices = grids.get_index(state)
-    indices = tuple([idx for idx in current_slices] + [slice(0, len(tau))])
-    current_value = values[indices]
+    if interpolate:
+        current_value = grids.interpolate(values, state)[0][:len(tau)]
+    else:
+        current_slices = grids.get_index(state)
+        indices = tuple([idx for idx in current_slices] + [slice(0, len(tau))])
+        current_value = values[indices]
     neg_values = (current_value<=0).astype(int) 
     checklist = neg_values - np.append(neg_values[1:], neg_values[-1])
     return np.where(checklist==1)[0], np.where(checklist==-1)[0]
@@ -97,15 +101,20 @@ def next_position(dynamics, current_state, u, d, tstep):
     return next_state
 
 
-def compute_opt_traj(dynamics, grids, values_all, tau, state):
+def compute_opt_traj(dynamics, grids, values_all, tau, state, interpolate=False, grad_table=None):
     """Computes the trajectory, optimal controls and disturbances to the BRT based on the dynamics in the length of time slices.
 
     Args:
         dynamics (instance): The instance of the given dynamics.
         grids (instance): The instance of the class Grid.
-        values_all (ndarray): The value function with all time slices, in the shape of [grid, grid, ..., len(tau)].
+        values_all (ndarray or LazyValueFunction): The value function with all time slices, in the shape of [grid, grid, ..., len(tau)].
+            A LazyValueFunction returned by HJSolver(..., save_dir=...) is only read at the slices that are used.
         tau (ndarray): All time indices.
         state (tuple): The current state.
+        interpolate (bool): Interpolate the values and their gradients multilinearly at the current state
+            instead of using the closest grid point, which keeps coarse grids accurate.
+        grad_table (GradientTable): the precomputed gradients of all time slices of values_all, such as
+            MRAG.gradient_tables.GradientTable, looked up instead of differentiating the values at every step.
     
     Returns:
         traj (list): The trajectory of the agent.
@@ -129,12 +138,12 @@ def compute_opt_traj(dynamics, grids, values_all, tau, state):
     v_log = []
     n2p_log = []
 
-    current_value = grids.get_value(values_all[..., 0], current_state) # here check whether the initial position is in the RAS V[..., 0]
+    current_value = grids.get_value(values_all[..., 0], current_state, interpolate) # here check whether the initial position is in the RAS V[..., 0]
     if current_value > 0:  
         values_all = values_all - current_value
     
     # calculate the time slice where the value changes from positive to negative
-    negToPos, posToNeg = find_sign_change(grids, values_all, current_state, tau) 
+    negToPos, posToNeg = find_sign_change(grids, values_all, current_state, tau, interpolate) 
     t_earliest = negToPos 
 
     for iter in range(0, len(tau)):
@@ -143,18 +152,18 @@ def compute_opt_traj(dynamics, grids, values_all, tau, state):
             traj[iter] = np.array(current_state)  # before reaches the edge, the agent keeps still
             t.append(tau[iter])
             t_earlist_log.append(t_earliest)
-            v_log.append(grids.get_value(values_all[..., iter], current_state))
+            v_log.append(grids.get_value(values_all[..., iter], current_state, interpolate))
             n2p_log.append(negToPos)
             opt_u.append(0)
             continue  # control=0
         
         # we should apply the control inputs to the agent
-        negToPos, posToNeg = find_sign_change(grids, values_all, current_state, tau)
+        negToPos, posToNeg = find_sign_change(grids, values_all, current_state, tau, interpolate)
         n2p_log.append(negToPos)
 
         if negToPos.size != 0:
             # the agent has not arrived at the target
-            current_value = grids.get_value(values_all[..., iter], current_state)
+            current_value = grids.get_value(values_all[..., iter], current_state, interpolate)
             if current_value <= 0:  # the agent is within the BRT/BRS
                 for value in negToPos:
                     if value >= iter:
@@ -172,9 +181,14 @@ def compute_opt_traj(dynamics, grids, values_all, tau, state):
             if t_next > values_all.shape[-1] - 1:
                 t_next = values_all.shape[-1] - 1
 
-            # calculate the control inputs
-            values = values_all[..., [t_earliest]]
-            spat_deriv_vector = spa_deriv(grids.get_index(current_state), values, grids)
+            # calculate the control inputs, shifting the values does not change their gradient
+            if grad_table is not None:
+                spat_deriv_vector = grad_table.lookup(grids, current_state, t_earliest)
+            elif interpolate:
+                spat_deriv_vector = list(grids.interpolate_gradient(values_all[..., t_earliest], current_state)[0])
+            else:
+                values = values_all[..., [t_earliest]]
+                spat_deriv_vector = spa_deriv(grids.get_index(current_state), values, grids)
             current_u = dynamics.optCtrl_inPython(spat_deriv_vector)
             current_d = dynamics.optDstb_inPython(spat_deriv_vector)
             opt_u.append(current_u)
@@ -184,7 +198,7 @@ def compute_opt_traj(dynamics, grids, values_all, tau, state):
             next_state = next_position(dynamics, current_state, current_u, current_d, dt)
             current_state = next_state
             t_earlist_log.append(t_earliest)
-            v_log.append(grids.get_value(values_all[..., iter], current_state))
+            v_log.append(grids.get_value(values_all[..., iter], current_state, interpolate))
             if iter != values_all.shape[-1]:
                 traj[iter] = np.array(current_state)
         else:  
@@ -0,0 +1,140 @@
+import numpy as np
+
+from odp.solver import HJSolver
+
+""" Decoupled value functions of multi-agent games
+
+When the joint dynamics decouple into subsystems, e.g. a 1 vs 2 game into the 1 vs 1 games of
+the attacker against each defender, the joint value function can be approximated from the
+value functions of the subsystems, which are much smaller to solve and to store. A
+DecomposedValueFunction keeps only the subsystem values and assembles the joint value at the
+queried states:
+    combine="max": V(x) = max_k V_k(x_k), the joint sublevel set is the intersection of the
+                   subsystem sets, e.g. the attacker escapes only if it escapes every defender
+    combine="min": V(x) = min_k V_k(x_k), the union of the subsystem sets
+
+Example, the 1 vs 2 game of the joint state (a1x, a1y, d1x, d1y, d2x, d2y) from a 1 vs 1 value:
+    V1vs2 = DecomposedValueFunction([Subsystem([0, 1, 2, 3], grid1vs1, value1vs1),
+                                     Subsystem([0, 1, 4, 5], grid1vs1, value1vs1)],
+                                    joint_grid=grid1vs2, combine="max")
+It indexes like the (grid1vs2-shaped) monolithic value function, so it can be passed to the
+MRAG judges instead of it.
+"""
+
+COMBINE = {"max": np.maximum, "min": np.minimum}
+
+
+class Subsystem:
+    def __init__(self, state_dims, grid, value):
+        """ Value function of a subsystem of the joint state
+
+        Args:
+            state_dims (list): the dimensions of the joint state this subsystem is defined on,
+                in the order of the axes of grid
+            grid (Grid): grid of the subsystem
+            value (np.ndarray): value function of the subsystem, optionally with time slices
+        """
+        assert len(state_dims) == grid.dims
+        self.state_dims = list(state_dims)
+        self.grid = grid
+        self.value = value
+
+    def evaluate(self, states, interpolate=False):
+        """ Value of the subsystem at many joint states
+
+        Args:
+            states (np.ndarray, (num_states, joint dims)): joint states
+            interpolate (bool, optional): interpolate multilinearly instead of taking the closest
+                grid point. Defaults to False.
+        """
+        sub_states = np.atleast_2d(states)[:, self.state_dims]
+        if interpolate:
+            return self.grid.interpolate(self.value, sub_states)
+        return np.asarray(self.value[tuple(self.grid.get_indices(sub_states).T)])
+
+
+class DecomposedValueFunction:
+    def __init__(self, subsystems, joint_grid=None, combine="max"):
+        """ Joint value function assembled from subsystem values at query time
+
+        Args:
+            subsystems (list): the Subsystem of each decoupled part of the joint state
+            joint_grid (Grid, optional): grid of the joint state, needed to index the value function
+                by joint grid indices like a monolithic one. Defaults to None.
+            combine (str, optional): "max" or "min", see the module description. Defaults to "max".
+        """
+        if combine not in COMBINE:
+            raise ValueError("Unsupported combine {}, expected 'max' or 'min'".format(combine))
+        self.subsystems = subsystems
+        self.joint_grid = joint_grid
+        self.combine = combine
+
+    @property
+    def shape(self):
+        return tuple(int(n) for n in self.joint_grid.pts_each_dim)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def evaluate(self, states, interpolate=False):
+        """ Joint value at many states
+
+        Args:
+            states (np.ndarray, (num_states, joint dims)): joint states
+            interpolate (bool, optional): interpolate the subsystem values. Defaults to False.
+
+        Returns:
+            np.ndarray, (num_states,): the joint value of each state
+        """
+        return COMBINE[self.combine].reduce([s.evaluate(states, interpolate) for s in self.subsystems])
+
+    def get_value(self, state, interpolate=False):
+        """ Joint value at one state, like Grid.get_value of a monolithic value function """
+        return self.evaluate(np.asarray(state, dtype=float)[np.newaxis], interpolate)[0]
+
+    def __getitem__(self, key):
+        """ Joint value at joint grid indices
+
+        key holds one integer or integer array per joint dimension, the arrays are broadcast
+        against each other like numpy advanced indexing. Slices select whole axes and may only be
+        combined with integers.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) != self.ndim:
+            raise IndexError("expected {} indices, got {}".format(self.ndim, len(key)))
+        if any(isinstance(k, slice) for k in key):
+            if any(isinstance(k, np.ndarray) for k in key):
+                raise IndexError("slices can not be combined with index arrays")
+            axes = [np.arange(n)[k] for n, k in zip(self.shape, key)]
+            key = np.ix_(*[np.atleast_1d(a) for a in axes])
+            squeeze = tuple(d for d, k in enumerate(axes) if np.ndim(k) == 0)
+        else:
+            squeeze = ()
+        index = np.broadcast_arrays(*[np.asarray(k) for k in key])
+        states = np.stack([self.joint_grid.grid_points[d][index[d].reshape(-1)]
+                           for d in range(self.ndim)], axis=1)
+        values = self.evaluate(states)
+        values = values.reshape(index[0].shape + values.shape[1:])
+        return np.squeeze(values, axis=squeeze) if squeeze else values
+
+
+def solve_decomposed(subsystems, tau, compMethod, plot_option, joint_grid=None, combine="max", **kwargs):
+    """ Solves every subsystem with HJSolver and returns the assembled value function
+
+    Args:
+        subsystems (list): (dynamics_obj, grid, multiple_value, state_dims) of each subsystem, see Subsystem
+        tau, compMethod, plot_option: as for HJSolver, shared by all subsystems
+        joint_grid (Grid, optional): grid of the joint state. Defaults to None.
+        combine (str, optional): "max" or "min". Defaults to "max".
+        kwargs: other HJSolver arguments, e.g. untilConvergent or accuracy
+
+    Returns:
+        DecomposedValueFunction: the joint value function
+    """
+    solved = []
+    for dynamics_obj, grid, multiple_value, state_dims in subsystems:
+        value = HJSolver(dynamics_obj, grid, multiple_value, tau, compMethod, plot_option, **kwargs)
+        solved.append(Subsystem(state_dims, grid, value))
+    return DecomposedValueFunction(solved, joint_grid, combine)
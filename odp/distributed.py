@@ -0,0 +1,373 @@
+import heterocl as hcl
+import multiprocessing
+import numpy as np
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+from odp.computeGraphs import cached_executable
+from odp.computeGraphs.graph_ND_slab import graph_ND_slab_bounds, graph_ND_slab_rate, slab_halo
+from odp.out_of_core import integrate_slab
+from odp.time_varying import TimeSlices
+from odp.value_store import ValueFunctionWriter
+
+""" Distributed HJ PDE solver
+
+The grid is partitioned along its first axis into contiguous blocks of rows, one per worker
+process. Each worker keeps its block padded with halo rows (1 for first order ENO, 2 for second
+order) and, every substep:
+    - exchanges its boundary rows with the neighbouring workers to refresh the halos
+    - reduces the derivative bounds of its block, combined over all workers
+    - evaluates the rate of change of its block, combining the dissipation coefficients over all
+      workers so that everyone takes the same CFL step
+    - integrates its block and, with untilConvergent, agrees on convergence with the others
+The reductions go through worker 0, which also gathers the result.
+
+On one machine, HJSolver(..., num_workers=4) starts the workers as local processes. Across
+machines, every node runs the same script and calls HJSolverDistributedWorker with its rank:
+    comm = connect_workers(rank, [("node0", 6000), ("node1", 6000)], authkey=b"secret")
+    V = HJSolverDistributedWorker(comm, dynamics, grid, [target, obstacle], tau, compMethods)
+V is the value function on rank 0 and None on the other ranks.
+"""
+
+# Seconds a worker keeps retrying to reach the listener of another worker
+CONNECT_TIMEOUT = 60
+
+
+def partition_rows(n0, num_workers):
+    """ Splits the n0 rows of the first axis into num_workers contiguous [start, stop) blocks """
+    bounds = np.linspace(0, n0, num_workers + 1).round().astype(int)
+    return [(int(bounds[r]), int(bounds[r + 1])) for r in range(num_workers)]
+
+
+def worker_links(num_workers, periodic):
+    """ Pairs of workers that communicate: the neighbours along the first axis and worker 0 with everyone """
+    links = set()
+    for r in range(1, num_workers):
+        links.add((r - 1, r))
+        links.add((0, r))
+    if periodic and num_workers > 2:
+        links.add((0, num_workers - 1))
+    return sorted(links)
+
+
+class Communicator:
+    def __init__(self, rank, size, connections):
+        """ Point-to-point and collective communication between the workers
+
+        Args:
+            rank (int): index of this worker
+            size (int): number of workers
+            connections (dict): multiprocessing Connection to each linked worker, see worker_links
+        """
+        self.rank = rank
+        self.size = size
+        self.connections = connections
+
+    def exchange(self, messages):
+        """ Sends messages[peer] to every peer and returns the message received from each of them
+
+        The sends run in threads, so that two workers sending large halos to each other do not
+        block on full pipes.
+        """
+        received = {}
+        threads = []
+        for peer, message in messages.items():
+            if peer == self.rank:
+                received[peer] = message
+                continue
+            thread = threading.Thread(target=self.connections[peer].send, args=(message,))
+            thread.start()
+            threads.append(thread)
+        for peer in messages:
+            if peer != self.rank:
+                received[peer] = self.connections[peer].recv()
+        for thread in threads:
+            thread.join()
+        return received
+
+    def gather(self, value):
+        """ Returns the values of all workers in rank order on worker 0, None on the others """
+        if self.rank != 0:
+            self.connections[0].send(value)
+            return None
+        return [value] + [self.connections[r].recv() for r in range(1, self.size)]
+
+    def allreduce(self, value, op):
+        """ Combines value over all workers with the binary function op, e.g. np.maximum """
+        values = self.gather(value)
+        if self.rank != 0:
+            return self.connections[0].recv()
+        result = values[0]
+        for v in values[1:]:
+            result = op(result, v)
+        for r in range(1, self.size):
+            self.connections[r].send(result)
+        return result
+
+    def close(self):
+        for connection in self.connections.values():
+            connection.close()
+
+
+def connect_workers(rank, addresses, authkey, timeout=CONNECT_TIMEOUT):
+    """ Connects this worker to the others over TCP, for a solve across several machines
+
+    Every worker listens on its own address and connects to the listeners of the linked workers
+    of lower rank, so the connections are established without deadlock in any start order.
+
+    Args:
+        rank (int): index of this worker
+        addresses (list): (host, port) of every worker, in rank order
+        authkey (bytes): shared secret authenticating the workers, the messages are pickled
+        timeout (float, optional): seconds to wait for the other workers. Defaults to CONNECT_TIMEOUT.
+
+    Returns:
+        Communicator: the communicator of this worker
+    """
+    size = len(addresses)
+    # The link between the first and the last worker is only used if the first axis is periodic
+    links = [pair for pair in worker_links(size, periodic=True) if rank in pair]
+    connections = {}
+    with Listener(tuple(addresses[rank]), authkey=authkey) as listener:
+        for low, high in links:
+            if high == rank:
+                deadline = time.time() + timeout
+                while True:
+                    try:
+                        connection = Client(tuple(addresses[low]), authkey=authkey)
+                        break
+                    except ConnectionRefusedError:
+                        if time.time() > deadline:
+                            raise
+                        time.sleep(0.5)
+                connection.send(rank)
+                connections[low] = connection
+        for _ in range(sum(1 for low, _ in links if low == rank)):
+            connection = listener.accept()
+            connections[connection.recv()] = connection
+    return Communicator(rank, size, connections)
+
+
+def HJSolverDistributedWorker(comm, dynamics_obj, grid, multiple_value, tau, compMethod,
+                              accuracy="low", untilConvergent=False, epsilon=2e-3, use_cache=True,
+                              saveAllTimeSteps=False, save_dir=None):
+    """ Solves the HJ PDE for the rows of the grid owned by one worker
+
+    Every worker calls this function with the same arguments apart from comm. The target and
+    obstacle sets may be given in any form accepted by HJSolver, only the rows of the worker are
+    read from them.
+
+    Args:
+        comm (Communicator): communicator of this worker
+        dynamics_obj: dynamics object providing opt_ctrl, opt_dstb and dynamics
+        grid (Grid): grid object
+        multiple_value: target, or [target, constraint]
+        tau (np.ndarray): time horizon
+        compMethod (dict): TargetSetMode and optionally ObstacleSetMode
+        accuracy (str, optional): "low" or "medium". Defaults to "low".
+        untilConvergent (bool, optional): stop once V changes less than epsilon. Defaults to False.
+        epsilon (float, optional): convergence threshold. Defaults to 2e-3.
+        use_cache (bool, optional): reuse compiled executables. Defaults to True.
+        saveAllTimeSteps (bool, optional): return V at every tau like HJSolver. Defaults to False.
+        save_dir (str, optional): with saveAllTimeSteps, worker 0 streams the time slices to this directory
+            and returns a LazyValueFunction like HJSolver. Defaults to None, kept in memory.
+
+    Returns:
+        np.ndarray: the value function on worker 0, None on the other workers
+    """
+    if type(multiple_value) == list:
+        target = multiple_value[0]
+        constraint = multiple_value[1]
+    else:
+        target = multiple_value
+        constraint = None
+
+    hcl.init()
+    hcl.config.init_dtype = hcl.Float(32)
+
+    shape = tuple(int(n) for n in grid.pts_each_dim)
+    dims = grid.dims
+    halo = slab_halo(accuracy)
+    periodic = 0 in grid.pDim
+    start, stop = partition_rows(shape[0], comm.size)[comm.rank]
+    rows = stop - start
+    if rows < halo:
+        raise ValueError("Every worker needs at least {} rows of the first axis, {} rows are too few for {} workers"
+                         .format(halo, shape[0], comm.size))
+
+    # Neighbours along the first axis, None at the grid boundary
+    left = comm.rank - 1 if comm.rank > 0 else (comm.size - 1 if periodic else None)
+    right = comm.rank + 1 if comm.rank < comm.size - 1 else (0 if periodic else None)
+
+    target_slices = TimeSlices(target, dims)
+    if constraint is not None:
+        constraint_slices = TimeSlices(constraint, dims)
+        constraint_i = np.asarray(constraint_slices(0)[start:stop], dtype=np.float32)
+    target_mode = compMethod["TargetSetMode"] in ("minVWithVTarget", "maxVWithVTarget")
+
+    # Block of V padded with halo rows, the halos outside of a non periodic grid stay zero
+    V = np.zeros((rows + 2 * halo,) + shape[1:], dtype=np.float32)
+    V[halo:-halo] = target_slices(0)[start:stop]
+    if constraint is not None:
+        V[halo:-halo] = np.maximum(V[halo:-halo], -constraint_i)
+    l0 = np.asarray(target_slices(0)[start:stop], dtype=np.float32) if target_mode else V[halo:-halo].copy()
+
+    def gather_value():
+        blocks = comm.gather(V[halo:-halo].copy())
+        return None if blocks is None else np.concatenate(blocks)
+
+    # The time slices are gathered on worker 0, which keeps or streams them like HJSolver
+    if saveAllTimeSteps is True:
+        initial = gather_value()
+        if initial is not None:
+            if save_dir is None:
+                valfuncs = np.zeros(shape + (len(tau),), dtype=np.float32)
+
+                def save_slice(index, value):
+                    valfuncs[..., index] = value
+            else:
+                writer = ValueFunctionWriter(save_dir, grid.pts_each_dim, len(tau))
+                save_slice = writer.write
+                valfuncs = writer.values()
+            save_slice(-1, initial)
+
+    def exchange_halos():
+        messages = {}
+        if left is not None:
+            messages.setdefault(left, {})["right"] = V[halo:2 * halo].copy()
+        if right is not None:
+            messages.setdefault(right, {})["left"] = V[-2 * halo:-halo].copy()
+        for message in comm.exchange(messages).values():
+            if "left" in message:
+                V[:halo] = message["left"]
+            if "right" in message:
+                V[-halo:] = message["right"]
+
+    # Array for each state values, converted to hcl array type
+    list_xs = [hcl.asarray(np.reshape(grid.vs[d], grid.pts_each_dim[d])) for d in range(dims)]
+    offset = hcl.asarray(np.array([start]), dtype=hcl.Int())
+
+    # Get executables
+    slab_bounds = cached_executable(graph_ND_slab_bounds, None, grid, rows, accuracy, use_cache=use_cache)
+    slab_rate = cached_executable(graph_ND_slab_rate, dynamics_obj, grid, rows, accuracy, use_cache=use_cache)
+
+    execution_time = 0
+    tNow = tau[0]
+    if comm.rank == 0:
+        print("Started running on {} workers\n".format(comm.size))
+    for i in range(1, len(tau)):
+        t_minh = hcl.asarray(np.array((tNow, tau[i])))
+        if constraint is not None and constraint_slices.varying:
+            constraint_i = np.asarray(constraint_slices(i)[start:stop], dtype=np.float32)
+        if target_mode and target_slices.varying:
+            l0 = np.asarray(target_slices(i)[start:stop], dtype=np.float32)
+
+        while tNow <= tau[i] - 1e-4:
+            start_time = time.time()
+            exchange_halos()
+            V_slab = hcl.asarray(V)
+
+            # Derivative bounds over the whole grid, the maxima are negated to reduce both with np.minimum
+            bounds = hcl.asarray(np.zeros((2, dims)))
+            slab_bounds(V_slab, offset, bounds)
+            bounds = bounds.asnumpy()
+            bounds = comm.allreduce(np.stack([bounds[0], -bounds[1]]), np.minimum)
+            bounds[1] = -bounds[1]
+
+            # Rate of change of the block, and the CFL step shared by all workers
+            rate = hcl.asarray(np.zeros((rows,) + shape[1:]))
+            max_alpha = hcl.asarray(np.zeros(dims))
+            slab_rate(V_slab, *list_xs, t_minh, offset, hcl.asarray(bounds), rate, max_alpha)
+            max_alpha = comm.allreduce(max_alpha.asnumpy(), np.maximum)
+            delta_t = min(0.8 / np.sum(max_alpha / np.asarray(grid.dx)), tau[i] - tNow)
+
+            # Integrate and apply the target and obstacle sets
+            V_old = V[halo:-halo].copy()
+            V[halo:-halo] = integrate_slab(V_old, rate.asnumpy(), delta_t, compMethod, l0,
+                                           constraint_i if constraint is not None else None)
+            tNow += delta_t
+
+            execution_time += time.time() - start_time
+            if comm.rank == 0:
+                print("t = {:.5f}".format(tNow))
+                print("Computational time to integrate (s): {:.5f}".format(time.time() - start_time))
+
+            if untilConvergent is True:
+                diff = comm.allreduce(float(np.amax(np.abs(V[halo:-halo] - V_old))), max)
+                if comm.rank == 0:
+                    print("Max difference between V_old and V_new : {:.5f}".format(diff))
+                if diff < epsilon:
+                    if comm.rank == 0:
+                        print("Result converged ! Exiting the compute loop. Have a good day.")
+                    break
+        else:
+            if saveAllTimeSteps is True:
+                value = gather_value()
+                if value is not None:
+                    save_slice(-1 - i, value)
+            continue
+        break
+
+    if comm.rank == 0:
+        print("Total kernel time (s): {:.5f}".format(execution_time))
+        print("Finished solving\n")
+
+    value = gather_value()
+    if saveAllTimeSteps is True:
+        if value is None:
+            return None
+        save_slice(0, value)
+        return valfuncs
+    return value
+
+
+def _local_worker(rank, num_workers, connections, args, kwargs):
+    comm = Communicator(rank, num_workers, connections)
+    try:
+        HJSolverDistributedWorker(comm, *args, **kwargs)
+    finally:
+        comm.close()
+
+
+def HJSolverDistributed(dynamics_obj, grid, multiple_value, tau, compMethod, num_workers, **kwargs):
+    """ Solves the HJ PDE with num_workers local processes, see HJSolverDistributedWorker
+
+    The calling process acts as worker 0 and returns the value function.
+    """
+    pipes = {pair: multiprocessing.Pipe() for pair in worker_links(num_workers, 0 in grid.pDim)}
+
+    def connections_of(rank):
+        connections = {}
+        for (low, high), (low_end, high_end) in pipes.items():
+            if rank == low:
+                connections[high] = low_end
+            elif rank == high:
+                connections[low] = high_end
+        return connections
+
+    args = (dynamics_obj, grid, multiple_value, tau, compMethod)
+    processes = [multiprocessing.Process(target=_local_worker,
+                                         args=(rank, num_workers, connections_of(rank), args, kwargs))
+                 for rank in range(1, num_workers)]
+    for process in processes:
+        process.start()
+
+    # Only keep the ends of worker 0, so that a failing worker closes its pipes
+    connections = connections_of(0)
+    for ends in pipes.values():
+        for end in ends:
+            if end not in connections.values():
+                end.close()
+
+    comm = Communicator(0, num_workers, connections)
+    try:
+        V = HJSolverDistributedWorker(comm, *args, **kwargs)
+    finally:
+        comm.close()
+        for process in processes:
+            process.join()
+    failed = [rank for rank, process in enumerate(processes, 1) if process.exitcode != 0]
+    if failed:
+        raise RuntimeError("Workers {} of the distributed solve failed".format(failed))
+    return V
@@ -2,6 +2,8 @@ import heterocl as hcl
 import math
 import numpy as np
 
+from odp.Shapes.ShapeExpressions import Capture
+
 """ 4D 1v1 AttackerDefender DYNAMICS IMPLEMENTATION 
  xA1_dot = vA * u1
  xA2_dot = vA * u2
@@ -169,14 +171,12 @@ class AttackerDefender4D:
         return opt_a, opt_w
 
     def capture_set(self, grid, capture_radius, mode):
-        # using meshgrid
-        xa, ya, xd, yd = np.meshgrid(grid.grid_points[0], grid.grid_points[1],
-                                     grid.grid_points[2], grid.grid_points[3], indexing='ij')
-        data = np.power(xa - xd, 2) + np.power(ya - yd, 2)
+        # evaluated in one float32 pass, without the four meshgrid arrays
+        capture = Capture([0, 1], [2, 3], capture_radius)
         if mode == "capture":
-            return np.sqrt(data) - capture_radius
+            return capture.evaluate(grid)
         if mode == "escape":
-            return capture_radius - np.sqrt(data)
+            return (~capture).evaluate(grid)
         # this function is the distance between 1 attacker and 1 defender
         # data = np.zeros(grid.pts_each_dim)
         #
@@ -0,0 +1,47 @@
+import numpy as np
+
+from odp.value_store import grid_meta, grid_from_meta
+
+""" Helpers for solving the HJ PDE from coarse to fine grids
+
+HJSolver(..., resolutions=[...]) first solves on coarser versions of the grid, prolongates each
+converged value function to the next resolution by multilinear interpolation and continues the
+solve from there, until the zero level set stops changing between two resolutions.
+"""
+
+# Number of grid points interpolated at once when resampling
+RESAMPLE_CHUNK = 2**20
+
+
+def grid_at_resolution(grid, pts_each_dim):
+    """ Returns a grid spanning the same domain as grid with pts_each_dim points per dimension """
+    meta = grid_meta(grid)
+    meta["pts_each_dim"] = [int(n) for n in pts_each_dim]
+    return grid_from_meta(meta)
+
+
+def resample(V, from_grid, to_grid):
+    """ Interpolates V, defined on from_grid, at the nodes of to_grid
+
+    Args:
+        V (np.array): array whose first axes have the shape of from_grid, e.g. a value function or
+            a target set, optionally followed by further axes such as time slices
+        from_grid (Grid): the grid of V
+        to_grid (Grid): the grid of the result, spanning the same domain
+
+    Returns:
+        np.array: float32 array with the shape of to_grid, followed by the further axes of V
+    """
+    shape = tuple(int(n) for n in to_grid.pts_each_dim)
+    out = np.empty(shape + V.shape[from_grid.dims:], dtype=np.float32)
+    flat = out.reshape((-1,) + V.shape[from_grid.dims:])
+    for start in range(0, len(flat), RESAMPLE_CHUNK):
+        index = np.unravel_index(np.arange(start, min(start + RESAMPLE_CHUNK, len(flat))), shape)
+        states = np.stack([to_grid.grid_points[d][index[d]] for d in range(to_grid.dims)], axis=1)
+        flat[start:start + len(states)] = from_grid.interpolate(V, states)
+    return out
+
+
+def level_set_change(V_new, V_old):
+    """ Fraction of the grid nodes on which the zero sublevel sets of V_new and V_old differ """
+    return float(np.mean((V_new <= 0) != (V_old <= 0)))
@@ -0,0 +1,219 @@
+import heterocl as hcl
+import numpy as np
+import os
+import time
+
+from odp.computeGraphs import cached_executable
+from odp.computeGraphs.graph_ND_slab import graph_ND_slab_bounds, graph_ND_slab_rate, slab_halo
+from odp.time_varying import TimeSlices
+
+""" Out-of-core HJ PDE solver
+
+The value function, its update and the target are stored as memory-mapped .npy files and swept
+in slabs of slab_size rows along the first axis, so that only a few slabs have to fit in memory.
+Each substep makes three sweeps over the grid: the first reduces the derivative bounds needed for
+the dissipation, the second evaluates the rate of change of V slab by slab and the third
+integrates it with the time step allowed by the CFL condition.
+"""
+
+
+def open_value_array(memmap_dir, name, shape):
+    """ Creates a float32 .npy file of the given shape under memmap_dir and returns it as a memmap """
+    return np.lib.format.open_memmap(os.path.join(memmap_dir, name + ".npy"), mode="w+",
+                                     dtype=np.float32, shape=shape)
+
+
+def read_slab(V, start, slab_size, halo, periodic):
+    """ Returns rows [start - halo, start + slab_size + halo) of V as an in-memory array
+
+    Rows outside the grid wrap around if the first axis is periodic, and are zero otherwise
+    (they never take part in a derivative).
+    """
+    n0 = V.shape[0]
+    rows = np.arange(start - halo, start + slab_size + halo)
+    if periodic:
+        return np.asarray(V[rows % n0], dtype=np.float32)
+    slab = np.zeros((len(rows),) + V.shape[1:], dtype=np.float32)
+    valid = (rows >= 0) & (rows < n0)
+    slab[valid] = V[rows[valid]]
+    return slab
+
+
+def integrate_slab(V_old, rate, delta_t, compMethod, l0, constraint=None):
+    """ Advances V_old by rate * delta_t and applies the target and obstacle sets
+
+    Args:
+        V_old (np.ndarray): rows of the value function
+        rate (np.ndarray): rate of change of the same rows
+        delta_t (float): time step
+        compMethod (dict): TargetSetMode and optionally ObstacleSetMode
+        l0 (np.ndarray): rows of the target set, or of the initial value
+        constraint (np.ndarray, optional): rows of the obstacle set. Defaults to None.
+
+    Returns:
+        np.ndarray: the updated rows
+    """
+    V_new = V_old + rate * delta_t
+    mode = compMethod["TargetSetMode"]
+    if mode in ("maxVWithV0", "maxVWithVTarget"):
+        V_new = np.maximum(V_new, l0)
+    elif mode in ("minVWithV0", "minVWithVTarget"):
+        V_new = np.minimum(V_new, l0)
+    elif mode == "maxVWithVInit":
+        V_new = np.maximum(V_new, V_old)
+    elif mode == "minVWithVInit":
+        V_new = np.minimum(V_new, V_old)
+
+    if constraint is not None and "ObstacleSetMode" in compMethod:
+        if compMethod["ObstacleSetMode"] == "maxVWithObstacle":
+            V_new = np.maximum(V_new, -constraint)
+        elif compMethod["ObstacleSetMode"] == "minVWithObstacle":
+            V_new = np.minimum(V_new, -constraint)
+    return V_new
+
+
+def HJSolverOutOfCore(dynamics_obj, grid, multiple_value, tau, compMethod, memmap_dir,
+                      slab_size=8, accuracy="low", untilConvergent=False, epsilon=2e-3, use_cache=True,
+                      writer=None):
+    """ Solves the HJ PDE like HJSolver, keeping the value function in memory-mapped files
+
+    Args:
+        dynamics_obj: dynamics object providing opt_ctrl, opt_dstb and dynamics
+        grid (Grid): grid object
+        multiple_value: target, or [target, constraint]. Both may be np.memmap, or time slices as accepted
+            by HJSolver, see odp.time_varying
+        tau (np.ndarray): time horizon
+        compMethod (dict): TargetSetMode and optionally ObstacleSetMode
+        memmap_dir (str): directory of the memory-mapped files, created if it does not exist
+        slab_size (int, optional): rows of the first axis processed at once. Defaults to 8.
+        accuracy (str, optional): "low" or "medium". Defaults to "low".
+        untilConvergent (bool, optional): stop once V changes less than epsilon. Defaults to False.
+        epsilon (float, optional): convergence threshold. Defaults to 2e-3.
+        use_cache (bool, optional): reuse compiled executables. Defaults to True.
+        writer (ValueFunctionWriter, optional): receives V at every tau, stored as slice -1-i like
+            saveAllTimeSteps does. Defaults to None.
+
+    Returns:
+        np.memmap: value function at the end of the horizon, backed by a file in memmap_dir
+    """
+    if type(multiple_value) == list:
+        target = multiple_value[0]
+        constraint = multiple_value[1]
+    else:
+        target = multiple_value
+        constraint = None
+
+    hcl.init()
+    hcl.config.init_dtype = hcl.Float(32)
+
+    print("Initializing\n")
+    os.makedirs(memmap_dir, exist_ok=True)
+    shape = tuple(int(n) for n in grid.pts_each_dim)
+    n0 = shape[0]
+    dims = grid.dims
+    halo = slab_halo(accuracy)
+    slab_size = min(slab_size, n0)
+    starts = range(0, n0, slab_size)
+    periodic = 0 in grid.pDim
+
+    target_slices = TimeSlices(target, dims)
+    target = target_slices(0)
+    if constraint is not None:
+        obstacle = TimeSlices(constraint, dims)
+
+    V_0 = open_value_array(memmap_dir, "V_0", shape)
+    V_1 = open_value_array(memmap_dir, "V_1", shape)
+    target_mode = compMethod["TargetSetMode"] in ("minVWithVTarget", "maxVWithVTarget")
+    l0 = target if target_mode else open_value_array(memmap_dir, "l0", shape)
+    for s in starts:
+        init = np.asarray(target[s:s + slab_size], dtype=np.float32)
+        if constraint is not None:
+            init = np.maximum(init, -np.asarray(obstacle(0)[s:s + slab_size]))
+        V_0[s:s + slab_size] = init
+        if not target_mode:
+            l0[s:s + slab_size] = init
+
+    if writer is not None:
+        writer.write(-1, V_0)
+
+    # Array for each state values, converted to hcl array type
+    list_xs = [hcl.asarray(np.reshape(grid.vs[d], grid.pts_each_dim[d])) for d in range(dims)]
+
+    # Get executables
+    slab_bounds = cached_executable(graph_ND_slab_bounds, None, grid, slab_size, accuracy,
+                                    use_cache=use_cache)
+    slab_rate = cached_executable(graph_ND_slab_rate, dynamics_obj, grid, slab_size, accuracy,
+                                  use_cache=use_cache)
+
+    def offset_of(s):
+        return hcl.asarray(np.array([s]), dtype=hcl.Int())
+
+    execution_time = 0
+    tNow = tau[0]
+    print("Started running\n")
+    for i in range(1, len(tau)):
+        t_minh = hcl.asarray(np.array((tNow, tau[i])))
+        constraint_i = obstacle(i) if constraint is not None else None
+        if target_mode and target_slices.varying:
+            l0 = target_slices(i)
+
+        while tNow <= tau[i] - 1e-4:
+            start = time.time()
+
+            # Sweep 1: derivative bounds over the whole grid
+            bounds = np.array([[1e9] * dims, [-1e9] * dims], dtype=np.float32)
+            for s in starts:
+                bounds_s = hcl.asarray(np.zeros((2, dims)))
+                slab_bounds(hcl.asarray(read_slab(V_0, s, slab_size, halo, periodic)), offset_of(s), bounds_s)
+                bounds_s = bounds_s.asnumpy()
+                bounds[0] = np.minimum(bounds[0], bounds_s[0])
+                bounds[1] = np.maximum(bounds[1], bounds_s[1])
+
+            # Sweep 2: rate of change, stored in V_1
+            bounds = hcl.asarray(bounds)
+            max_alpha = np.full(dims, -1e9)
+            for s in starts:
+                rate = hcl.asarray(np.zeros((slab_size,) + shape[1:]))
+                max_alpha_s = hcl.asarray(np.zeros(dims))
+                slab_rate(hcl.asarray(read_slab(V_0, s, slab_size, halo, periodic)), *list_xs, t_minh,
+                          offset_of(s), bounds, rate, max_alpha_s)
+                V_1[s:s + slab_size] = rate.asnumpy()[:min(slab_size, n0 - s)]
+                max_alpha = np.maximum(max_alpha, max_alpha_s.asnumpy())
+
+            # Determine time step
+            delta_t = min(0.8 / np.sum(max_alpha / np.asarray(grid.dx)), tau[i] - tNow)
+
+            # Sweep 3: integrate and apply the target and obstacle sets
+            diff = 0
+            for s in starts:
+                V_old = np.asarray(V_0[s:s + slab_size])
+                V_new = integrate_slab(V_old, np.asarray(V_1[s:s + slab_size]), delta_t, compMethod,
+                                       l0[s:s + slab_size],
+                                       constraint_i[s:s + slab_size] if constraint is not None else None)
+                diff = max(diff, float(np.amax(np.abs(V_new - V_old))))
+                V_1[s:s + slab_size] = V_new
+            V_0, V_1 = V_1, V_0
+            tNow += delta_t
+
+            # Calculate computation time
+            execution_time += time.time() - start
+            print("t = {:.5f}".format(tNow))
+            print("Computational time to integrate (s): {:.5f}".format(time.time() - start))
+
+            if untilConvergent is True:
+                print("Max difference between V_old and V_new : {:.5f}".format(diff))
+                if diff < epsilon:
+                    print("Result converged ! Exiting the compute loop. Have a good day.")
+                    break
+        else:
+            if writer is not None:
+                writer.write(-1 - i, V_0)
+            continue
+        break
+
+    # Time info printing
+    print("Total kernel time (s): {:.5f}".format(execution_time))
+    print("Finished solving\n")
+
+    V_0.flush()
+    return V_0
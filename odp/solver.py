@@ -1,3 +1,4 @@
+import copy
 import heterocl as hcl
 import numpy as np
 import time
@@ -5,17 +6,17 @@ import time
 from odp.Plots import plot_isosurface, plot_valuefunction
 
 # Backward reachable set computation library
-<<<<<<< HEAD
-from odp.computeGraphs import graph_2D, graph_3D, graph_4D, graph_5D, graph_6D, graph_7D, graph_8D
-from odp.TimeToReach import TTR_3D, TTR_4D, TTR_5D 
-=======
-from odp.computeGraphs import graph_1D, graph_2D, graph_3D, graph_4D, graph_5D, graph_6D
-from odp.TimeToReach import TTR_2D, TTR_3D, TTR_4D, TTR_5D 
->>>>>>> dev_hhy
+from odp.computeGraphs import graph_ND, cached_executable
+from odp.TimeToReach import TTR_2D, TTR_3D, TTR_4D, TTR_5D, TTR_ND, ttr_blocks, TTR_FIM, initial_active_list
+from odp.out_of_core import HJSolverOutOfCore
+from odp.distributed import HJSolverDistributed
+from odp.value_store import ValueFunctionWriter, save_quantized, save_grid
+from odp.multi_resolution import grid_at_resolution, resample, level_set_change
+from odp.checkpoint import solver_parameters, save_checkpoint, load_checkpoint
+from odp.time_varying import TimeSlices
 
 # Value Iteration library
 from odp.valueIteration import value_iteration_3D, value_iteration_4D, value_iteration_5D, value_iteration_6D
-import os, psutil
 
 def solveValueIteration(MDP_obj):
     print("Welcome to optimized_dp \n")
@@ -93,9 +94,84 @@ def solveValueIteration(MDP_obj):
 
 def HJSolver(dynamics_obj, grid, multiple_value, tau, compMethod,
              plot_option, saveAllTimeSteps=False,
-             accuracy="low", untilConvergent=False, epsilon=2e-3):
+             accuracy="low", untilConvergent=False, epsilon=2e-3, use_cache=True,
+             memmap_dir=None, slab_size=8, save_dir=None, narrow_band=None, band_rebuild=5,
+             fused=False, initial_value=None, resolutions=None, level_set_tol=1e-3,
+             checkpoint_dir=None, checkpoint_every=600, resume_from=None, num_workers=None,
+             export_path=None, export_dtype="int16", export_clamp=None):
 
     # print("Welcome to optimized_dp \n")
+    # Incompatible options are rejected here, before the solve is dispatched to any of the paths below
+    # Checkpoints hold V, tNow and the tau index, written every checkpoint_every seconds of wall time
+    if resume_from is not None and checkpoint_dir is None:
+        checkpoint_dir = resume_from
+    if checkpoint_dir is not None:
+        if memmap_dir is not None or resolutions is not None:
+            raise ValueError("checkpoint_dir and resume_from are not supported together with memmap_dir or resolutions")
+        if saveAllTimeSteps is True and save_dir is None:
+            raise ValueError("saveAllTimeSteps together with checkpoint_dir needs a save_dir")
+    if memmap_dir is not None:
+        if narrow_band is not None:
+            raise ValueError("narrow_band is not supported together with memmap_dir")
+        if initial_value is not None:
+            raise ValueError("initial_value is not supported together with memmap_dir")
+        if saveAllTimeSteps is True and save_dir is None:
+            raise ValueError("saveAllTimeSteps together with memmap_dir needs a save_dir")
+    if num_workers is not None:
+        if memmap_dir is not None or resolutions is not None or narrow_band is not None or fused \
+                or initial_value is not None or checkpoint_dir is not None:
+            raise ValueError("num_workers is not supported together with memmap_dir, resolutions, narrow_band, "
+                             "fused, initial_value or checkpoints")
+
+    # The result is additionally stored clamped to export_clamp in export_dtype together with its grid,
+    # see odp.value_store.save_quantized and open_value
+    if export_path is not None:
+        V = HJSolver(dynamics_obj, grid, multiple_value, tau, compMethod, plot_option, saveAllTimeSteps=saveAllTimeSteps,
+                     accuracy=accuracy, untilConvergent=untilConvergent, epsilon=epsilon, use_cache=use_cache,
+                     memmap_dir=memmap_dir, slab_size=slab_size, save_dir=save_dir, narrow_band=narrow_band,
+                     band_rebuild=band_rebuild, fused=fused, initial_value=initial_value, resolutions=resolutions,
+                     level_set_tol=level_set_tol, checkpoint_dir=checkpoint_dir, checkpoint_every=checkpoint_every,
+                     resume_from=resume_from, num_workers=num_workers)
+        save_quantized(export_path, V, export_dtype, export_clamp)
+        save_grid(export_path, grid)
+        return V
+
+    # Coarse-to-fine solve, see HJSolverMultiResolution
+    if resolutions is not None:
+        return HJSolverMultiResolution(dynamics_obj, grid, multiple_value, tau, compMethod, plot_option,
+                                       resolutions, level_set_tol=level_set_tol, saveAllTimeSteps=saveAllTimeSteps,
+                                       accuracy=accuracy, untilConvergent=untilConvergent, epsilon=epsilon,
+                                       use_cache=use_cache, memmap_dir=memmap_dir, narrow_band=narrow_band,
+                                       band_rebuild=band_rebuild, fused=fused)
+
+    # Value functions larger than memory are kept in memory-mapped files and swept in slabs
+    if memmap_dir is not None:
+        writer = ValueFunctionWriter(save_dir, grid.pts_each_dim, len(tau)) if saveAllTimeSteps is True else None
+        V = HJSolverOutOfCore(dynamics_obj, grid, multiple_value, tau, compMethod, memmap_dir,
+                              slab_size=slab_size, accuracy=accuracy, untilConvergent=untilConvergent,
+                              epsilon=epsilon, use_cache=use_cache, writer=writer)
+        if plot_option.do_plot:
+            if plot_option.plot_type == "set":
+                plot_isosurface(grid, np.asarray(V), plot_option)
+            elif plot_option.plot_type == "value":
+                plot_valuefunction(grid, np.asarray(V), plot_option)
+        if writer is not None:
+            writer.write(0, V)
+            return writer.values()
+        return V
+
+    # The grid is partitioned along the first axis over num_workers local processes
+    if num_workers is not None:
+        V = HJSolverDistributed(dynamics_obj, grid, multiple_value, tau, compMethod, num_workers,
+                                accuracy=accuracy, untilConvergent=untilConvergent, epsilon=epsilon,
+                                use_cache=use_cache, saveAllTimeSteps=saveAllTimeSteps, save_dir=save_dir)
+        if plot_option.do_plot:
+            if plot_option.plot_type == "set":
+                plot_isosurface(grid, V, plot_option)
+            elif plot_option.plot_type == "value":
+                plot_valuefunction(grid, V, plot_option)
+        return V
+
     if type(multiple_value) == list:
         # We have both goal and obstacle set
         target = multiple_value[0] # Target set
@@ -103,6 +179,12 @@ def HJSolver(dynamics_obj, grid, multiple_value, tau, compMethod,
     else:
         target = multiple_value
         constraint = None
+
+    # Both may vary over time, and be given as callables or generators of the time slices
+    target_slices = TimeSlices(target, grid.dims)
+    target = target_slices(0)
+    if constraint is not None:
+        constraint_slices = TimeSlices(constraint, grid.dims)
     
     hcl.init()
     hcl.config.init_dtype = hcl.Float(32)
@@ -116,117 +198,84 @@ def HJSolver(dynamics_obj, grid, multiple_value, tau, compMethod,
         init_value = target
     else: 
         print("Obstacles set exists !")
-        constraint_dim = constraint.ndim
-
-        # Time-varying obstacle sets
-        if constraint_dim > grid.dims:
-            constraint_i = constraint[...,0]
-        else:
-            # Time-invariant obstacle set
-            constraint_i = constraint
+        constraint_i = constraint_slices(0)
 
         init_value = np.maximum(target, -constraint_i)
         init_value = np.array(init_value, dtype='float32')
 
-    process = psutil.Process(os.getpid())
-    # print("Gigabytes consumed {}".format(process.memory_info().rss/1e9))  # in bytes
+    if checkpoint_dir is not None:
+        params = solver_parameters(grid, tau, compMethod, accuracy=accuracy, untilConvergent=untilConvergent,
+                                   epsilon=epsilon, narrow_band=narrow_band, band_rebuild=band_rebuild,
+                                   fused=fused, obstacle=constraint is not None)
+    if resume_from is not None:
+        start_value, resume_state = load_checkpoint(resume_from, params)
+        print("Resuming from t = {:.5f}\n".format(float(resume_state["tNow"])))
+    elif initial_value is None:
+        start_value = init_value
+    else:
+        # Warm start, e.g. from the solution on a coarser grid. The target set stays l0
+        start_value = np.asarray(initial_value, dtype='float32')
+        if constraint is not None:
+            start_value = np.maximum(start_value, -constraint_i)
 
     # Tensors input to our computation graph
-    V_0 = hcl.asarray(init_value)
-    V_1 = hcl.asarray(np.zeros(tuple(grid.pts_each_dim)))
-
-    process = psutil.Process(os.getpid())
-    # print("Gigabytes consumed {}".format(process.memory_info().rss/1e9))  # in bytes
+    V_0 = hcl.asarray(start_value)
+    # A checkpoint may have been taken on the last substep of an interval, whose loop is then skipped
+    # on resume, so V_1 starts out as the checkpointed value function
+    if resume_from is not None:
+        V_1 = hcl.asarray(start_value)
+    else:
+        V_1 = hcl.asarray(np.zeros(tuple(grid.pts_each_dim)))
 
-    # Check which target set or initial value set
-    if compMethod["TargetSetMode"] != "minVWithVTarget" and compMethod["TargetSetMode"] != "maxVWithVTarget":
+    # Check which target set or initial value set, only a target set l0 follows a time-varying target
+    targetMode = compMethod["TargetSetMode"] in ("minVWithVTarget", "maxVWithVTarget")
+    if not targetMode:
         l0 = hcl.asarray(init_value)
     else:
         l0 = hcl.asarray(target)
 
-    del init_value
-    # For debugging purposes
-    if grid.dims == 4:
-        probe = hcl.asarray(np.zeros(tuple(grid.pts_each_dim)))
+    del init_value, start_value, target
 
-    process = psutil.Process(os.getpid())
-    # print("Gigabytes consumed {}".format(process.memory_info().rss/1e9))  # in bytes
+    # Array for each state values, converted to hcl array type
+    list_xs = [hcl.asarray(np.reshape(grid.vs[d], grid.pts_each_dim[d])) for d in range(grid.dims)]
 
-    # Array for each state values
-    list_x1 = np.reshape(grid.vs[0], grid.pts_each_dim[0])
-<<<<<<< HEAD
-    list_x2 = np.reshape(grid.vs[1], grid.pts_each_dim[1])
-=======
-    if grid.dims >= 2:
-        list_x2 = np.reshape(grid.vs[1], grid.pts_each_dim[1])
->>>>>>> dev_hhy
-    if grid.dims >= 3:
-        list_x3 = np.reshape(grid.vs[2], grid.pts_each_dim[2])
-    if grid.dims >= 4:
-        list_x4 = np.reshape(grid.vs[3], grid.pts_each_dim[3])
-    if grid.dims >= 5:
-        list_x5 = np.reshape(grid.vs[4], grid.pts_each_dim[4])
-    if grid.dims >= 6:
-        list_x6 = np.reshape(grid.vs[5], grid.pts_each_dim[5])
-    if grid.dims >= 7:
-        list_x7 = np.reshape(grid.vs[6], grid.pts_each_dim[6])
-    if grid.dims >= 8:
-        list_x8 = np.reshape(grid.vs[7], grid.pts_each_dim[7])
+    # The obstacle clamp and the convergence check run inside the executable
+    obstacleMode = compMethod.get("ObstacleSetMode") if constraint is not None else None
+    if obstacleMode is not None:
+        obstacle_i = hcl.asarray(constraint_i)
+    max_diff = hcl.asarray(np.zeros(1))
 
-    # Convert state arrays to hcl array type
-    list_x1 = hcl.asarray(list_x1)
-<<<<<<< HEAD
-    list_x2 = hcl.asarray(list_x2)
-=======
-    if grid.dims >= 2:
-        list_x2 = hcl.asarray(list_x2)
->>>>>>> dev_hhy
-    if grid.dims >= 3:
-        list_x3 = hcl.asarray(list_x3)
-    if grid.dims >= 4:
-        list_x4 = hcl.asarray(list_x4)
-    if grid.dims >= 5:
-        list_x5 = hcl.asarray(list_x5)
-    if grid.dims >= 6:
-        list_x6 = hcl.asarray(list_x6)
-    if grid.dims >= 7:
-        list_x7 = hcl.asarray(list_x7)
-    if grid.dims >= 8:
-        list_x8 = hcl.asarray(list_x8)
+    # Narrow band: only the cells with |V| <= narrow_band are updated, the band is rebuilt every
+    # band_rebuild substeps. It has to be wide enough for the zero level set not to leave it in between.
+    narrowBand = narrow_band is not None
+    if narrowBand:
+        # The executable rebuilds the band on its first call, then every band_rebuild calls
+        band = hcl.asarray(np.zeros(tuple(grid.pts_each_dim)), dtype=hcl.UInt(8))
+        band_state = hcl.asarray(np.array([narrow_band, band_rebuild, 0.0]))
+    if fused:
+        # min > max, the executable computes the bounds of the first step and then keeps them up to date
+        deriv_bounds = hcl.asarray(np.stack([np.full(grid.dims, 1e9), np.full(grid.dims, -1e9)]))
 
     # Get executable, obstacle check intial value function
-<<<<<<< HEAD
-=======
-    if grid.dims == 1:
-        solve_pde = graph_1D(dynamics_obj, grid, compMethod["TargetSetMode"], accuracy)
-
->>>>>>> dev_hhy
-    if grid.dims == 2:
-        solve_pde = graph_2D(dynamics_obj, grid, compMethod["TargetSetMode"], accuracy)
-
-    if grid.dims == 3:
-        solve_pde = graph_3D(dynamics_obj, grid, compMethod["TargetSetMode"], accuracy)
-
-    if grid.dims == 4:
-        solve_pde = graph_4D(dynamics_obj, grid, compMethod["TargetSetMode"], accuracy)
-
-    if grid.dims == 5:
-        solve_pde = graph_5D(dynamics_obj, grid, compMethod["TargetSetMode"], accuracy)
-
-    if grid.dims == 6:
-        solve_pde = graph_6D(dynamics_obj, grid, compMethod["TargetSetMode"], accuracy)
-    
-    if grid.dims == 7:
-        solve_pde = graph_7D(dynamics_obj, grid, compMethod["TargetSetMode"], accuracy)
-    
-    if grid.dims == 8:
-        solve_pde = graph_8D(dynamics_obj, grid, compMethod["TargetSetMode"], accuracy)
+    solve_pde = cached_executable(graph_ND, dynamics_obj, grid, compMethod["TargetSetMode"], accuracy,
+                                  obstacleMode=obstacleMode, computeDiff=untilConvergent,
+                                  narrowBand=narrowBand, fused=fused, use_cache=use_cache)
 
     """ Be careful, for high-dimensional array (5D or higher), saving value arrays at all the time steps may 
-    cause your computer to run out of memory """
+    cause your computer to run out of memory. Pass save_dir to stream the time slices to disk instead, 
+    a LazyValueFunction reading them back is returned in that case """
     if saveAllTimeSteps is True:
-        valfuncs = np.zeros(np.insert(tuple(grid.pts_each_dim), grid.dims, len(tau)))
-        valfuncs[..., -1 ] = V_0.asnumpy()
+        if save_dir is None:
+            valfuncs = np.zeros(np.insert(tuple(grid.pts_each_dim), grid.dims, len(tau)), dtype=np.float32)
+
+            def save_slice(index, V):
+                valfuncs[..., index] = V
+        else:
+            writer = ValueFunctionWriter(save_dir, grid.pts_each_dim, len(tau))
+            save_slice = writer.write
+            valfuncs = writer.values()
+        if resume_from is None:
+            save_slice(-1, V_0.asnumpy())
         print(valfuncs.shape)
 
 
@@ -235,83 +284,79 @@ def HJSolver(dynamics_obj, grid, multiple_value, tau, compMethod,
     execution_time = 0
     iter = 0
     tNow = tau[0]
+    first_i = 1
+    if resume_from is not None:
+        execution_time = float(resume_state["execution_time"])
+        iter = int(resume_state["iter"])
+        tNow = resume_state["tNow"][()]
+        first_i = int(resume_state["i"])
+        if narrowBand:
+            band = hcl.asarray(resume_state["band"], dtype=hcl.UInt(8))
+            band_state = hcl.asarray(resume_state["band_state"])
+        if fused:
+            deriv_bounds = hcl.asarray(resume_state["deriv_bounds"])
+    last_checkpoint = time.time()
     print("Started running\n")
 
-    process = psutil.Process(os.getpid())
-    # print("Gigabytes consumed {}".format(process.memory_info().rss/1e9))  # in bytes
-
     # Backward reachable set/tube will be computed over the specified time horizon
     # Or until convergent ( which ever happens first )
-    for i in range (1, len(tau)):
+    for i in range (first_i, len(tau)):
         #tNow = tau[i-1]
         t_minh= hcl.asarray(np.array((tNow, tau[i])))
         
         # taking obstacle at each timestep
-        if "ObstacleSetMode" in compMethod and constraint_dim > grid.dims:
-            constraint_i = constraint[...,i]
+        if obstacleMode is not None and constraint_slices.varying:
+            obstacle_i = hcl.asarray(constraint_slices(i))
+        if targetMode and target_slices.varying:
+            l0 = hcl.asarray(target_slices(i))
+
+        # Buffers passed after l0, see graph_ND
+        extra_args = []
+        if obstacleMode is not None:
+            extra_args.append(obstacle_i)
+        if untilConvergent is True:
+            extra_args.append(max_diff)
 
         while tNow <= tau[i] - 1e-4:
-            prev_arr = V_0.asnumpy()
             # Start timing
             iter += 1
             start = time.time()
 
+            band_args = [band, band_state] if narrowBand else []
+            if fused:
+                band_args.append(deriv_bounds)
+
             # Run the execution and pass input into graph
-<<<<<<< HEAD
-=======
-            if grid.dims == 1:
-                solve_pde(V_1, V_0, list_x1, t_minh, l0)
->>>>>>> dev_hhy
-            if grid.dims == 2:
-                solve_pde(V_1, V_0, list_x1, list_x2, t_minh, l0)
-            if grid.dims == 3:
-                solve_pde(V_1, V_0, list_x1, list_x2, list_x3, t_minh, l0)
-            if grid.dims == 4:
-                solve_pde(V_1, V_0, list_x1, list_x2, list_x3, list_x4, t_minh, l0, probe)
-            if grid.dims == 5:
-                solve_pde(V_1, V_0, list_x1, list_x2, list_x3, list_x4, list_x5 ,t_minh, l0)
-            if grid.dims == 6:
-                solve_pde(V_1, V_0, list_x1, list_x2, list_x3, list_x4, list_x5, list_x6, t_minh, l0)
-            if grid.dims == 7:
-                solve_pde(V_1, V_0, list_x1, list_x2, list_x3, list_x4, list_x5, list_x6, list_x7, t_minh, l0)
-            if grid.dims == 8:
-                solve_pde(V_1, V_0, list_x1, list_x2, list_x3, list_x4, list_x5, list_x6, list_x7, list_x8, t_minh, l0)
+            solve_pde(V_1, V_0, *list_xs, t_minh, l0, *band_args, *extra_args)
 
             tNow = t_minh.asnumpy()[0]
-            process = psutil.Process(os.getpid())
-            # print("Gigabytes consumed {}".format(process.memory_info().rss/1e9))  # in bytes
 
             # Calculate computation time
             execution_time += time.time() - start
 
-            # If ObstacleSetMode is specified by user
-            if "ObstacleSetMode" in compMethod:
-                if compMethod["ObstacleSetMode"] == "maxVWithObstacle":
-                    tmp_val = np.maximum(V_0.asnumpy(), -constraint_i)
-                elif compMethod["ObstacleSetMode"] == "minVWithObstacle":
-                    tmp_val = np.minimum(V_0.asnumpy(), -constraint_i)
-
-                # Update final result
-                V_1 = hcl.asarray(tmp_val)
-                # Update input for next iteration
-                V_0 = hcl.asarray(tmp_val)
-
             # Some information printin
             print(t_minh)
             print("Computational time to integrate (s): {:.5f}".format(time.time() - start))
-            process = psutil.Process(os.getpid())
-            # print("Gigabytes consumed {}".format(process.memory_info().rss/1e9))  # in bytes
+
+            if checkpoint_dir is not None and time.time() - last_checkpoint >= checkpoint_every:
+                band_arrays = {"band": band.asnumpy(), "band_state": band_state.asnumpy()} if narrowBand else {}
+                if fused:
+                    band_arrays["deriv_bounds"] = deriv_bounds.asnumpy()
+                save_checkpoint(checkpoint_dir, params, V_0.asnumpy(), tNow=tNow, i=i, iter=iter,
+                                execution_time=execution_time, **band_arrays)
+                last_checkpoint = time.time()
+                print("Checkpoint saved to {}".format(checkpoint_dir))
 
             if untilConvergent is True:
-                # Compare difference between V_{t-1} and V_{t} and choose the max changes
-                diff = np.amax(np.abs(V_1.asnumpy() - prev_arr))
+                # Max change between V_{t-1} and V_{t}, computed by the executable
+                diff = max_diff.asnumpy()[0]
                 print("Max difference between V_old and V_new : {:.5f}".format(diff))
                 if diff < epsilon:
                     print("Result converged ! Exiting the compute loop. Have a good day.")
                     break
         else: # if it didn't break because of convergent condition
             if saveAllTimeSteps is True:
-                valfuncs[..., -1-i] = V_1.asnumpy()
+                save_slice(-1-i, V_1.asnumpy())
             continue
         break # only if convergent condition is achieved
 
@@ -325,23 +370,106 @@ def HJSolver(dynamics_obj, grid, multiple_value, tau, compMethod,
         # Only plots last value array for now
         if plot_option.plot_type == "set":
             if saveAllTimeSteps is True:
-                plot_isosurface(grid, valfuncs, plot_option)
+                plot_isosurface(grid, np.asarray(valfuncs), plot_option)
             else:
                 plot_isosurface(grid, V_1.asnumpy(), plot_option)
         elif plot_option.plot_type == "value":
             if saveAllTimeSteps is True:
-                plot_valuefunction(grid, valfuncs, plot_option)
+                plot_valuefunction(grid, np.asarray(valfuncs), plot_option)
             else:
                 plot_valuefunction(grid, V_1.asnumpy(), plot_option)
 
     if saveAllTimeSteps is True:
-        valfuncs[..., 0] = V_1.asnumpy()
+        save_slice(0, V_1.asnumpy())
         return valfuncs
 
     return V_1.asnumpy()
 
-def TTRSolver(dynamics_obj, grid, init_value, epsilon, plot_option):
+def HJSolverMultiResolution(dynamics_obj, grid, multiple_value, tau, compMethod, plot_option, resolutions,
+                            level_set_tol=1e-3, saveAllTimeSteps=False, untilConvergent=False, memmap_dir=None,
+                            **kwargs):
+    """ Solves the HJ PDE from coarse to fine grids until the zero level set stabilizes
+
+    The problem is first solved until convergence on the coarsest resolution. Each solution is then
+    prolongated to the next resolution by multilinear interpolation and used as the initial value of
+    the next solve, whose target and obstacle sets are resampled from the ones given on grid. Once
+    the zero sublevel set changes on at most level_set_tol of the nodes between two resolutions, the
+    remaining ones are skipped and the last solution is prolongated to grid.
+
+    Args:
+        grid (Grid): the finest grid, multiple_value is given on it
+        resolutions (list): pts_each_dim of the coarser grids, coarsest first
+        level_set_tol (float, optional): fraction of nodes allowed to change sign. Defaults to 1e-3.
+        kwargs: other HJSolver arguments, passed to every solve
+
+    Returns:
+        np.ndarray: value function on grid
+    """
+    if untilConvergent is not True:
+        raise ValueError("resolutions needs untilConvergent=True, a finite horizon can not be continued on a finer grid")
+    if saveAllTimeSteps is True or memmap_dir is not None:
+        raise ValueError("resolutions is not supported together with saveAllTimeSteps or memmap_dir")
+
+    if any(not isinstance(v, np.ndarray) for v in (multiple_value if type(multiple_value) == list else [multiple_value])):
+        raise ValueError("resolutions needs the target and obstacle sets as arrays, not callables or generators")
+
+    quiet = copy.copy(plot_option)
+    quiet.do_plot = False
+    values = multiple_value if type(multiple_value) == list else [multiple_value]
+
+    levels = [grid_at_resolution(grid, pts) for pts in resolutions] + [grid]
+    level_grid, V = None, None
+    for n, next_grid in enumerate(levels):
+        start = time.time()
+        if V is not None:
+            V = resample(V, level_grid, next_grid)
+        if next_grid is grid:
+            level_values = values
+        else:
+            level_values = [resample(np.asarray(v), grid, next_grid) for v in values]
+        V_next = HJSolver(dynamics_obj, next_grid, level_values if len(level_values) > 1 else level_values[0],
+                          tau, compMethod, quiet, untilConvergent=True, initial_value=V, **kwargs)
+        print("Resolution {} solved in {:.5f} s".format(tuple(int(n) for n in next_grid.pts_each_dim), time.time() - start))
+
+        change = level_set_change(V_next, V) if V is not None else 1.0
+        level_grid, V = next_grid, V_next
+        if change <= level_set_tol:
+            print("Zero level set changed on {:.5f} of the nodes, stopping refinement".format(change))
+            break
+
+    if level_grid is not grid:
+        V = resample(V, level_grid, grid)
+
+    ##################### PLOTTING #####################
+    if plot_option.do_plot :
+        if plot_option.plot_type == "set":
+            plot_isosurface(grid, V, plot_option)
+        elif plot_option.plot_type == "value":
+            plot_valuefunction(grid, V, plot_option)
+
+    return V
+
+def TTRSolver(dynamics_obj, grid, init_value, epsilon, plot_option, use_cache=True, num_blocks=None,
+              method="sweeping"):
+    """ Solves the time-to-reach problem until phi changes less than epsilon
+
+    Args:
+        method (str, optional): "sweeping" for fast sweeping, or "fim" for the fast iterative method,
+            which only revisits cells whose neighbourhood changed and needs fewer passes when the
+            characteristics are convoluted, e.g. around many obstacles. Defaults to "sweeping".
+        num_blocks (int, optional): sweep the grid with the parallel N-D engine, splitting the first
+            axis into this many blocks that are swept concurrently. Convergence is then tracked inside
+            the executable and phi is only copied back once solved. 6D grids always use this engine.
+            Defaults to None, the per-dimension sweeps.
+    """
     print("Welcome to optimized_dp \n")
+    if method == "fim":
+        return TTRSolverFIM(dynamics_obj, grid, init_value, epsilon, plot_option, use_cache)
+    if method != "sweeping":
+        raise ValueError("Unsupported TTR method {}, expected 'sweeping' or 'fim'".format(method))
+    if num_blocks is not None or grid.dims == 6:
+        return TTRSolverParallel(dynamics_obj, grid, init_value, epsilon, plot_option, use_cache,
+                                 8 if num_blocks is None else num_blocks)
     ################# INITIALIZE DATA TO BE INPUT INTO EXECUTABLE ##########################
 
     print("Initializing\n")
@@ -384,15 +512,13 @@ def TTRSolver(dynamics_obj, grid, init_value, epsilon, plot_option):
     # if grid.dims == 1:
     #     solve_TTR = TTR_1D(dynamics_obj, grid)
     if grid.dims == 2:
-        solve_TTR = TTR_2D(dynamics_obj, grid)
+        solve_TTR = cached_executable(TTR_2D, dynamics_obj, grid, use_cache=use_cache)
     if grid.dims == 3:
-        solve_TTR = TTR_3D(dynamics_obj, grid)
+        solve_TTR = cached_executable(TTR_3D, dynamics_obj, grid, use_cache=use_cache)
     if grid.dims == 4:
-        solve_TTR = TTR_4D(dynamics_obj, grid)
+        solve_TTR = cached_executable(TTR_4D, dynamics_obj, grid, use_cache=use_cache)
     if grid.dims == 5:
-        solve_TTR = TTR_5D(dynamics_obj, grid)
-    if grid.dims == 6:
-        solve_TTR = TTR_6D(dynamics_obj, grid)
+        solve_TTR = cached_executable(TTR_5D, dynamics_obj, grid, use_cache=use_cache)
     print("Got Executable\n")
 
     # Print out code for different backend
@@ -433,7 +559,7 @@ def TTRSolver(dynamics_obj, grid, init_value, epsilon, plot_option):
 
     return V_0.asnumpy()
 
-def computeSpatDerivArray(grid, V, deriv_dim, accuracy="low"):
+def computeSpatDerivArray(grid, V, deriv_dim, accuracy="low", use_cache=True):
     # Return a tensor same size as V that contains spatial derivatives at every state in V
     hcl.init()
     hcl.config.init_dtype = hcl.Float(32)
@@ -444,31 +570,104 @@ def computeSpatDerivArray(grid, V, deriv_dim, accuracy="low"):
     V_0 = hcl.asarray(V)
     spatial_deriv = hcl.asarray(np.zeros(tuple(grid.pts_each_dim)))
 
-    # Get executable, obstacle check intial value function
-<<<<<<< HEAD
-=======
-    if grid.dims == 1:
-        compute_SpatDeriv = graph_1D(None, grid, "None", accuracy,
-                                     generate_SpatDeriv=True, deriv_dim=deriv_dim)
->>>>>>> dev_hhy
-    if grid.dims == 2:
-        compute_SpatDeriv = graph_2D(None, grid, "None", accuracy,
-                                     generate_SpatDeriv=True, deriv_dim=deriv_dim)
-    if grid.dims == 3:
-        compute_SpatDeriv = graph_3D(None, grid, "None", accuracy,
-                                     generate_SpatDeriv=True, deriv_dim=deriv_dim)
-    if grid.dims == 4:
-        compute_SpatDeriv = graph_4D(None, grid, "None", accuracy,
-                                     generate_SpatDeriv=True, deriv_dim=deriv_dim)
-    if grid.dims == 5:
-        compute_SpatDeriv = graph_5D(None, grid, "None", accuracy,
-                                     generate_SpatDeriv=True, deriv_dim=deriv_dim)
-    if grid.dims == 6:
-        compute_SpatDeriv = graph_6D(None, grid, "None", accuracy,
-                                     generate_SpatDeriv=True, deriv_dim=deriv_dim)
-    if grid.dims == 8:
-        compute_SpatDeriv = graph_8D(None, grid, "None", accuracy,
-                                     generate_SpatDeriv=True, deriv_dim=deriv_dim)
+    # Get executable
+    compute_SpatDeriv = cached_executable(graph_ND, None, grid, "None", accuracy,
+                                          generate_SpatDeriv=True, deriv_dim=deriv_dim, use_cache=use_cache)
 
     compute_SpatDeriv(V_0, spatial_deriv)
     return spatial_deriv.asnumpy()
+
+
+def TTRSolverParallel(dynamics_obj, grid, init_value, epsilon, plot_option, use_cache=True, num_blocks=8):
+    """ TTRSolver with the parallel fast sweeping engine TTR_ND, see TTRSolver """
+    print("Initializing\n")
+    hcl.init()
+    hcl.config.init_dtype = hcl.Float(32)
+
+    # Convert initial distance value function to initial time-to-reach value function
+    init_value[init_value < 0] = 0
+    init_value[init_value > 0] = 1000
+    V_0 = hcl.asarray(init_value)
+
+    # Convert states vector to hcl array type
+    list_xs = [hcl.asarray(np.reshape(grid.vs[d], grid.pts_each_dim[d])) for d in range(grid.dims)]
+
+    # Each block reports the largest change of phi over an iteration
+    blocks, _ = ttr_blocks(grid, num_blocks)
+    residual = hcl.asarray(np.zeros(blocks))
+
+    # Get executable
+    solve_TTR = cached_executable(TTR_ND, dynamics_obj, grid, num_blocks, use_cache=use_cache)
+    print("Got Executable\n")
+
+    ################ USE THE EXECUTABLE ############
+    error = 10000
+    count = 0
+    start = time.time()
+    while error > epsilon:
+        print("Iteration: {} Error: {}".format(count, error))
+        count += 1
+        solve_TTR(V_0, *list_xs, residual)
+        error = float(np.max(residual.asnumpy()))
+    print("Iteration: {} Error: {}".format(count, error))
+    print("Total TTR computation time (s): {:.5f}".format(time.time() - start))
+    print("Finished solving\n")
+
+    ##################### PLOTTING #####################
+    V = V_0.asnumpy()
+    if plot_option.do_plot :
+        # Only plots last value array for now
+        if plot_option.plot_type == "set":
+            plot_isosurface(grid, V, plot_option)
+        elif plot_option.plot_type == "value":
+            plot_valuefunction(grid, V, plot_option)
+
+    return V
+
+
+def TTRSolverFIM(dynamics_obj, grid, init_value, epsilon, plot_option, use_cache=True):
+    """ TTRSolver with the fast iterative method TTR_FIM, see TTRSolver """
+    print("Initializing\n")
+    hcl.init()
+    hcl.config.init_dtype = hcl.Float(32)
+
+    # Convert initial distance value function to initial time-to-reach value function
+    init_value[init_value < 0] = 0
+    init_value[init_value > 0] = 1000
+    V_0 = hcl.asarray(init_value)
+
+    # The active list starts at the boundary of the target set
+    status = initial_active_list(init_value, grid)
+    num_active = int(np.count_nonzero(status))
+    status = hcl.asarray(status, dtype=hcl.UInt(8))
+    active_count = hcl.asarray(np.zeros(grid.pts_each_dim[0]), dtype=hcl.Int())
+    tolerance = hcl.asarray(np.array([epsilon]))
+
+    # Convert states vector to hcl array type
+    list_xs = [hcl.asarray(np.reshape(grid.vs[d], grid.pts_each_dim[d])) for d in range(grid.dims)]
+
+    # Get executable
+    solve_FIM = cached_executable(TTR_FIM, dynamics_obj, grid, use_cache=use_cache)
+    print("Got Executable\n")
+
+    ################ USE THE EXECUTABLE ############
+    count = 0
+    start = time.time()
+    while num_active > 0:
+        print("Iteration: {} Active cells: {}".format(count, num_active))
+        count += 1
+        solve_FIM(V_0, *list_xs, tolerance, status, active_count)
+        num_active = int(np.sum(active_count.asnumpy()))
+    print("Total TTR computation time (s): {:.5f}".format(time.time() - start))
+    print("Finished solving\n")
+
+    ##################### PLOTTING #####################
+    V = V_0.asnumpy()
+    if plot_option.do_plot :
+        # Only plots last value array for now
+        if plot_option.plot_type == "set":
+            plot_isosurface(grid, V, plot_option)
+        elif plot_option.plot_type == "value":
+            plot_valuefunction(grid, V, plot_option)
+
+    return V
@@ -0,0 +1,71 @@
+import heterocl as hcl
+from odp.computeGraphs.CustomGraphFunctions import *
+
+################## N-D SPATIAL DERIVATIVE FUNCTION #################
+def shift_index(idx, dim, new_pos):
+    """ Returns a copy of the index tuple with position dim replaced by new_pos
+
+    Args:
+        idx (tuple): loop variables of the current grid point
+        dim (int): axis to be replaced (0-indexed)
+        new_pos (hcl expression or int): new position along dim
+    """
+    return tuple(new_pos if d == dim else idx[d] for d in range(len(idx)))
+
+
+def spa_deriv_ND(idx, dim, V, g, axis_range=None):
+    """ First order ENO left/right spatial derivatives along one axis of an N-D grid
+
+    Args:
+        idx (tuple): loop variables of the current grid point
+        dim (int): axis along which the derivative is taken (0-indexed)
+        V (hcl.Tensor): value function
+        g (Grid): grid object
+        axis_range (tuple, optional): (pos, last) global position of the point and global last
+            index along dim, for tensors that only hold a slab of the grid padded with halo cells.
+            Defaults to None, V holds the whole axis.
+    """
+    left_deriv = hcl.scalar(0, "left_deriv")
+    right_deriv = hcl.scalar(0, "right_deriv")
+    i = idx[dim]
+    V_here = V[idx]
+    V_left = V[shift_index(idx, dim, i - 1)]
+    V_right = V[shift_index(idx, dim, i + 1)]
+    if axis_range is None:
+        pos, last = i, V.shape[dim] - 1
+    else:
+        pos, last = axis_range
+        if dim in g.pDim:
+            # Neighbours across the periodic boundary are provided by the halo
+            left_deriv[0] = (V_here - V_left) / g.dx[dim]
+            right_deriv[0] = (V_right - V_here) / g.dx[dim]
+            return left_deriv[0], right_deriv[0]
+    if dim not in g.pDim:
+        with hcl.if_(pos == 0):
+            left_boundary = hcl.scalar(0, "left_boundary")
+            left_boundary[0] = V_here + my_abs(V_right - V_here) * my_sign(V_here)
+            left_deriv[0] = (V_here - left_boundary[0]) / g.dx[dim]
+            right_deriv[0] = (V_right - V_here) / g.dx[dim]
+        with hcl.elif_(pos == last):
+            right_boundary = hcl.scalar(0, "right_boundary")
+            right_boundary[0] = V_here + my_abs(V_here - V_left) * my_sign(V_here)
+            left_deriv[0] = (V_here - V_left) / g.dx[dim]
+            right_deriv[0] = (right_boundary[0] - V_here) / g.dx[dim]
+        with hcl.else_():
+            left_deriv[0] = (V_here - V_left) / g.dx[dim]
+            right_deriv[0] = (V_right - V_here) / g.dx[dim]
+    else:
+        with hcl.if_(i == 0):
+            left_boundary = hcl.scalar(0, "left_boundary")
+            left_boundary[0] = V[shift_index(idx, dim, last)]
+            left_deriv[0] = (V_here - left_boundary[0]) / g.dx[dim]
+            right_deriv[0] = (V_right - V_here) / g.dx[dim]
+        with hcl.elif_(i == last):
+            right_boundary = hcl.scalar(0, "right_boundary")
+            right_boundary[0] = V[shift_index(idx, dim, 0)]
+            left_deriv[0] = (V_here - V_left) / g.dx[dim]
+            right_deriv[0] = (right_boundary[0] - V_here) / g.dx[dim]
+        with hcl.else_():
+            left_deriv[0] = (V_here - V_left) / g.dx[dim]
+            right_deriv[0] = (V_right - V_here) / g.dx[dim]
+    return left_deriv[0], right_deriv[0]
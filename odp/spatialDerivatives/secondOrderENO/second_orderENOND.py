@@ -0,0 +1,110 @@
+import heterocl as hcl
+from odp.computeGraphs.CustomGraphFunctions import *
+from odp.spatialDerivatives.firstOrderENO.first_orderENOND import shift_index
+
+def secondOrder_ENO_ND(idx, dim, V, g, axis_range=None):
+	""" Second order ENO left/right spatial derivatives along one axis of an N-D grid
+
+	Args:
+		idx (tuple): loop variables of the current grid point
+		dim (int): axis along which the derivative is taken (0-indexed)
+		V (hcl.Tensor): value function
+		g (Grid): grid object
+		axis_range (tuple, optional): (pos, last) global position of the point and global last
+			index along dim, for tensors that only hold a slab of the grid padded with halo cells.
+			Defaults to None, V holds the whole axis.
+	"""
+	left_deriv = hcl.scalar(0, "left_deriv")
+	right_deriv = hcl.scalar(0, "right_deriv")
+	axis_step = g.dx[dim]
+	i = idx[dim]
+	V_here = V[idx]
+
+	def at(pos):
+		return V[shift_index(idx, dim, pos)]
+
+	V_i_plus_1 = hcl.scalar(0, "V_i_plus_1")
+	V_i_minus_1 = hcl.scalar(0, "V_i_minus_1")
+	V_i_plus_2 = hcl.scalar(0, "V_i_plus_2")
+	V_i_minus_2 = hcl.scalar(0, "V_i_minus_2")
+	if axis_range is None:
+		pos, last = i, V.shape[dim] - 1
+	else:
+		pos, last = axis_range
+	if axis_range is not None and dim in g.pDim:
+		# Neighbours across the periodic boundary are provided by the halo
+		V_i_minus_1[0] = at(i - 1)
+		V_i_minus_2[0] = at(i - 2)
+		V_i_plus_1[0] = at(i + 1)
+		V_i_plus_2[0] = at(i + 2)
+	elif dim not in g.pDim:
+		with hcl.if_(pos == 0):
+			V_i_minus_1[0] = V_here + my_abs(at(i + 1) - V_here) * my_sign(V_here)
+			V_i_minus_2[0] = V_here + 2 * my_abs(at(i + 1) - V_here) * my_sign(V_here)
+			V_i_plus_1[0] = at(i + 1)
+			V_i_plus_2[0] = at(i + 2)
+		with hcl.elif_(pos == 1):
+			V_i_minus_1[0] = at(i - 1)
+			V_i_minus_2[0] = V_here + my_abs(V_here - at(i - 1)) * my_sign(V_here)
+			V_i_plus_1[0] = at(i + 1)
+			V_i_plus_2[0] = at(i + 2)
+		with hcl.elif_(pos == last):
+			V_i_minus_1[0] = at(i - 1)
+			V_i_minus_2[0] = at(i - 2)
+			V_i_plus_1[0] = V_here + my_abs(V_here - at(i - 1)) * my_sign(V_here)
+			V_i_plus_2[0] = V_here + 2 * my_abs(V_here - at(i - 1)) * my_sign(V_here)
+		with hcl.elif_(pos == last - 1):
+			V_i_minus_1[0] = at(i - 1)
+			V_i_minus_2[0] = at(i - 2)
+			V_i_plus_1[0] = at(i + 1)
+			V_i_plus_2[0] = V_here + my_abs(at(i + 1) - V_here) * my_sign(V_here)
+		with hcl.else_():
+			V_i_minus_1[0] = at(i - 1)
+			V_i_minus_2[0] = at(i - 2)
+			V_i_plus_1[0] = at(i + 1)
+			V_i_plus_2[0] = at(i + 2)
+	else:
+		with hcl.if_(i == 0):
+			V_i_minus_1[0] = at(last)
+			V_i_minus_2[0] = at(last - 1)
+			V_i_plus_1[0] = at(i + 1)
+			V_i_plus_2[0] = at(i + 2)
+		with hcl.elif_(i == 1):
+			V_i_minus_1[0] = at(i - 1)
+			V_i_minus_2[0] = at(last)
+			V_i_plus_1[0] = at(i + 1)
+			V_i_plus_2[0] = at(i + 2)
+		with hcl.elif_(i == last):
+			V_i_minus_1[0] = at(i - 1)
+			V_i_minus_2[0] = at(i - 2)
+			V_i_plus_1[0] = at(0)
+			V_i_plus_2[0] = at(1)
+		with hcl.elif_(i == last - 1):
+			V_i_minus_1[0] = at(i - 1)
+			V_i_minus_2[0] = at(i - 2)
+			V_i_plus_1[0] = at(i + 1)
+			V_i_plus_2[0] = at(0)
+		with hcl.else_():
+			V_i_minus_1[0] = at(i - 1)
+			V_i_minus_2[0] = at(i - 2)
+			V_i_plus_1[0] = at(i + 1)
+			V_i_plus_2[0] = at(i + 2)
+	D1_minus_2_plus_half = (V_i_minus_1[0] - V_i_minus_2[0]) / axis_step
+	D1_minus_1_plus_half = (V_here - V_i_minus_1[0]) / axis_step
+	D1_0_plus_half = (V_i_plus_1[0] - V_here) / axis_step
+	D1_plus_1_plus_half = (V_i_plus_2[0] - V_i_plus_1[0]) / axis_step
+
+	D2_minus_1 = (D1_minus_1_plus_half - D1_minus_2_plus_half) / (2 * axis_step)
+	D2_0 = (D1_0_plus_half - D1_minus_1_plus_half) / (2 * axis_step)
+	D2_plus_1 = (D1_plus_1_plus_half - D1_0_plus_half) / (2 * axis_step)
+
+	with hcl.if_(my_abs(D2_minus_1) <= my_abs(D2_0)):
+		left_deriv[0] = D1_minus_1_plus_half + D2_minus_1 * axis_step
+	with hcl.else_():
+		left_deriv[0] = D1_minus_1_plus_half + D2_0 * axis_step
+
+	with hcl.if_(my_abs(D2_0) <= my_abs(D2_plus_1)):
+		right_deriv[0] = D1_0_plus_half - D2_0 * axis_step
+	with hcl.else_():
+		right_deriv[0] = D1_0_plus_half - D2_plus_1 * axis_step
+	return left_deriv[0], right_deriv[0]
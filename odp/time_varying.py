@@ -0,0 +1,48 @@
+import numpy as np
+
+""" Time slices of target and obstacle sets
+
+HJSolver accepts the target and the obstacle set in any of these forms:
+    - an array of the grid shape, constant over time
+    - an array of the grid shape followed by a time axis of len(tau), slice i used on [tau[i-1], tau[i]]
+    - a callable f(i) returning slice i on demand
+    - a generator or iterator yielding slices 0, 1, 2, ... in order
+The last two never hold more than the current slice, e.g. for moving obstacles on 4D+ grids:
+    obstacle = lambda i: CylinderShape(g, [2, 3], center_at(tau[i]), 0.5)
+"""
+
+
+class TimeSlices:
+    def __init__(self, values, dims):
+        """ Uniform access to the time slices of a target or obstacle set
+
+        Args:
+            values: array, callable or iterator, see the module description
+            dims (int): number of dimensions of the grid
+        """
+        self.values = values
+        self.index = -1
+        self.current = None
+        if isinstance(values, np.ndarray):
+            self.varying = values.ndim > dims
+        else:
+            self.varying = True
+            if not callable(values):
+                self.values = iter(values)
+
+    def __call__(self, i):
+        """ Returns the slice used on [tau[i-1], tau[i]], slice 0 being the initial one """
+        if isinstance(self.values, np.ndarray):
+            return self.values[..., i] if self.varying else self.values
+        if i != self.index:
+            if callable(self.values):
+                self.current = np.asarray(self.values(i))
+            else:
+                if i < self.index:
+                    raise ValueError("A generator of time slices can only be read forward, "
+                                     "slice {} was requested after slice {}".format(i, self.index))
+                while self.index < i:
+                    self.current = np.asarray(next(self.values))
+                    self.index += 1
+            self.index = i
+        return self.current
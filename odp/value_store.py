@@ -0,0 +1,352 @@
+import json
+import os
+import numpy as np
+
+from odp.Grid import Grid
+
+""" On-disk storage of value functions over all time slices
+
+HJSolver(..., saveAllTimeSteps=True, save_dir=...) streams every time slice to its own .npy
+file (or compressed .npz) as soon as it is computed, instead of holding the whole
+[grid, grid, ..., len(tau)] array in memory. The solver then returns a LazyValueFunction,
+which indexes like that array but only reads the slices that are accessed.
+
+Far from the zero level set only the sign of a value function matters, so a finished value
+function can also be stored with its magnitude clamped and in fewer bits: float16, or int8/int16
+scaled so that the largest integer is the clamp. save_quantized writes it as a .npy file with a
+.json file of metadata next to it, and QuantizedValueFunction memory-maps it and indexes like the
+original float array, so it can be passed to the judges and controllers in its place.
+
+save_grid stores the grid of a value function in a .grid.json file next to it, so that
+open_value can memory-map the array and rebuild its Grid without hard-coding the grid sizes.
+"""
+
+META_FILE = "meta.json"
+# Uncompressed slices are copied in chunks of about this many bytes
+CHUNK_BYTES = 64 * 2**20
+
+
+class ValueFunctionWriter:
+    def __init__(self, directory, grid_shape, num_slices, dtype=np.float32, compress=False):
+        """ Writes the time slices of a value function to directory, one file per slice
+
+        Args:
+            directory (str): output directory, created if it does not exist
+            grid_shape (tuple): shape of one time slice
+            num_slices (int): number of time slices, usually len(tau)
+            dtype (np.dtype, optional): storage type. Defaults to np.float32.
+            compress (bool, optional): store compressed .npz files, which can not be memory-mapped.
+                Defaults to False.
+        """
+        self.directory = directory
+        self.grid_shape = tuple(int(n) for n in grid_shape)
+        self.num_slices = int(num_slices)
+        self.dtype = np.dtype(dtype)
+        self.compress = compress
+        os.makedirs(directory, exist_ok=True)
+        meta = {"grid_shape": self.grid_shape, "num_slices": self.num_slices,
+                "dtype": self.dtype.str, "compress": compress}
+        with open(os.path.join(directory, META_FILE), "w") as f:
+            json.dump(meta, f)
+
+    def write(self, index, V):
+        """ Stores V as time slice index, replacing any previous version of the slice
+
+        V may be an np.memmap, uncompressed slices are then copied a few rows at a time.
+        """
+        assert tuple(V.shape) == self.grid_shape
+        path = slice_path(self.directory, index % self.num_slices, self.compress)
+        tmp_path = path + ".tmp"
+        if self.compress:
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(f, V=np.asarray(V, dtype=self.dtype))
+        else:
+            out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=self.dtype, shape=self.grid_shape)
+            row_bytes = max(1, out[0].nbytes)
+            rows = max(1, CHUNK_BYTES // row_bytes)
+            for s in range(0, self.grid_shape[0], rows):
+                out[s:s + rows] = V[s:s + rows]
+            out.flush()
+            del out
+        os.replace(tmp_path, path)
+
+    def values(self):
+        """ Returns a LazyValueFunction reading the slices of this writer """
+        return LazyValueFunction(self.directory)
+
+
+def slice_path(directory, index, compress):
+    return os.path.join(directory, "slice_{:06d}.{}".format(index, "npz" if compress else "npy"))
+
+
+class LazyValueFunction:
+    def __init__(self, directory, offset=0.0):
+        """ Read-only view of a value function written by ValueFunctionWriter
+
+        Indexing follows the [grid, grid, ..., len(tau)] array that saveAllTimeSteps returns in memory,
+        e.g. V[..., 0] reads one slice and V[i, j, k, :] reads one point of every slice. Slices that were
+        never written read as zeros.
+
+        Args:
+            directory (str): directory written by a ValueFunctionWriter
+            offset (float, optional): constant added to every value read. Defaults to 0.
+        """
+        self.directory = directory
+        self.offset = offset
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        self.grid_shape = tuple(meta["grid_shape"])
+        self.num_slices = meta["num_slices"]
+        self.dtype = np.dtype(meta["dtype"])
+        self.compress = meta["compress"]
+
+    @property
+    def shape(self):
+        return self.grid_shape + (self.num_slices,)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def get_slice(self, index):
+        """ Returns time slice index, memory-mapped if it is stored uncompressed """
+        path = slice_path(self.directory, index, self.compress)
+        if not os.path.exists(path):
+            return np.broadcast_to(np.zeros((), dtype=self.dtype), self.grid_shape)
+        if self.compress:
+            with np.load(path) as data:
+                return data["V"]
+        return np.load(path, mmap_mode="r")
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            e = key.index(Ellipsis)
+            key = key[:e] + (slice(None),) * (self.ndim - len(key) + 1) + key[e + 1:]
+        key = key + (slice(None),) * (self.ndim - len(key))
+        grid_key, time_key = key[:-1], key[-1]
+
+        if isinstance(time_key, (int, np.integer)):
+            return np.array(self.get_slice(int(time_key) % self.num_slices)[grid_key]) + self.offset
+        indices = np.arange(self.num_slices)[time_key]
+        return np.stack([np.asarray(self.get_slice(i)[grid_key]) for i in indices], axis=-1) + self.offset
+
+    def __array__(self, dtype=None):
+        V = self[...]
+        return V if dtype is None else V.astype(dtype)
+
+    # Shifting by a constant, as done by the trajectory functions, stays lazy
+    def __add__(self, other):
+        return LazyValueFunction(self.directory, self.offset + other)
+
+    def __sub__(self, other):
+        return LazyValueFunction(self.directory, self.offset - other)
+
+
+def load_value_function(directory):
+    """ Opens the value function stored in directory, see ValueFunctionWriter """
+    return LazyValueFunction(directory)
+
+
+QUANTIZED_TYPES = ("float16", "int8", "int16")
+FLOAT16_MAX = float(np.finfo(np.float16).max)
+
+
+def quantized_meta_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def save_quantized(path, V, dtype="int16", clamp=None):
+    """ Stores V with its magnitude clamped and in a smaller type
+
+    Args:
+        path (str): path of the .npy file
+        V (np.ndarray): value function, optionally with time slices, e.g. the result of HJSolver.
+            A LazyValueFunction or np.memmap is read a few rows at a time.
+        dtype (str, optional): "float16", "int8" or "int16". Defaults to "int16".
+        clamp (float, optional): values are clamped to [-clamp, clamp]. Defaults to None, the
+            largest magnitude of V, which keeps the values but spends the resolution of the
+            integer types on the whole range.
+
+    Returns:
+        QuantizedValueFunction: the stored value function
+    """
+    if dtype not in QUANTIZED_TYPES:
+        raise ValueError("Unsupported dtype {}, expected one of {}".format(dtype, ", ".join(QUANTIZED_TYPES)))
+    shape = tuple(int(n) for n in V.shape)
+    rows = max(1, CHUNK_BYTES // max(1, 4 * int(np.prod(shape[1:]))))
+    if clamp is None:
+        clamp = max(float(np.amax(np.abs(np.asarray(V[s:s + rows])))) for s in range(0, shape[0], rows))
+    if dtype == "float16":
+        clamp = min(clamp, FLOAT16_MAX)
+        scale = 1.0
+    else:
+        scale = clamp / np.iinfo(dtype).max if clamp > 0 else 1.0
+
+    # Positive values closer to zero than the resolution are rounded up, so that the sign is kept exactly
+    smallest = np.finfo(np.float16).smallest_subnormal if dtype == "float16" else 1
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    for s in range(0, shape[0], rows):
+        values = np.clip(np.asarray(V[s:s + rows], dtype=np.float32), -clamp, clamp)
+        stored = values.astype(dtype) if dtype == "float16" else np.rint(values / scale).astype(dtype)
+        stored[(values > 0) & (stored <= 0)] = smallest
+        out[s:s + rows] = stored
+    out.flush()
+    del out
+    with open(quantized_meta_path(path), "w") as f:
+        json.dump({"dtype": dtype, "scale": scale, "clamp": clamp}, f)
+    return QuantizedValueFunction(path)
+
+
+class QuantizedValueFunction:
+    def __init__(self, path, offset=0.0):
+        """ Read-only view of a value function written by save_quantized
+
+        Indexing returns float32 values like the original array, V[index] = data[index] * scale.
+
+        Args:
+            path (str): path of the .npy file
+            offset (float, optional): constant added to every value read. Defaults to 0.
+        """
+        self.path = path
+        self.offset = offset
+        with open(quantized_meta_path(path)) as f:
+            meta = json.load(f)
+        self.scale = meta["scale"]
+        self.clamp = meta["clamp"]
+        self.data = np.load(path, mmap_mode="r")
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def ndim(self):
+        return self.data.ndim
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float32)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, key):
+        values = np.asarray(self.data[key], dtype=np.float32)
+        if self.scale != 1.0:
+            values = values * np.float32(self.scale)
+        return values + np.float32(self.offset) if self.offset else values
+
+    def __array__(self, dtype=None):
+        V = self[...]
+        return V if dtype is None else V.astype(dtype)
+
+    # Shifting by a constant, as done by the trajectory functions, stays lazy
+    def __add__(self, other):
+        return QuantizedValueFunction(self.path, self.offset + other)
+
+    def __sub__(self, other):
+        return QuantizedValueFunction(self.path, self.offset - other)
+
+
+def load_value(path, mmap_mode=None):
+    """ Loads the value function at path, quantized by save_quantized or a plain .npy array """
+    if os.path.exists(quantized_meta_path(path)):
+        return QuantizedValueFunction(path)
+    return np.load(path, mmap_mode=mmap_mode)
+
+
+def compare_quantized(original, quantized, num_samples=10000, seed=0, threshold=0.0):
+    """ Compares a quantized value function against the full precision original
+
+    Args:
+        original (np.ndarray): full precision value function, read a few rows at a time
+        quantized (QuantizedValueFunction): the quantized value function
+        num_samples (int, optional): number of random grid nodes of the sampled report. Defaults to 10000.
+        seed (int, optional): seed of the random grid nodes. Defaults to 0.
+        threshold (float, optional): the value the decisions are taken at, V <= threshold. Defaults to 0.,
+            the zero level set.
+
+    Returns:
+        dict: decision_mismatch, the fraction of grid nodes on opposite sides of threshold, which
+            flip the decisions and should be zero, band_max_error, the largest error where |V| < clamp, and
+            sample_mismatch, the fraction of num_samples random grid nodes with a different decision
+    """
+    shape = tuple(int(n) for n in original.shape)
+    rows = max(1, CHUNK_BYTES // max(1, 4 * int(np.prod(shape[1:]))))
+    mismatch = 0
+    band_error = 0.0
+    for s in range(0, shape[0], rows):
+        V = np.asarray(original[s:s + rows], dtype=np.float32)
+        Q = quantized[s:s + rows]
+        mismatch += int(np.count_nonzero((V <= threshold) != (Q <= threshold)))
+        band = np.abs(V) < quantized.clamp
+        if np.any(band):
+            band_error = max(band_error, float(np.amax(np.abs(V[band] - Q[band]))))
+
+    rng = np.random.default_rng(seed)
+    index = tuple(rng.integers(0, n, num_samples) for n in shape)
+    sample_mismatch = np.mean((np.asarray(original[index]) <= threshold) != (quantized[index] <= threshold))
+    return {"decision_mismatch": mismatch / int(np.prod(shape)), "band_max_error": band_error,
+            "sample_mismatch": float(sample_mismatch)}
+
+
+def grid_meta_path(path):
+    return os.path.splitext(path)[0] + ".grid.json"
+
+
+def grid_meta(grid):
+    """ The arguments grid was built with, as a JSON serializable dict """
+    minBounds = np.array(grid.min, dtype=float)
+    maxBounds = np.array(grid.max, dtype=float)
+    # Grid excludes the upper bound of periodic dimensions, undo that
+    for dim in grid.pDim:
+        n = grid.pts_each_dim[dim]
+        maxBounds[dim] = minBounds[dim] + (maxBounds[dim] - minBounds[dim]) * n / (n - 1)
+    return {"min": minBounds.tolist(), "max": maxBounds.tolist(),
+            "pts_each_dim": [int(n) for n in grid.pts_each_dim], "pDim": [int(d) for d in grid.pDim]}
+
+
+def grid_from_meta(meta):
+    """ Builds the Grid described by a dict of grid_meta """
+    pts_each_dim = np.array(meta["pts_each_dim"])
+    return Grid(np.array(meta["min"], dtype=float), np.array(meta["max"], dtype=float), len(pts_each_dim),
+                pts_each_dim, list(meta["pDim"]))
+
+
+def save_grid(path, grid):
+    """ Stores the grid of the value function at path next to it
+
+    The file is written under a temporary name and renamed, so concurrent readers never see a partial file
+    """
+    meta_path = grid_meta_path(path)
+    tmp_path = "{}.tmp-{}".format(meta_path, os.getpid())
+    with open(tmp_path, "w") as f:
+        json.dump(grid_meta(grid), f)
+    os.replace(tmp_path, meta_path)
+
+
+def load_grid(path):
+    """ Returns the Grid stored next to the value function at path by save_grid """
+    with open(grid_meta_path(path)) as f:
+        return grid_from_meta(json.load(f))
+
+
+def open_value(path, grid_path=None):
+    """ Memory-maps the value function at path and builds its grid
+
+    The array is opened read-only, processes opening the same file share its pages.
+
+    Args:
+        path (str): path of the .npy value function, plain or quantized by save_quantized
+        grid_path (str, optional): path of the value function the grid was stored for, e.g. the
+            original of a quantized copy. Defaults to None, path.
+
+    Returns:
+        value (np.memmap or QuantizedValueFunction), grid (Grid)
+    """
+    return load_value(path, mmap_mode="r"), load_grid(grid_path or path)
@@ -0,0 +1,67 @@
+import math
+import types
+
+import numpy as np
+import pytest
+
+hcl = pytest.importorskip("heterocl")
+
+import odp.solver
+from odp.Grid import Grid
+from odp.Shapes import CylinderShape
+from odp.dynamics import DubinsCapture
+from odp.solver import HJSolver
+
+NO_PLOT = types.SimpleNamespace(do_plot=False)
+COMP_METHOD = {"TargetSetMode": "minVWithV0"}
+
+
+class Interrupted(Exception):
+    pass
+
+
+def problem():
+    grid = Grid(np.array([-4.0, -4.0, -math.pi]), np.array([4.0, 4.0, math.pi]), 3, np.array([20, 20, 20]), [2])
+    target = CylinderShape(grid, [2], np.zeros(3), 1)
+    tau = np.arange(start=0, stop=0.3 + 1e-5, step=0.1)
+    return grid, target, tau
+
+
+def test_resume_from_checkpoint_on_last_substep(tmp_path):
+    grid, target, tau = problem()
+    reference = HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT)
+
+    # A checkpoint after every substep, the last one is taken on the last substep of the last interval
+    checkpoint_dir = str(tmp_path / "checkpoint")
+    HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT,
+             checkpoint_dir=checkpoint_dir, checkpoint_every=0)
+    resumed = HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT,
+                       resume_from=checkpoint_dir)
+
+    np.testing.assert_array_equal(resumed, reference)
+
+
+def test_resume_all_time_steps_from_end_of_interval(tmp_path, monkeypatch):
+    grid, target, tau = problem()
+    reference = HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT,
+                         saveAllTimeSteps=True)
+
+    # Stop right after the checkpoint of the substep reaching tau[1], before its time slice is saved
+    save_checkpoint = odp.solver.save_checkpoint
+
+    def save_and_stop(checkpoint_dir, params, V, **state):
+        save_checkpoint(checkpoint_dir, params, V, **state)
+        if int(state["i"]) == 1 and float(state["tNow"]) >= tau[1] - 1e-4:
+            raise Interrupted()
+
+    monkeypatch.setattr(odp.solver, "save_checkpoint", save_and_stop)
+    checkpoint_dir, save_dir = str(tmp_path / "checkpoint"), str(tmp_path / "values")
+    with pytest.raises(Interrupted):
+        HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT,
+                 saveAllTimeSteps=True, save_dir=save_dir, checkpoint_dir=checkpoint_dir, checkpoint_every=0)
+    monkeypatch.setattr(odp.solver, "save_checkpoint", save_checkpoint)
+
+    resumed = HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT,
+                       saveAllTimeSteps=True, save_dir=save_dir, resume_from=checkpoint_dir)
+    for k in range(len(tau)):
+        np.testing.assert_array_equal(resumed[..., k], reference[..., k])
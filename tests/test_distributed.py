@@ -0,0 +1,44 @@
+import math
+import types
+
+import numpy as np
+import pytest
+
+hcl = pytest.importorskip("heterocl")
+
+from odp.Grid import Grid
+from odp.Shapes import CylinderShape
+from odp.dynamics import DubinsCapture
+from odp.solver import HJSolver
+
+NO_PLOT = types.SimpleNamespace(do_plot=False)
+COMP_METHOD = {"TargetSetMode": "minVWithV0"}
+
+
+def problem():
+    grid = Grid(np.array([-4.0, -4.0, -math.pi]), np.array([4.0, 4.0, math.pi]), 3, np.array([24, 20, 20]), [2])
+    target = CylinderShape(grid, [2], np.zeros(3), 1)
+    tau = np.arange(start=0, stop=0.3 + 1e-5, step=0.1)
+    return grid, target, tau
+
+
+@pytest.mark.parametrize("num_workers", [2, 3])
+def test_local_workers_match_single_process(num_workers):
+    grid, target, tau = problem()
+    reference = HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT)
+    V = HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT,
+                 num_workers=num_workers)
+
+    np.testing.assert_allclose(V, reference, atol=1e-5)
+
+
+def test_local_workers_stream_all_time_steps(tmp_path):
+    grid, target, tau = problem()
+    reference = HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT,
+                         saveAllTimeSteps=True)
+    V = HJSolver(DubinsCapture(uMode="max", dMode="min"), grid, target, tau, COMP_METHOD, NO_PLOT,
+                 saveAllTimeSteps=True, save_dir=str(tmp_path / "values"), num_workers=2)
+
+    assert V.shape == reference.shape
+    for k in range(len(tau)):
+        np.testing.assert_allclose(V[..., k], reference[..., k], atol=1e-5)
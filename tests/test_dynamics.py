@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("heterocl")
+
+from MRAG.dynamics.DubinCar3D import DubinsCar
+from MRAG.dynamics.SingleIntegrator import SingleIntegrator
+
+NUM_STEPS = 200
+
+
+def forward_all(dynamics, states, actions):
+    """ Steps every agent of states (..., num, dim) one at a time with the scalar forward """
+    next_states = np.empty_like(states)
+    for index in np.ndindex(states.shape[:-1]):
+        next_states[index] = dynamics.forward(states[index], actions[index])
+    return next_states
+
+
+def assert_same_states(states, expected, periodic_dims=()):
+    difference = states - expected
+    for dim in periodic_dims:
+        difference[..., dim] = np.mod(difference[..., dim] + np.pi, 2 * np.pi) - np.pi
+    assert np.max(np.abs(difference)) < 1e-12
+
+
+def rollout(dynamics, states, sample_actions, periodic_dims=()):
+    """ Compares step_all against forward along a trajectory of NUM_STEPS steps """
+    rng = np.random.default_rng(0)
+    for _ in range(NUM_STEPS):
+        actions = sample_actions(rng, states.shape[:-1])
+        expected = forward_all(dynamics, states, actions)
+        assert_same_states(dynamics.step_all(states, actions), expected, periodic_dims)
+        states = expected
+
+
+def unit_actions(rng, shape):
+    angles = rng.uniform(-np.pi, np.pi, shape)
+    return np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+
+
+def turn_rates(rng, shape):
+    return rng.uniform(-1.0, 1.0, shape + (1,))
+
+
+def single_integrator(num):
+    initials = np.random.default_rng(1).uniform(-0.9, 0.9, (num, 2))
+    return SingleIntegrator(number=num, initials=initials, frequency=20, speed=1.5), initials
+
+
+def dubins_car(num):
+    rng = np.random.default_rng(1)
+    initials = np.column_stack([rng.uniform(-0.9, 0.9, (num, 2)), rng.uniform(-np.pi, np.pi, num)])
+    return DubinsCar(number=num, initials=initials, frequency=20, uMax=1.0, speed=1.0), initials
+
+
+def test_single_integrator_step_all_matches_forward():
+    dynamics, initials = single_integrator(4)
+    rollout(dynamics, initials, unit_actions)
+
+
+def test_single_integrator_step_all_batched():
+    dynamics, initials = single_integrator(4)
+    states = np.stack([initials + shift for shift in np.linspace(-0.05, 0.05, 3)])  # (num_envs, num, dim)
+    rollout(dynamics, states, unit_actions)
+
+
+def test_dubins_car_step_all_matches_forward():
+    dynamics, initials = dubins_car(3)
+    rollout(dynamics, initials, turn_rates, periodic_dims=(2,))
+
+
+def test_dubins_car_step_all_batched():
+    dynamics, initials = dubins_car(3)
+    states = np.stack([initials + shift for shift in np.linspace(-0.05, 0.05, 3)])  # (num_envs, num, dim)
+    rollout(dynamics, states, turn_rates, periodic_dims=(2,))
+
+
+def test_step_updates_the_state_in_place():
+    dynamics, initials = dubins_car(3)
+    state = dynamics.state
+    actions = np.full((3, 1), 0.5)
+    expected = forward_all(dynamics, initials, actions)
+    dynamics.step(actions)
+    assert dynamics.state is state
+    assert_same_states(dynamics.state, expected, periodic_dims=(2,))